@@ -34,6 +34,7 @@ from ralph_assets.models import (
 )
 from ralph_assets.models_assets import REPORT_LANGUAGES
 from ralph_assets.models_dc_assets import Accessory
+from ralph_assets.models_instrumentation import SlowQuery
 from ralph_assets.models_util import ImportProblem
 from ralph_assets.licences.models import LicenceType, SoftwareCategory
 from ralph_assets.models_support import Support, SupportType
@@ -107,6 +108,20 @@ class ImportProblemAdmin(ModelAdmin):
 admin.site.register(ImportProblem, ImportProblemAdmin)
 
 
+class SlowQueryAdmin(ModelAdmin):
+    list_display = ('date', 'source', 'filters', 'duration',)
+    list_filter = ('source', 'filters',)
+    search_fields = ('params', 'sql',)
+    readonly_fields = (
+        'date', 'source', 'filters', 'params', 'duration', 'sql', 'explain',
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+admin.site.register(SlowQuery, SlowQueryAdmin)
+
+
 class WarehouseAdmin(ModelAdmin):
     save_on_top = True
     list_display = ('name',)
@@ -5,9 +5,17 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import datetime
+
 from django.db.models import Q
 
-from ralph_assets.models_assets import Asset, Warehouse
+from ralph_assets.deprecation import DeprecationBatch
+from ralph_assets.models_assets import (
+    Asset,
+    Warehouse,
+    prefetch_ralph_devices,
+)
+from ralph_assets.utils import iter_chunks
 
 
 def get_warehouses():
@@ -19,51 +27,103 @@ def get_warehouses():
         }
 
 
-def get_assets(date):
-    """Yields dicts describing all assets"""
-    for asset in Asset.objects_dc.filter(
+def _get_asset_data(asset):
+    device_info = asset.device_info
+    venture_info = asset.venture
+    is_blade = None
+    if asset.model and asset.model.category:
+        is_blade = asset.model.category.is_blade
+    return {
+        'asset_id': asset.id,
+        'barcode': asset.barcode,
+        'price': asset.price,
+        'ralph_id': device_info.ralph_device_id if device_info else None,
+        'slots': asset.slots,
+        'sn': asset.sn,
+        'deprecation_rate': asset.deprecation_rate,
+        'power_consumption': asset.model.power_consumption,
+        'height_of_device': asset.model.height_of_device,
+        'warehouse_id': asset.warehouse_id,
+        'venture_id': venture_info.id if venture_info else None,
+        'is_blade': is_blade,
+        'cores_count': asset.cores_count,
+    }
+
+
+def _get_queryset(date):
+    """DC assets (without parts) bought until *date*."""
+    return Asset.objects_dc.filter(
         Q(invoice_date=None) | Q(invoice_date__lte=date),
         part_info=None,
-    ):
-        device_info = asset.device_info
+    ).select_related('device_info', 'model__category')
 
-        venture_info = asset.venture
-        is_blade = None
-        if asset.model and asset.model.category:
-            is_blade = asset.model.category.is_blade
 
-        yield {
-            'asset_id': asset.id,
-            'barcode': asset.barcode,
-            'is_deprecated': asset.is_deprecated(date=date),
-            'price': asset.price,
-            'ralph_id': device_info.ralph_device_id if device_info else None,
-            'slots': asset.slots,
-            'sn': asset.sn,
-            'price': asset.price,
-            'deprecation_rate': asset.deprecation_rate,
-            'power_consumption': asset.model.power_consumption,
-            'height_of_device': asset.model.height_of_device,
-            'warehouse_id': asset.warehouse_id,
-            'venture_id': venture_info.id if venture_info else None,
-            'is_blade': is_blade,
-            'cores_count': asset.cores_count,
-        }
+def _iter_asset_chunks(date):
+    """Yields lists of assets from ``_get_queryset`` with Ralph devices
+    prefetched and their :class:`ralph_assets.deprecation.DeprecationBatch`.
+    """
+    for assets in iter_chunks(_get_queryset(date)):
+        prefetch_ralph_devices(assets)
+        yield assets, DeprecationBatch.from_assets(assets)
+
+
+def get_assets(date):
+    """Yields dicts describing all assets"""
+    for assets, batch in _iter_asset_chunks(date):
+        for asset, is_deprecated in zip(assets, batch.is_deprecated(date)):
+            data = _get_asset_data(asset)
+            data['is_deprecated'] = is_deprecated
+            yield data
+
+
+def get_assets_in_range(start, end):
+    """Yields dicts describing assets returned by ``get_assets`` for any day
+    from *start* to *end*, once per asset. Instead of ``is_deprecated``
+    they have ``intervals``: list of dicts with ``date_from``, ``date_to``
+    (the days the asset is returned for) and ``is_deprecated``.
+    """
+    for assets, batch in _iter_asset_chunks(end):
+        dates_from = [
+            max(start, invoice_date or start)
+            for invoice_date in batch.invoice_dates
+        ]
+        dates_to = [end] * len(batch)
+        for asset, intervals in zip(
+            assets, batch.deprecation_intervals(dates_from, dates_to),
+        ):
+            data = _get_asset_data(asset)
+            data['intervals'] = [
+                {
+                    'date_from': interval_from,
+                    'date_to': interval_to,
+                    'is_deprecated': is_deprecated,
+                }
+                for interval_from, interval_to, is_deprecated in intervals
+            ]
+            yield data
 
 
-def get_asset_parts():
-    """Yields dicts describing parts of assets"""
-    for asset in Asset.objects_dc.all():
-        for part in asset.get_parts():
+def get_asset_parts(date=None):
+    """Yields dicts describing parts of assets, deprecated on *date* (today
+    by default). Parts are read in chunks together with their models,
+    devices (assets) and their device infos, with a single query per
+    chunk."""
+    queryset = Asset.objects.filter(
+        part_info__device__in=Asset.objects_dc.all(),
+    ).select_related('model', 'part_info__device__device_info')
+    date = date or datetime.date.today()
+    for parts in iter_chunks(queryset):
+        deprecated = DeprecationBatch.from_assets(parts).is_deprecated(date)
+        for part, is_deprecated in zip(parts, deprecated):
+            asset = part.part_info.device
             device_info = asset.device_info
             yield {
                 'asset_id': part.id,
                 'barcode': asset.barcode,
-                'is_deprecated': part.is_deprecated(),
                 'model': part.model.name if part.model else None,
                 'price': part.price,
                 'ralph_id': device_info.ralph_device_id if device_info else None,  # noqa
                 'sn': asset.sn,
                 'deprecation_rate': asset.deprecation_rate,
-                'is_deprecated': part.is_deprecated(),
+                'is_deprecated': is_deprecated,
             }
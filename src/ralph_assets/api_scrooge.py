@@ -5,19 +5,28 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import datetime
 import logging
 
 from django.db.models import Q
 
-from ralph.util.api import Getter
+from ralph_assets.deprecation import DeprecationBatch
 from ralph_assets.licences.models import Licence
-from ralph_assets.models_assets import Asset, AssetModel, AssetType, Warehouse
+from ralph_assets.models_assets import (
+    Asset,
+    AssetModel,
+    AssetType,
+    Warehouse,
+    prefetch_liquidation_dates,
+    prefetch_ralph_devices,
+)
 from ralph_assets.models_support import Support
+from ralph_assets.utils import PrefetchingGetter, iter_chunks
 
 logger = logging.getLogger(__name__)
 
 
-class DatedGetter(Getter):
+class DatedGetter(PrefetchingGetter):
     """
     Returns only items that have a timespan (marked by begin_field and
     end_field) that contains given date"""
@@ -33,6 +42,23 @@ class DatedGetter(Getter):
         })
 
 
+class DateRangeGetter(DatedGetter):
+    """
+    Returns items that have a timespan overlapping days from start to end,
+    each item once (its begin_field and end_field tell the days it's
+    valid). Use it as the first base of a ``DatedGetter`` subclass."""
+
+    def __init__(self, start, end, *args, **kwargs):
+        self.end_date = end
+        super(DateRangeGetter, self).__init__(start, *args, **kwargs)
+
+    def get_queryset(self):
+        return super(DatedGetter, self).get_queryset().filter(**{
+            self.begin_field + '__lte': self.end_date,
+            self.end_field + '__gte': self.date,
+        })
+
+
 def get_warehouses():
     """Yields dicts describing all warehouses"""
     for warehouse in Warehouse.objects.all():
@@ -56,48 +82,108 @@ def get_models():
         }
 
 
-def get_assets(date):
-    """Yields dicts describing all assets"""
-    for asset in Asset.objects_dc.filter(
+def _get_asset_data(asset):
+    device_info = asset.device_info
+    ralph_device = device_info.get_ralph_device()
+    return {
+        'asset_id': asset.id,
+        'device_id': device_info.ralph_device_id,
+        'asset_name': ralph_device.name if ralph_device else None,
+        'service_id': asset.service_id,
+        'environment_id': asset.device_environment_id,
+        'sn': asset.sn,
+        'barcode': asset.barcode,
+        'warehouse_id': asset.warehouse_id,
+        'cores_count': asset.cores_count,
+        'power_consumption': asset.model.power_consumption,
+        'collocation': asset.model.height_of_device,
+        'depreciation_rate': asset.deprecation_rate,
+        'price': asset.price,
+        'model_id': asset.model_id,
+    }
+
+
+def _is_complete(asset):
+    if not asset.device_info_id:
+        logger.error('Asset {0} has no device'.format(asset.id))
+        return False
+    if not asset.service_id:
+        logger.error('Asset {0} has no service'.format(asset.id))
+        return False
+    if not asset.device_environment_id:
+        logger.error('Asset {0} has no environment'.format(asset.id))
+        return False
+    return True
+
+
+def _iter_asset_chunks(date, chunk_size):
+    """Yields lists of DC assets (without parts) bought until *date*,
+    skipping the ones without device, service or environment, with their
+    :class:`ralph_assets.deprecation.DeprecationBatch`.
+
+    Assets are read in chunks of *chunk_size*; Ralph devices (hostnames and
+    cores counts) and liquidation dates of a chunk are loaded in bulk, so
+    the number of queries per chunk doesn't depend on its size.
+    """
+    queryset = Asset.objects_dc.filter(
         Q(invoice_date=None) | Q(invoice_date__lte=date),
         part_info=None,
-    ).select_related('model', 'device_info'):
-        if not asset.device_info_id:
-            logger.error('Asset {0} has no device'.format(asset.id))
-            continue
-        if not asset.service_id:
-            logger.error('Asset {0} has no service'.format(asset.id))
-            continue
-        if not asset.device_environment_id:
-            logger.error('Asset {0} has no environment'.format(asset.id))
-            continue
-        if asset.is_liquidated(date):
-            logger.info("Skipping asset {} - it's liquidated")
-            continue
-        device_info = asset.device_info
-        hostname = None
-        if device_info:
-            ralph_device = device_info.get_ralph_device()
-            if ralph_device:
-                hostname = ralph_device.name
+    ).select_related('model', 'device_info')
+    for assets in iter_chunks(queryset, chunk_size):
+        prefetch_ralph_devices(assets)
+        prefetch_liquidation_dates(assets)
+        assets = [asset for asset in assets if _is_complete(asset)]
+        yield assets, DeprecationBatch.from_assets(assets, liquidation=True)
 
-        yield {
-            'asset_id': asset.id,
-            'device_id': device_info.ralph_device_id if device_info else None,
-            'asset_name': hostname,
-            'service_id': asset.service_id,
-            'environment_id': asset.device_environment_id,
-            'sn': asset.sn,
-            'barcode': asset.barcode,
-            'warehouse_id': asset.warehouse_id,
-            'cores_count': asset.cores_count,
-            'power_consumption': asset.model.power_consumption,
-            'collocation': asset.model.height_of_device,
-            'depreciation_rate': asset.deprecation_rate,
-            'is_depreciated': asset.is_deprecated(date=date),
-            'price': asset.price,
-            'model_id': asset.model_id,
-        }
+
+def get_assets(date, chunk_size=1000):
+    """Yields dicts describing all assets"""
+    for assets, batch in _iter_asset_chunks(date, chunk_size):
+        for asset, is_liquidated, is_deprecated in zip(
+            assets, batch.is_liquidated(date), batch.is_deprecated(date),
+        ):
+            if is_liquidated:
+                logger.info(
+                    "Skipping asset {} - it's liquidated".format(asset.id),
+                )
+                continue
+            data = _get_asset_data(asset)
+            data['is_depreciated'] = is_deprecated
+            yield data
+
+
+def get_assets_in_range(start, end, chunk_size=1000):
+    """Yields dicts describing assets returned by ``get_assets`` for any day
+    from *start* to *end*, once per asset. Instead of ``is_depreciated``
+    they have ``intervals``: list of dicts with ``date_from``, ``date_to``
+    (the days the asset is returned for) and ``is_depreciated``.
+    """
+    one_day = datetime.timedelta(days=1)
+    for assets, batch in _iter_asset_chunks(end, chunk_size):
+        dates_from = [
+            max(start, invoice_date or start)
+            for invoice_date in batch.invoice_dates
+        ]
+        dates_to = [
+            end if liquidated is None else min(end, liquidated - one_day)
+            for liquidated in batch.liquidation_dates
+        ]
+        for asset, date_from, date_to, intervals in zip(
+            assets, dates_from, dates_to,
+            batch.deprecation_intervals(dates_from, dates_to),
+        ):
+            if date_from > date_to:
+                continue
+            data = _get_asset_data(asset)
+            data['intervals'] = [
+                {
+                    'date_from': interval_from,
+                    'date_to': interval_to,
+                    'is_depreciated': is_deprecated,
+                }
+                for interval_from, interval_to, is_deprecated in intervals
+            ]
+            yield data
 
 
 class get_supports(DatedGetter):
@@ -114,10 +200,8 @@ class get_supports(DatedGetter):
         'price',
         'date_from',
         'date_to',
-        ('assets', (lambda support: [
-            asset.id for asset in support.assets.all()
-        ]))
     ]
+    prefetch_ids = ['assets']
 
 
 class get_licences(DatedGetter):
@@ -128,13 +212,20 @@ class get_licences(DatedGetter):
     end_field = 'valid_thru'
 
     filters = {'asset_type': AssetType.data_center}
+    select_related = ['software_category']
 
     fields = [
         ('software_category', 'software_category__name'),
         'price',
         'invoice_date',
         'valid_thru',
-        ('assets', (lambda licence: [
-            asset.id for asset in licence.assets.all()
-        ]))
     ]
+    prefetch_ids = ['assets']
+
+
+class get_supports_in_range(DateRangeGetter, get_supports):
+    """Gets data for DC supports valid on any day from start to end."""
+
+
+class get_licences_in_range(DateRangeGetter, get_licences):
+    """Gets data for DC licences valid on any day from start to end."""
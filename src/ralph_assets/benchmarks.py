@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks of hot paths run against the synthetic inventory.
+
+Every benchmark (registered with :func:`benchmark`) performs a single
+operation: a page of asset search (also with 10k pasted barcodes), a CSV
+export (performed like the report worker does it), a report, the rack REST
+API, a list of tastypie ``AssetsResource`` (called directly, without API
+key authentication and throttling), the Scrooge and pricing feeds, an XLS
+(CSV) import through the upload wizard or loading and saving assets.
+:func:`run_benchmarks` times each of them a few times and returns medians
+of time and of queries counted by
+:class:`ralph_assets.instrumentation.Section`, ready to be dumped as JSON
+by ``benchmark_assets`` command and compared between runs.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import datetime
+import random
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.urlresolvers import reverse
+from django.test.client import Client, RequestFactory
+from ralph.util.reports import get_result
+
+from ralph_assets import api_pricing, api_scrooge
+from ralph_assets.api import AssetsResource
+from ralph_assets.history.models import history_transaction
+from ralph_assets.instrumentation import Section
+from ralph_assets.models_assets import Asset, AssetType
+from ralph_assets.models_dc_assets import Rack
+from ralph_assets.synthetic import NAME_PREFIX, SN_PREFIX
+
+
+BENCHMARK_USER = 'benchmark'
+# rows of a benchmarked import
+IMPORT_ROWS = 100
+# assets loaded by asset_load benchmark
+LOAD_ROWS = 5000
+# identifiers pasted by search_dc_pasted_barcodes benchmark
+PASTED_IDENTIFIERS = 10000
+
+BENCHMARKS = []
+
+
+def benchmark(name, samples=None):
+    """Registers decorated function (taking :class:`BenchmarkContext`) as
+    benchmark *name*, timed *samples* times (when given, e.g. 1 for whole
+    feeds) instead of the number chosen for the run."""
+    def decorator(func):
+        BENCHMARKS.append((name, func, samples))
+        return func
+    return decorator
+
+
+def _consume(response):
+    for _ in response:
+        pass
+    return response
+
+
+class BenchmarkContext(object):
+    """Logged in client and sample objects of the synthetic inventory."""
+
+    def __init__(self, seed=0):
+        self.random = random.Random(seed)
+        self.user = self._get_user()
+        self.client = Client()
+        self.client.login(username=BENCHMARK_USER, password=BENCHMARK_USER)
+        self.factory = RequestFactory()
+        synthetic = Asset.admin_objects.filter(sn__startswith=SN_PREFIX)
+        self.dc_assets = self._sample(
+            synthetic.filter(type=AssetType.data_center.id),
+        )
+        self.bo_assets = self._sample(
+            synthetic.filter(type=AssetType.back_office.id),
+        )
+        self.racks = self._sample(
+            Rack.objects.filter(name__startswith=NAME_PREFIX),
+        )
+        self.date = datetime.date.today()
+
+    def _get_user(self):
+        try:
+            user = User.objects.get(username=BENCHMARK_USER)
+        except User.DoesNotExist:
+            user = User.objects.create_superuser(
+                BENCHMARK_USER, 'benchmark@example.com', BENCHMARK_USER,
+            )
+        return user
+
+    def _sample(self, queryset, size=IMPORT_ROWS):
+        """Returns list of ids of up to *size* random objects from
+        *queryset*, without loading all of them."""
+        ids = queryset.order_by('id')
+        count = ids.count()
+        if not count:
+            return []
+        return sorted(set(
+            ids.values_list('id', flat=True)[self.random.randrange(count)]
+            for _ in xrange(size)
+        ))
+
+    def choice(self, ids):
+        return self.random.choice(ids)
+
+    def session_request(self, path, data=None):
+        """Returns request for *path* with the session of the client, as
+        the report worker gets it."""
+        request = self.factory.get(path, data or {})
+        cookie = self.client.cookies[settings.SESSION_COOKIE_NAME]
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = cookie.value
+        return request
+
+
+@benchmark('search_dc')
+def search_dc(context):
+    _consume(context.client.get(
+        reverse('asset_search', kwargs={'mode': 'dc'}),
+    ))
+
+
+@benchmark('search_dc_barcode')
+def search_dc_barcode(context):
+    barcode = Asset.admin_objects.get(
+        id=context.choice(context.dc_assets),
+    ).barcode
+    _consume(context.client.get(
+        reverse('asset_search', kwargs={'mode': 'dc'}),
+        {'barcode': barcode},
+    ))
+
+
+@benchmark('search_dc_filters')
+def search_dc_filters(context):
+    asset = Asset.admin_objects.select_related(
+        'model', 'device_info__rack',
+    ).get(id=context.choice(context.dc_assets))
+    rack = asset.device_info.rack if asset.device_info else None
+    _consume(context.client.get(
+        reverse('asset_search', kwargs={'mode': 'dc'}),
+        {
+            'model': asset.model.name[:5],
+            'status': asset.status,
+            'sn': asset.sn[-6:],
+            'location_name': rack.name if rack else '',
+        },
+    ))
+
+
+@benchmark('search_dc_support_assigned')
+def search_dc_support_assigned(context):
+    _consume(context.client.get(
+        reverse('asset_search', kwargs={'mode': 'dc'}),
+        {'support_assigned': 'any'},
+    ))
+
+
+@benchmark('search_dc_pasted_barcodes')
+def search_dc_pasted_barcodes(context):
+    # barcodes of the sampled assets padded with missing ones, unique per
+    # run, so every sample stages a new batch
+    barcodes = list(Asset.admin_objects.filter(
+        id__in=context.dc_assets, barcode__isnull=False,
+    ).values_list('barcode', flat=True))
+    run = context.random.randrange(10 ** 9)
+    barcodes.extend(
+        'missing-{}-{}'.format(run, i)
+        for i in xrange(PASTED_IDENTIFIERS - len(barcodes))
+    )
+    _consume(context.client.get(
+        reverse('asset_search', kwargs={'mode': 'dc'}),
+        {'barcode': '|'.join(barcodes)},
+    ))
+
+
+@benchmark('search_bo')
+def search_bo(context):
+    _consume(context.client.get(
+        reverse('asset_search', kwargs={'mode': 'back_office'}),
+    ))
+
+
+@benchmark('csv_export_dc', samples=1)
+def csv_export_dc(context):
+    get_result(context.session_request(
+        reverse('asset_search', kwargs={'mode': 'dc'}), {'export': 'csv'},
+    ))
+
+
+@benchmark('report_category_model_status')
+def report_category_model_status(context):
+    _consume(context.client.get(reverse('report_detail', kwargs={
+        'mode': 'dc', 'slug': 'category-model-status',
+    })))
+
+
+@benchmark('report_asset_device')
+def report_asset_device(context):
+    _consume(context.client.get(reverse('report_detail', kwargs={
+        'mode': 'dc', 'slug': 'asset-device',
+    })))
+
+
+@benchmark('rack_rest_api')
+def rack_rest_api(context):
+    _consume(context.client.get(
+        '/assets/api/rack/{}/'.format(context.choice(context.racks)),
+    ))
+
+
+@benchmark('tastypie_assets')
+def tastypie_assets(context):
+    request = context.factory.get('/', {'format': 'json', 'limit': 100})
+    request.user = context.user
+    AssetsResource().get_list(request)
+
+
+@benchmark('scrooge_assets', samples=1)
+def scrooge_assets(context):
+    for _ in api_scrooge.get_assets(context.date):
+        pass
+
+
+@benchmark('scrooge_assets_month', samples=1)
+def scrooge_assets_month(context):
+    for _ in api_scrooge.get_assets_in_range(
+        context.date - datetime.timedelta(days=30), context.date,
+    ):
+        pass
+
+
+@benchmark('scrooge_supports', samples=1)
+def scrooge_supports(context):
+    for _ in api_scrooge.get_supports(context.date):
+        pass
+
+
+@benchmark('scrooge_licences', samples=1)
+def scrooge_licences(context):
+    for _ in api_scrooge.get_licences(context.date):
+        pass
+
+
+@benchmark('pricing_assets', samples=1)
+def pricing_assets(context):
+    for _ in api_pricing.get_assets(context.date):
+        pass
+
+
+@benchmark('pricing_assets_month', samples=1)
+def pricing_assets_month(context):
+    for _ in api_pricing.get_assets_in_range(
+        context.date - datetime.timedelta(days=30), context.date,
+    ):
+        pass
+
+
+@benchmark('pricing_asset_parts', samples=1)
+def pricing_asset_parts(context):
+    for _ in api_pricing.get_asset_parts():
+        pass
+
+
+@benchmark('xls_import')
+def xls_import(context):
+    """Updates remarks of sample back office assets through the wizard."""
+    url = reverse('xls_upload')
+    rows = ['"id","remarks"'] + [
+        '"{}","benchmark {}"'.format(pk, context.random.randint(0, 10 ** 6))
+        for pk in context.bo_assets
+    ]
+    client = context.client
+    client.get(url)
+    client.post(url, {
+        'upload-asset_type': AssetType.back_office.id,
+        'upload-model': 'ralph_assets.asset',
+        'upload-file': SimpleUploadedFile(
+            'benchmark.csv', '\n'.join(rows).encode('utf-8'),
+            content_type='text/csv',
+        ),
+        'xls_upload_view-current_step': 'upload',
+    })
+    client.post(url, {
+        'column_choice-remarks': 'remarks',
+        'xls_upload_view-current_step': 'column_choice',
+    })
+    _consume(client.post(url, {
+        'xls_upload_view-current_step': 'confirm',
+    }))
+
+
+@benchmark('asset_load')
+def asset_load(context):
+    """Loads a chunk of assets, most of the time is spent in model
+    ``__init__`` (with the state remembered for history)."""
+    list(Asset.admin_objects.all()[:LOAD_ROWS])
+
+
+@benchmark('asset_save')
+def asset_save(context):
+    """Saves sample data center assets with changed remarks in one
+    transaction, like the bulk edit does."""
+    with history_transaction():
+        for asset in Asset.admin_objects.filter(id__in=context.dc_assets):
+            asset.remarks = 'benchmark {}'.format(
+                context.random.randint(0, 10 ** 6),
+            )
+            asset.save(user=context.user)
+
+
+def _percentile(values, percentile):
+    values = sorted(values)
+    return values[min(int(len(values) * percentile), len(values) - 1)]
+
+
+def run_benchmark(context, name, func, samples):
+    """Returns dict of measures of *samples* runs of *func*."""
+    sections = []
+    for _ in xrange(samples):
+        with Section('benchmark.{}'.format(name), force=True) as measured:
+            func(context)
+        sections.append(measured)
+    times = [section.time * 1000 for section in sections]
+    return {
+        'samples': samples,
+        'median_ms': _percentile(times, 0.5),
+        'p95_ms': _percentile(times, 0.95),
+        'max_ms': max(times),
+        'db_ms': _percentile(
+            [section.db_time * 1000 for section in sections], 0.5,
+        ),
+        'queries': _percentile(
+            [section.queries for section in sections], 0.5,
+        ),
+        'rows': _percentile([section.rows for section in sections], 0.5),
+    }
+
+
+def run_benchmarks(samples=5, names=None, seed=0, log=None):
+    """Runs benchmarks (all or the ones from *names*), returns dict name ->
+    measures."""
+    context = BenchmarkContext(seed)
+    results = {}
+    for name, func, fixed_samples in BENCHMARKS:
+        if names and name not in names:
+            continue
+        results[name] = run_benchmark(
+            context, name, func, fixed_samples or samples,
+        )
+        if log:
+            log('{}: median {:.2f} ms, {} queries'.format(
+                name, results[name]['median_ms'], results[name]['queries'],
+            ))
+    return results
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+"""Deprecation and liquidation of many assets at once.
+
+:class:`DeprecationBatch` holds columns (lists) of invoice dates,
+deprecation rates, deprecation end dates, forced deprecation flags and
+liquidation dates of many assets and computes their deprecation end dates
+once, then statuses for one or many reference dates column-wise. Months are
+added with plain calendar arithmetic (cached for repeated invoice dates and
+rates) instead of ``relativedelta``. The scalar functions are the kernels of
+the batch; ``Asset.get_deprecation_months``, ``get_deprecation_date``,
+``is_deprecated``, ``get_deprecation_intervals`` and ``is_liquidated`` are
+wrappers of them. The Scrooge and pricing feeds use a batch per chunk of
+assets.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import calendar
+import datetime
+
+
+def deprecation_months(deprecation_rate):
+    """Returns number of months the asset is deprecated in, for yearly
+    *deprecation_rate* (in percents)."""
+    return int(
+        (1 / (deprecation_rate / 100) * 12) if deprecation_rate else 0
+    )
+
+
+def add_months(date, months):
+    """Returns *date* moved by *months* (the day is clipped to the length
+    of the month), like adding ``relativedelta(months=months)``."""
+    year, month = divmod(date.month - 1 + months, 12)
+    year += date.year
+    month += 1
+    return datetime.date(
+        year, month, min(date.day, calendar.monthrange(year, month)[1]),
+    )
+
+
+def deprecation_date(invoice_date, deprecation_rate, deprecation_end_date):
+    """Returns the last day the asset isn't deprecated (None without
+    *invoice_date*)."""
+    if not invoice_date:
+        return None
+    if deprecation_end_date:
+        return deprecation_end_date
+    return add_months(invoice_date, deprecation_months(deprecation_rate))
+
+
+def is_deprecated(date, force_deprecation, invoice_date, last_day):
+    """Returns whether the asset is deprecated on *date*, *last_day* is its
+    :func:`deprecation_date`."""
+    return bool(force_deprecation or not invoice_date or last_day < date)
+
+
+def deprecation_intervals(date_from, date_to, force_deprecation,
+                          invoice_date, last_day):
+    """Splits days from *date_from* to *date_to* into tuples (first day,
+    last day, is deprecated), like :func:`is_deprecated` of every day
+    would; *last_day* is the :func:`deprecation_date`."""
+    if force_deprecation or not invoice_date:
+        return [(date_from, date_to, True)]
+    intervals = []
+    if date_from <= last_day:
+        intervals.append((date_from, min(last_day, date_to), False))
+    if last_day < date_to:
+        intervals.append((
+            max(last_day + datetime.timedelta(days=1), date_from), date_to,
+            True,
+        ))
+    return intervals
+
+
+def is_liquidated(date, liquidation_date):
+    return liquidation_date is not None and liquidation_date <= date
+
+
+class DeprecationBatch(object):
+    """Deprecation data of many assets, as columns of equal length
+    (*liquidation_dates* are optional)."""
+
+    def __init__(self, invoice_dates, deprecation_rates,
+                 deprecation_end_dates, force_deprecations,
+                 liquidation_dates=None):
+        self.invoice_dates = list(invoice_dates)
+        self.deprecation_rates = list(deprecation_rates)
+        self.deprecation_end_dates = list(deprecation_end_dates)
+        self.force_deprecations = list(force_deprecations)
+        self.liquidation_dates = (
+            list(liquidation_dates) if liquidation_dates is not None
+            else [None] * len(self.invoice_dates)
+        )
+        columns = (
+            self.deprecation_rates, self.deprecation_end_dates,
+            self.force_deprecations, self.liquidation_dates,
+        )
+        if any(len(column) != len(self.invoice_dates) for column in columns):
+            raise ValueError('Columns have different lengths.')
+        self._deprecation_dates = None
+
+    @classmethod
+    def from_assets(cls, assets, liquidation=False):
+        """Returns batch of *assets*; with *liquidation* their liquidation
+        dates are taken too (prefetch them with
+        :func:`ralph_assets.models_assets.prefetch_liquidation_dates`)."""
+        return cls(
+            [asset.invoice_date for asset in assets],
+            [asset.deprecation_rate for asset in assets],
+            [asset.deprecation_end_date for asset in assets],
+            [asset.force_deprecation for asset in assets],
+            [asset.get_liquidation_date() for asset in assets]
+            if liquidation else None,
+        )
+
+    def __len__(self):
+        return len(self.invoice_dates)
+
+    @property
+    def deprecation_months(self):
+        return [deprecation_months(rate) for rate in self.deprecation_rates]
+
+    @property
+    def deprecation_dates(self):
+        """Last days the assets aren't deprecated (None without invoice
+        date)."""
+        if self._deprecation_dates is None:
+            cache = {}
+            dates = []
+            for invoice_date, rate, end_date in zip(
+                self.invoice_dates, self.deprecation_rates,
+                self.deprecation_end_dates,
+            ):
+                if end_date or not invoice_date:
+                    dates.append(
+                        deprecation_date(invoice_date, rate, end_date),
+                    )
+                    continue
+                key = (invoice_date, rate)
+                if key not in cache:
+                    cache[key] = deprecation_date(invoice_date, rate, None)
+                dates.append(cache[key])
+            self._deprecation_dates = dates
+        return self._deprecation_dates
+
+    def is_deprecated(self, date):
+        """Returns list of deprecation statuses of the assets on *date*."""
+        return [
+            is_deprecated(date, force, invoice_date, last_day)
+            for force, invoice_date, last_day in zip(
+                self.force_deprecations, self.invoice_dates,
+                self.deprecation_dates,
+            )
+        ]
+
+    def is_deprecated_on(self, dates):
+        """Returns dict date -> list of deprecation statuses of the assets,
+        for every date of *dates*."""
+        return dict((date, self.is_deprecated(date)) for date in dates)
+
+    def deprecation_intervals(self, dates_from, dates_to):
+        """Returns list of :func:`deprecation_intervals` of the assets from
+        *dates_from* to *dates_to* (columns of dates, one per asset)."""
+        return [
+            deprecation_intervals(
+                date_from, date_to, force, invoice_date, last_day,
+            )
+            for date_from, date_to, force, invoice_date, last_day in zip(
+                dates_from, dates_to, self.force_deprecations,
+                self.invoice_dates, self.deprecation_dates,
+            )
+        ]
+
+    def is_liquidated(self, date):
+        """Returns list of liquidation statuses of the assets on *date*."""
+        return [
+            is_liquidated(date, liquidation_date)
+            for liquidation_date in self.liquidation_dates
+        ]
+
+    def is_liquidated_on(self, dates):
+        return dict((date, self.is_liquidated(date)) for date in dates)
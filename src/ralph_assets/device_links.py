@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+"""Queries over the link between assets and Ralph devices.
+
+``DeviceInfo.ralph_device_id`` is a plain integer, not a foreign key, so
+the ORM can't join assets with devices. The helpers below let the database
+do it (with a semi-join subquery or ``NOT EXISTS``), so ids of devices are
+never loaded into Python nor sent back as a literal list, and the cost
+doesn't grow with the number of devices.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from django.db import connection
+from django.db.models import Q
+
+from ralph.discovery.models_device import Device
+from ralph_assets.models_dc_assets import DeviceInfo
+
+
+# path from asset to the id of its Ralph device
+DEVICE_LINK = 'device_info__ralph_device_id'
+
+
+def linked_devices_query(devices, link=DEVICE_LINK):
+    """Returns ``Q`` selecting assets (or objects with *link* path to the
+    device id) linked with any of *devices* queryset."""
+    return Q(**{'{}__in'.format(link): devices.order_by().values('id')})
+
+
+def devices_without_asset(devices=None):
+    """Returns *devices* (all by default) not linked with any (not deleted)
+    asset device info."""
+    if devices is None:
+        devices = Device.objects.all()
+    qn = connection.ops.quote_name
+    info = qn(DeviceInfo._meta.db_table)
+    return devices.extra(
+        where=[
+            'NOT EXISTS (SELECT 1 FROM {info} WHERE {info}.{link} = '
+            '{device}.{id} AND {info}.{deleted} = %s)'.format(
+                info=info,
+                link=qn(DeviceInfo._meta.get_field('ralph_device_id').column),
+                deleted=qn(DeviceInfo._meta.get_field('deleted').column),
+                device=qn(Device._meta.db_table),
+                id=qn(Device._meta.pk.column),
+            ),
+        ],
+        params=[False],
+    )
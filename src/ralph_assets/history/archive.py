@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""Archiving of old history.
+
+``History`` rows older than ``ASSETS_HISTORY_ARCHIVE_DAYS`` are moved (by
+``archive_history`` command) to :class:`ArchivedHistory`, which stores
+field names as references to :class:`HistoryField` dictionary, so the
+online table, read by history views and the m2m snapshots, stays small.
+Archived changes are hidden from ``get_history()`` by default, they are
+merged with the online ones by ``get_history(archived=True)`` (see
+:class:`~ralph_assets.history.models.HistoryWithArchive`, shown by the
+history view with ``archived`` parameter) and used to rebuild
+past states (:mod:`ralph_assets.history.states`), the last values of m2m
+snapshots and liquidation dates of assets.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+
+from ralph_assets.history.models import (
+    INSERT_CHUNK_SIZE,
+    ArchivedHistory,
+    History,
+    HistoryField,
+)
+
+
+def archive_days():
+    """History older than ``ASSETS_HISTORY_ARCHIVE_DAYS`` setting (days) is
+    archived."""
+    return getattr(settings, 'ASSETS_HISTORY_ARCHIVE_DAYS', 730)
+
+
+def get_field_ids(names):
+    """Returns dict name -> id of :class:`HistoryField` of *names*, missing
+    names are added to the dictionary."""
+    field_ids = dict(
+        HistoryField.objects.filter(name__in=names).values_list('name', 'id')
+    )
+    for name in set(names) - set(field_ids):
+        field_ids[name] = HistoryField.objects.create(name=name).id
+    return field_ids
+
+
+def _archive_chunk(rows):
+    field_ids = get_field_ids(set(row.field_name for row in rows))
+    archived = [
+        ArchivedHistory(
+            id=row.id,
+            date=row.date,
+            user_id=row.user_id,
+            content_type_id=row.content_type_id,
+            object_id=row.object_id,
+            field_id=field_ids[row.field_name],
+            old_value=row.old_value,
+            new_value=row.new_value,
+        ) for row in rows
+    ]
+    for i in xrange(0, len(archived), INSERT_CHUNK_SIZE):
+        ArchivedHistory.objects.bulk_create(
+            archived[i:i + INSERT_CHUNK_SIZE],
+        )
+    History.objects.filter(id__in=[row.id for row in rows]).delete()
+
+
+def archive_history(before=None, chunk_size=500):
+    """Moves ``History`` rows older than *before* (a datetime, defaults to
+    the configured horizon) to the archive, each chunk of *chunk_size* rows
+    in a separate transaction. Returns the number of moved rows."""
+    if before is None:
+        before = datetime.now() - timedelta(days=archive_days())
+    queryset = History.objects.filter(date__lt=before).order_by('id')
+    moved = 0
+    while True:
+        with transaction.commit_on_success():
+            rows = list(queryset[:chunk_size])
+            if rows:
+                _archive_chunk(rows)
+        if not rows:
+            return moved
+        moved += len(rows)
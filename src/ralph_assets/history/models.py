@@ -6,12 +6,15 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import json
+import threading
 from collections import namedtuple
+from contextlib import contextmanager
+from functools import wraps
 
 from datetime import datetime
 
-from django.db import models
-from django.core import serializers
+from django.db import models, transaction
+from django.db.models import Max
 from django.core.urlresolvers import reverse
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.generic import GenericForeignKey
@@ -22,7 +25,199 @@ DEFAULT_HISTORY_FIELD_EXCLUDE = ('created', 'modified', 'invoice_date',
                                  'cache_version', 'rght', 'level', 'lft',
                                  'tree_id', 'loan_end_date')
 
-serializer = serializers.get_serializer("python")()
+# value of a deferred (not loaded) field in history state
+DEFERRED = object()
+# model -> [(name, attname)] of fields registered in history
+_state_fields = {}
+# rows inserted by single query (SQLite limits number of query parameters)
+INSERT_CHUNK_SIZE = 100
+
+_local = threading.local()
+
+
+def get_history_state(obj, values=None):
+    """Returns values of the fields of *obj* registered in history, taken
+    from the instance (primary keys for relations), so it costs no query.
+    *values* is a copy of the instance dict to take them from instead (see
+    :func:`remember_history_values`).
+    """
+    try:
+        fields = _state_fields[obj.__class__]
+    except KeyError:
+        from ralph_assets.history import registry
+        names = registry.get(obj.__class__, ())
+        fields = _state_fields[obj.__class__] = [
+            (field.name, field.attname) for field in obj._meta.fields
+            if field.name in names
+        ]
+    if values is None:
+        values = obj.__dict__
+    return dict(
+        (name, values.get(attname, DEFERRED)) for name, attname in fields
+    )
+
+
+def remember_history_values(obj):
+    """Copies the instance dict of *obj*, the next save is diffed against
+    the registered fields picked from the copy by :func:`get_history_state`
+    (the copy is cheap enough to be taken for every loaded instance)."""
+    values = obj.__dict__.copy()
+    values.pop('_history_values', None)
+    obj._history_values = values
+
+
+def get_remembered_history_state(obj):
+    """Returns state of *obj* remembered by :func:`remember_history_values`
+    (or None)."""
+    values = getattr(obj, '_history_values', None)
+    if values is None:
+        return None
+    return get_history_state(obj, values)
+
+
+def get_history_buffer():
+    """Returns :class:`HistoryBuffer` active in the current thread (or
+    ``None``)."""
+    return getattr(_local, 'buffer', None)
+
+
+def send_to_workers(rows):
+    """Hands ``History`` *rows* over to rq workers when asynchronous
+    history is enabled: after the outermost :func:`history_transaction`
+    commits, or right away outside of managed transactions. Returns False
+    when the rows have to be inserted in the current transaction (workers
+    must not write history of changes which aren't committed yet)."""
+    from ralph_assets.history.queue import (
+        async_history_enabled,
+        enqueue_history,
+    )
+    if not async_history_enabled():
+        return False
+    pending_rows = getattr(_local, 'pending_rows', None)
+    if pending_rows is not None:
+        pending_rows.extend(rows)
+    elif transaction.is_managed():
+        return False
+    else:
+        enqueue_history(rows)
+    return True
+
+
+class HistoryBuffer(object):
+    """Collects ``History`` rows logged inside the ``with`` block and
+    inserts them with a few batched queries when the block exits without an
+    exception; rows are discarded otherwise.
+
+    Use it inside the transaction (or just use :func:`history_transaction`),
+    so the rows are committed with the changes they describe and dropped on
+    rollback::
+
+        with transaction.commit_on_success(), HistoryBuffer():
+            for asset in assets:
+                asset.save(user=user)
+
+    Buffers entered while another one is active join the outer one, the
+    rows are written when the outermost buffer exits.
+    """
+
+    def __init__(self):
+        self.rows = []
+        # rows always written synchronously (see ``log_changes``)
+        self.sync_rows = []
+        # (content type id, object id, field name) -> last known value (of
+        # a buffered change or read from the database)
+        self.last_values = {}
+        self.outer = None
+
+    def __enter__(self):
+        self.outer = get_history_buffer()
+        if self.outer is None:
+            _local.buffer = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.outer is not None:
+            return False
+        _local.buffer = None
+        if exc_type is None:
+            self.flush()
+        else:
+            self.discard()
+        return False
+
+    def add(self, rows, sync=False):
+        for row in rows:
+            self.last_values[
+                row.content_type_id, row.object_id, row.field_name
+            ] = row.new_value
+        if sync:
+            self.sync_rows.extend(rows)
+        else:
+            self.rows.extend(rows)
+
+    def get_last_value(self, content_type, object_id, field_name):
+        """Returns last known value of *field_name* of the object (or
+        ``None``)."""
+        return self.last_values.get(
+            (content_type.id, object_id, field_name),
+        )
+
+    def remember(self, content_type, object_id, field_name, value):
+        """Caches *value* as the last value of *field_name* of the object
+        until the buffer exits."""
+        self.last_values[content_type.id, object_id, field_name] = value
+
+    def flush(self):
+        rows, self.rows = self.rows, []
+        sync_rows, self.sync_rows = self.sync_rows, []
+        self.last_values = {}
+        if rows and not send_to_workers(rows):
+            sync_rows.extend(rows)
+        for i in xrange(0, len(sync_rows), INSERT_CHUNK_SIZE):
+            History.objects.bulk_create(sync_rows[i:i + INSERT_CHUNK_SIZE])
+
+    def discard(self):
+        self.rows = []
+        self.sync_rows = []
+        self.last_values = {}
+
+
+@contextmanager
+def history_transaction():
+    """Runs the block in ``transaction.commit_on_success`` and
+    :class:`HistoryBuffer`. Rows for rq workers are enqueued only after the
+    transaction commits (and dropped on rollback).
+
+    Inside another ``history_transaction`` or a transaction managed by
+    other code the block only joins it (like ``nested_commit_on_success``).
+    """
+    if (
+        getattr(_local, 'pending_rows', None) is not None or
+        transaction.is_managed()
+    ):
+        with HistoryBuffer():
+            yield
+        return
+    _local.pending_rows = []
+    try:
+        with transaction.commit_on_success(), HistoryBuffer():
+            yield
+        rows = _local.pending_rows
+    finally:
+        _local.pending_rows = None
+    if rows:
+        from ralph_assets.history.queue import enqueue_history
+        enqueue_history(rows)
+
+
+def commit_with_history(func):
+    """Decorator running *func* inside :func:`history_transaction`."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with history_transaction():
+            return func(*args, **kwargs)
+    return wrapper
+
 
 Snapshot = namedtuple(
     'Snapshot',
@@ -30,8 +225,51 @@ Snapshot = namedtuple(
 )
 
 
+def make_snapshot(obj, field_name, current, previous):
+    """Returns :class:`Snapshot` of m2m *field_name* of *obj* with
+    *current* primary keys, *previous* is the last logged value (JSON)."""
+    previous = previous and json.loads(previous) or []
+    deleted = set(previous) - set(current)
+    added = set(current) - set(previous)
+    changed = not set(current) == set(previous)
+    return Snapshot(
+        current, previous, added, deleted, changed, obj, field_name
+    )
+
+
+def get_m2m_snapshots(objects, field_name):
+    """Returns snapshots of m2m *field_name* of *objects* (instances of the
+    same model) made with a few queries, whatever the number of objects.
+    Primary keys are sorted, like in ``HistoryMixin.get_snapshot``."""
+    if not objects:
+        return []
+    model = objects[0].__class__
+    field = model._meta.get_field(field_name)
+    source = field.m2m_field_name()
+    target = field.m2m_reverse_field_name()
+    object_ids = [obj.pk for obj in objects]
+    current = dict((object_id, []) for object_id in object_ids)
+    rows = field.rel.through.objects.filter(
+        **{'{}__in'.format(source): object_ids}
+    ).order_by().values_list(source, target)
+    for object_id, related_id in rows:
+        current[object_id].append(related_id)
+    for related_ids in current.values():
+        related_ids.sort()
+    previous = History.objects.get_last_values(model, object_ids, field_name)
+    return [
+        make_snapshot(
+            obj, field_name, current[obj.pk], previous.get(obj.pk),
+        ) for obj in objects
+    ]
+
+
 class HistoryManager(models.Manager):
-    def get_history_for_this_object(self, obj, field_name=None):
+    def get_history_for_this_object(
+        self, obj, field_name=None, archived=False,
+    ):
+        """Returns queryset of changes of *obj*; with *archived* returns
+        :class:`HistoryWithArchive` of changes including archived ones."""
         if not obj:
             return
         content_type = ContentType.objects.get_for_model(obj.__class__)
@@ -43,7 +281,15 @@ class HistoryManager(models.Manager):
             kwargs.update({
                 'field_name': field_name
             })
-        return self.get_history_for_this_content_type(**kwargs)
+        history = self.get_history_for_this_content_type(**kwargs)
+        if not archived:
+            return history
+        archived_history = ArchivedHistory.objects.filter(
+            content_type=content_type, object_id=obj.id,
+        )
+        if field_name:
+            archived_history = archived_history.filter(field__name=field_name)
+        return HistoryWithArchive(history, archived_history)
 
     def get_history_for_this_content_type(
         self, content_type, object_id, **kwargs
@@ -54,7 +300,11 @@ class HistoryManager(models.Manager):
             **kwargs
         )
 
-    def log_changes(self, obj, user, diff_data):
+    def log_changes(self, obj, user, diff_data, sync=False):
+        """Saves *diff_data* changes of *obj* (added to the active
+        :class:`HistoryBuffer` instead, if any). Unless *sync* is set,
+        the rows may be written by rq workers (see
+        :mod:`ralph_assets.history.queue`)."""
         if not obj:
             return
         content_type = ContentType.objects.get_for_model(obj.__class__)
@@ -71,7 +321,108 @@ class HistoryManager(models.Manager):
                     new_value=data['new'] if data['new'] else '-',
                 )
             )
-        self.model.objects.bulk_create(changed_items)
+        history_buffer = get_history_buffer()
+        if history_buffer is not None:
+            history_buffer.add(changed_items, sync=sync)
+        elif sync or not send_to_workers(changed_items):
+            self.model.objects.bulk_create(changed_items)
+
+    def get_last_value(self, obj, field_name):
+        """Returns new value of the last logged change of *field_name* of
+        *obj* (or ``None``), including changes still in the buffer."""
+        return self.get_last_values(
+            obj.__class__, [obj.id], field_name,
+        ).get(obj.id)
+
+    def get_last_change_dates(self, model, object_ids, field_name,
+                              new_value):
+        """Returns dict object id -> date of the last change of
+        *field_name* to *new_value* of objects of *model* with
+        *object_ids*, read from the online and the archived history (a
+        query each)."""
+        content_type = ContentType.objects.get_for_model(model)
+        dates = {}
+        if not object_ids:
+            return dates
+        sources = (
+            (self.model.objects, 'field_name'),
+            (ArchivedHistory.objects, 'field__name'),
+        )
+        for manager, field_lookup in sources:
+            for row in manager.filter(
+                content_type=content_type,
+                object_id__in=object_ids,
+                new_value=new_value,
+                **{field_lookup: field_name}
+            ).order_by().values('object_id').annotate(last=Max('date')):
+                object_id = row['object_id']
+                if object_id not in dates or dates[object_id] < row['last']:
+                    dates[object_id] = row['last']
+        return dates
+
+    def get_last_values(self, model, object_ids, field_name):
+        """Returns dict object id -> new value of the last logged change of
+        *field_name* of objects of *model* with *object_ids* (objects
+        without changes are skipped).
+
+        Values are looked up in the active :class:`HistoryBuffer`, then in
+        the online and archived history (two queries each, for objects
+        still missing); the buffer caches them until it exits.
+        """
+        content_type = ContentType.objects.get_for_model(model)
+        history_buffer = get_history_buffer()
+        values = {}
+        if history_buffer is not None:
+            for object_id in object_ids:
+                value = history_buffer.get_last_value(
+                    content_type, object_id, field_name,
+                )
+                if value is not None:
+                    values[object_id] = value
+        sources = (
+            (self.model.objects, 'field_name'),
+            (ArchivedHistory.objects, 'field__name'),
+        )
+        for manager, field_lookup in sources:
+            missing = [pk for pk in object_ids if pk not in values]
+            if not missing:
+                break
+            changes = manager.filter(
+                content_type=content_type, **{field_lookup: field_name}
+            )
+            if len(missing) == 1:
+                rows = changes.filter(object_id=missing[0]).order_by(
+                    '-date', '-id',
+                ).values_list('object_id', 'new_value')[:1]
+            else:
+                rows = self._get_last_rows(changes, missing)
+            for object_id, value in rows:
+                values[object_id] = value
+                if history_buffer is not None:
+                    history_buffer.remember(
+                        content_type, object_id, field_name, value,
+                    )
+        return values
+
+    def _get_last_rows(self, changes, object_ids):
+        """Returns list of (object id, new value) of the last of *changes*
+        of every object, ordered by date and id like a single object's."""
+        last_dates = dict(
+            (row['object_id'], row['last']) for row in changes.filter(
+                object_id__in=object_ids,
+            ).order_by().values('object_id').annotate(last=Max('date'))
+        )
+        if not last_dates:
+            return []
+        last = {}
+        # changes made at the same time are overwritten by the later ones
+        for object_id, date, value in changes.filter(
+            object_id__in=list(last_dates),
+            date__in=set(last_dates.itervalues()),
+        ).order_by('id').values_list('object_id', 'date', 'new_value'):
+            if date == last_dates[object_id]:
+                last[object_id] = value
+        return last.items()
 
 
 class History(models.Model):
@@ -88,6 +439,8 @@ class History(models.Model):
     new_value = models.TextField(default='')
     objects = HistoryManager()
 
+    # (content_type, object_id, date, id) and (content_type, object_id,
+    # field_name, date, id) indexes are created by migration 0028
     class Meta:
         app_label = 'ralph_assets'
         verbose_name = _('history change')
@@ -112,6 +465,147 @@ class History(models.Model):
         })
 
 
+class HistoryField(models.Model):
+    """Name of a field referenced by archived history."""
+    name = models.CharField(max_length=64, unique=True)
+
+    class Meta:
+        app_label = 'ralph_assets'
+
+    def __unicode__(self):
+        return self.name
+
+
+class ArchivedHistory(models.Model):
+    """``History`` row moved out of the online table (see
+    :mod:`ralph_assets.history.archive`), it keeps the original id."""
+    id = models.PositiveIntegerField(primary_key=True)
+    date = models.DateTimeField()
+    user = models.ForeignKey(
+        'auth.User', null=True, blank=True, default=None,
+        on_delete=models.SET_NULL,
+    )
+    content_type = models.ForeignKey(ContentType)
+    object_id = models.PositiveIntegerField(db_index=True)
+    field = models.ForeignKey(HistoryField)
+    old_value = models.TextField(default='')
+    new_value = models.TextField(default='')
+
+    class Meta:
+        app_label = 'ralph_assets'
+
+    def as_history(self):
+        return History(
+            id=self.id,
+            date=self.date,
+            user_id=self.user_id,
+            content_type_id=self.content_type_id,
+            object_id=self.object_id,
+            field_name=self.field.name,
+            old_value=self.old_value,
+            new_value=self.new_value,
+        )
+
+
+class HistoryWithArchive(object):
+    """Online and archived changes read as one sequence of ``History``
+    instances (archived ones are unsaved), newest first.
+
+    It supports the part of the queryset API used by history readers and
+    paginators: ``filter`` (``field_name`` lookups are translated for the
+    archive, Q objects may reference only ``date`` and ``pk``),
+    ``order_by`` (by ``date`` and ``id``/``pk``), ``count``, iteration and
+    slicing. A slice ending at *stop* reads at most *stop* rows of each
+    table and merges them in Python, so keyset pages cost the same as
+    pages of the online table.
+    """
+    model = History
+
+    def __init__(self, history, archived, ordering=('-date', '-id')):
+        self.history = history
+        self.archived = archived
+        self.ordering = ordering
+
+    @property
+    def db(self):
+        return self.history.db
+
+    def _clone(self, history, archived, ordering=None):
+        return self.__class__(history, archived, ordering or self.ordering)
+
+    def filter(self, *args, **kwargs):
+        archived_kwargs = dict(
+            (key.replace('field_name', 'field__name', 1), value)
+            for key, value in kwargs.items()
+        )
+        return self._clone(
+            self.history.filter(*args, **kwargs),
+            self.archived.filter(*args, **archived_kwargs),
+        )
+
+    def order_by(self, *fields):
+        return self._clone(self.history, self.archived, fields)
+
+    def count(self):
+        return self.history.count() + self.archived.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __nonzero__(self):
+        return self.history.exists() or self.archived.exists()
+
+    def _rows(self, stop=None):
+        history = self.history.order_by(*self.ordering)
+        archived = self.archived.select_related('field').order_by(
+            *self.ordering
+        )
+        if stop is not None:
+            history = history[:stop]
+            archived = archived[:stop]
+        rows = list(history) + [row.as_history() for row in archived]
+        # stable sorts by the fields from the last one merge both tables
+        for field in reversed(self.ordering):
+            name = field.lstrip('-')
+            if name == 'pk':
+                name = 'id'
+            rows.sort(
+                key=lambda row: getattr(row, name),
+                reverse=field.startswith('-'),
+            )
+        return rows[:stop]
+
+    def __iter__(self):
+        return iter(self._rows())
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            if key.step is not None or (key.start or 0) < 0 or (
+                key.stop is not None and key.stop < 0
+            ):
+                raise ValueError('Only positive slices are supported.')
+            return self._rows(key.stop)[key.start:]
+        if key < 0:
+            raise ValueError('Negative indexing is not supported.')
+        return self._rows(key + 1)[key]
+
+
+class HistoryCheckpoint(models.Model):
+    """Values of the fields of an object registered in history (formatted
+    like ``History`` values) at *date*, see
+    :mod:`ralph_assets.history.states`."""
+    date = models.DateTimeField(default=datetime.now)
+    content_type = models.ForeignKey(ContentType)
+    object_id = models.PositiveIntegerField(db_index=True)
+    state = models.TextField(default='{}')
+
+    class Meta:
+        app_label = 'ralph_assets'
+
+    def get_state(self):
+        return json.loads(self.state)
+
+
 class HistoryMixin(object):
     """Django's raw m2m_change signal sucks when working with forms."""
 
@@ -127,31 +621,36 @@ class HistoryMixin(object):
             register(self.__class__, exclude=exclude)
             for field in self._meta.get_all_related_many_to_many_objects():
                 register(field.field.rel.through, m2m=True)
+        self.update_history_state()
 
-    def get_history(self, field_name=None):
+    def update_history_state(self):
+        """Remembers values of the instance, the next save is diffed against
+        the fields registered in history (see ``HistoryContext``)."""
+        remember_history_values(self)
+
+    def get_history(self, field_name=None, archived=False):
         return History.objects.get_history_for_this_object(
             obj=self,
             field_name=field_name,
+            archived=archived,
         )
 
     def get_snapshot(self, obj, manager, field_name):
         """Method returns snapshot from current state of object."""
-        snapshot = serializer.serialize(manager.all(), fields=())
-        try:
-            history = obj.get_history(field_name=field_name)[0]
-        except (IndexError, AttributeError):
-            history = None
-        previous = getattr(history, 'new_value', None)
-        previous = previous and json.loads(previous) or []
-        current = [s['pk'] for s in snapshot]
-        deleted = set(previous) - set(current)
-        added = set(current) - set(previous)
-        changed = not set(current) == set(previous)
-        return Snapshot(
-            current, previous, added, deleted, changed, obj, field_name
+        return make_snapshot(
+            obj, field_name,
+            sorted(manager.order_by().values_list('pk', flat=True)),
+            History.objects.get_last_value(obj, field_name),
         )
 
     def save_history_from_snapshot(self, snapshot):
+        history_buffer = get_history_buffer()
+        if history_buffer is not None and not snapshot.changed:
+            history_buffer.remember(
+                ContentType.objects.get_for_model(snapshot.obj.__class__),
+                snapshot.obj.id, snapshot.field_name,
+                json.dumps(snapshot.current),
+            )
         if snapshot.changed:
             History.objects.log_changes(
                 snapshot.obj,
@@ -160,13 +659,16 @@ class HistoryMixin(object):
                     'field': snapshot.field_name,
                     'old': json.dumps(snapshot.previous),
                     'new': json.dumps(snapshot.current),
-                }]
+                }],
+                # the next snapshot is diffed against it
+                sync=True,
             )
 
     def _save_related_objects_history(self, manager, related_pks, field_name):
-        for obj in manager.filter(pk__in=related_pks):
-            manager = getattr(obj, field_name)
-            snapshot = self.get_snapshot(obj, manager, field_name)
+        snapshots = get_m2m_snapshots(
+            list(manager.filter(pk__in=related_pks)), field_name,
+        )
+        for snapshot in snapshots:
             self.save_history_from_snapshot(snapshot)
 
     def save_reverse_relation_history(self):
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""Asynchronous writing of history.
+
+With ``ASSETS_ASYNC_HISTORY`` setting enabled, ``History`` rows of field
+changes are computed in the save path (with their dates) and sent to rq
+queues, workers insert them. Rows of an object always go to the same one of
+``QUEUES`` (chosen by a hash of its content type and id), run a single
+worker per queue to keep their order. History of many-to-many relations is
+always written synchronously, because it's diffed against the last logged
+value.
+
+Rows are enqueued after the outermost ``history_transaction`` commits (or
+when the change is logged in autocommit mode); inside transactions managed
+by other code they are inserted synchronously, so workers never write
+history of changes which aren't committed. Without the setting (e.g. in
+tests) rows are inserted synchronously.
+
+Readers of history are eventually consistent with the setting enabled:
+until the workers insert waiting rows, the history view, liquidation dates
+of assets (``Asset.get_liquidation_date``) and past states rebuilt by
+:mod:`ralph_assets.history.states` miss those changes (the states replay
+history backward from the current values, so they show the new values
+before the changes too). Run ``drain_history_queue`` command to insert
+waiting rows at once.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import binascii
+import datetime
+from collections import defaultdict
+
+import django_rq
+from django.conf import settings
+from rq import Worker
+
+from ralph_assets.history.models import INSERT_CHUNK_SIZE, History
+
+
+ASYNC_HISTORY_DEFAULTS = {
+    'ENABLE': False,
+    'QUEUES': ('history',),
+}
+# History fields sent to the workers
+ROW_FIELDS = (
+    'date', 'user_id', 'content_type_id', 'object_id', 'field_name',
+    'old_value', 'new_value',
+)
+
+
+def get_async_history_settings():
+    config = dict(ASYNC_HISTORY_DEFAULTS)
+    config.update(getattr(settings, 'ASSETS_ASYNC_HISTORY', {}))
+    return config
+
+
+def async_history_enabled():
+    return get_async_history_settings()['ENABLE']
+
+
+def get_queue_names():
+    return list(get_async_history_settings()['QUEUES'])
+
+
+def get_queue_name(content_type_id, object_id):
+    """Returns name of the queue of rows of the object."""
+    queues = get_queue_names()
+    key = '{}:{}'.format(content_type_id, object_id).encode('ascii')
+    return queues[(binascii.crc32(key) & 0xffffffff) % len(queues)]
+
+
+def persist_history(rows):
+    """Inserts history *rows* (dicts of ``ROW_FIELDS``), run by workers."""
+    history = [History(**row) for row in rows]
+    for i in xrange(0, len(history), INSERT_CHUNK_SIZE):
+        History.objects.bulk_create(history[i:i + INSERT_CHUNK_SIZE])
+
+
+def enqueue_history(rows):
+    """Sends ``History`` instances *rows* to the queues, a single job per
+    queue."""
+    per_queue = defaultdict(list)
+    for row in rows:
+        per_queue[get_queue_name(row.content_type_id, row.object_id)].append(
+            dict((field, getattr(row, field)) for field in ROW_FIELDS)
+        )
+    for name, queue_rows in per_queue.iteritems():
+        django_rq.get_queue(name).enqueue(persist_history, queue_rows)
+
+
+def get_queues_lag():
+    """Returns list of tuples (queue name, number of waiting jobs, age of
+    the oldest waiting job as ``timedelta`` or ``None``)."""
+    now = datetime.datetime.utcnow()
+    lag = []
+    for name in get_queue_names():
+        queue = django_rq.get_queue(name)
+        age = None
+        for job in queue.get_jobs(0, 1):
+            if job.enqueued_at:
+                age = now - job.enqueued_at
+        lag.append((name, queue.count, age))
+    return lag
+
+
+def drain_queues():
+    """Runs a burst rq worker in the current process performing waiting
+    jobs of all the queues in order (failed jobs go to the failed queue,
+    like with regular workers). Returns the number of jobs taken from the
+    queues."""
+    names = get_queue_names()
+    queues = [django_rq.get_queue(name) for name in names]
+    waiting = sum(queue.count for queue in queues)
+    Worker(queues, connection=queues[0].connection).work(burst=True)
+    return waiting - sum(queue.count for queue in queues)
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+"""Values of objects' fields registered in history as of a given date.
+
+The state at a date is rebuilt from the nearest :class:`HistoryCheckpoint`
+of the object: changes logged after an earlier checkpoint are replayed
+forward (their new values), changes logged before a later checkpoint (or
+the current values of the object, when there's none) are replayed backward
+(their old values). ``create_checkpoints`` (run periodically by
+``create_history_checkpoints`` command) adds a checkpoint every
+``ASSETS_HISTORY_CHECKPOINT_INTERVAL`` changes of an object, so a lookup
+reads a bounded number of ``History`` rows however long the history is.
+
+Values are formatted like ``History`` values (labels of relations and
+choices, ``'-'`` for empty values). Checkpoints are ordered by their
+primary keys, so they have to be created in chronological order. With
+asynchronous history, changes still waiting in the queues aren't replayed
+(see :mod:`ralph_assets.history.queue`).
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Max, Min
+
+from ralph_assets.history import registry
+from ralph_assets.history.models import (
+    INSERT_CHUNK_SIZE,
+    ArchivedHistory,
+    History,
+    HistoryCheckpoint,
+)
+from ralph_assets.history.utils import get_history_values
+from ralph_assets.utils import iter_chunks
+
+
+def checkpoint_interval():
+    """Number of changes of an object between its checkpoints
+    (``ASSETS_HISTORY_CHECKPOINT_INTERVAL`` setting)."""
+    return getattr(settings, 'ASSETS_HISTORY_CHECKPOINT_INTERVAL', 50)
+
+
+def _get_checkpoints(content_type, object_ids, aggregate, **filters):
+    """Returns dict object id -> the first (*aggregate* is ``Min``) or the
+    last (``Max``) checkpoint matching *filters*."""
+    if not object_ids:
+        return {}
+    ids = [
+        row['checkpoint'] for row in HistoryCheckpoint.objects.filter(
+            content_type=content_type, object_id__in=object_ids, **filters
+        ).order_by().values('object_id').annotate(checkpoint=aggregate('id'))
+    ]
+    return dict(
+        (checkpoint.object_id, checkpoint)
+        for checkpoint in HistoryCheckpoint.objects.filter(id__in=ids)
+    )
+
+
+def _get_changes(content_type, fields, value, descending, **filters):
+    """Returns list of (object id, field name, *value*, date) of changes
+    (online and archived) of *fields* matching *filters*, ordered by date.
+    """
+    rows = list(History.objects.filter(
+        content_type=content_type, field_name__in=fields, **filters
+    ).values_list('object_id', 'field_name', value, 'date', 'id'))
+    rows.extend(ArchivedHistory.objects.filter(
+        content_type=content_type, field__name__in=fields, **filters
+    ).values_list('object_id', 'field__name', value, 'date', 'id'))
+    rows.sort(key=lambda row: (row[3], row[4]), reverse=descending)
+    return [row[:4] for row in rows]
+
+
+def _get_states(objects, date):
+    """Returns dict primary key -> state at *date* of *objects* (instances
+    of the same model)."""
+    if not objects:
+        return {}
+    model = objects[0].__class__
+    fields = registry.get(model, set())
+    content_type = ContentType.objects.get_for_model(model)
+    ids = [obj.pk for obj in objects]
+    earlier = _get_checkpoints(content_type, ids, Max, date__lte=date)
+    later = _get_checkpoints(
+        content_type, [pk for pk in ids if pk not in earlier], Min,
+        date__gt=date,
+    )
+    states = {}
+    if earlier:
+        for pk, checkpoint in earlier.iteritems():
+            states[pk] = checkpoint.get_state()
+        rows = _get_changes(
+            content_type, fields, 'new_value', False,
+            object_id__in=earlier.keys(),
+            date__gt=min(checkpoint.date for checkpoint in earlier.values()),
+            date__lte=date,
+        )
+        for pk, field_name, value, changed in rows:
+            if changed > earlier[pk].date:
+                states[pk][field_name] = value
+    backward = [obj for obj in objects if obj.pk not in earlier]
+    if backward:
+        for obj in backward:
+            if obj.pk in later:
+                states[obj.pk] = later[obj.pk].get_state()
+            else:
+                states[obj.pk] = get_history_values(obj)
+        filters = {
+            'object_id__in': [obj.pk for obj in backward],
+            'date__gt': date,
+        }
+        if len(later) == len(backward):
+            filters['date__lte'] = max(
+                checkpoint.date for checkpoint in later.values()
+            )
+        rows = _get_changes(content_type, fields, 'old_value', True, **filters)
+        for pk, field_name, value, changed in rows:
+            if pk not in later or changed <= later[pk].date:
+                states[pk][field_name] = value
+    return states
+
+
+def get_state_at(obj, date):
+    """Returns dict field name -> value of *obj* at *date* (a datetime)."""
+    return _get_states([obj], date)[obj.pk]
+
+
+def get_states_at(queryset, date, chunk_size=500):
+    """Yields pairs (object, state at *date*) of all objects from
+    *queryset*, with a few queries per chunk of *chunk_size* objects.
+
+    Objects without a later checkpoint start from their current values, so
+    select related objects shown in history in *queryset*.
+    """
+    for objects in iter_chunks(queryset, chunk_size):
+        states = _get_states(objects, date)
+        for obj in objects:
+            yield obj, states[obj.pk]
+
+
+def create_checkpoint(obj, date=None):
+    """Saves current values of *obj* as its checkpoint."""
+    return HistoryCheckpoint.objects.create(
+        content_type=ContentType.objects.get_for_model(obj.__class__),
+        object_id=obj.pk,
+        date=date or datetime.now(),
+        state=json.dumps(get_history_values(obj)),
+    )
+
+
+def create_checkpoints(queryset, interval=None, chunk_size=500):
+    """Creates checkpoints of objects from *queryset* with at least
+    *interval* changes logged since their last checkpoint. Returns the
+    number of created checkpoints."""
+    if interval is None:
+        interval = checkpoint_interval()
+    content_type = ContentType.objects.get_for_model(queryset.model)
+    created = 0
+    for objects in iter_chunks(queryset, chunk_size):
+        # the model is registered in history by its first instance
+        changes = History.objects.filter(
+            content_type=content_type,
+            field_name__in=registry.get(queryset.model, set()),
+        ).order_by()
+        ids = [obj.pk for obj in objects]
+        last = _get_checkpoints(content_type, ids, Max)
+        counts = dict(
+            (row['object_id'], row['changes']) for row in changes.filter(
+                object_id__in=[pk for pk in ids if pk not in last],
+            ).values('object_id').annotate(changes=Count('id'))
+        )
+        if last:
+            rows = changes.filter(
+                object_id__in=last.keys(),
+                date__gt=min(checkpoint.date for checkpoint in last.values()),
+            ).values_list('object_id', 'date')
+            for pk, changed in rows:
+                if changed > last[pk].date:
+                    counts[pk] = counts.get(pk, 0) + 1
+        now = datetime.now()
+        checkpoints = [
+            HistoryCheckpoint(
+                content_type=content_type,
+                object_id=obj.pk,
+                date=now,
+                state=json.dumps(get_history_values(obj)),
+            )
+            for obj in objects if counts.get(obj.pk, 0) >= interval
+        ]
+        for i in xrange(0, len(checkpoints), INSERT_CHUNK_SIZE):
+            HistoryCheckpoint.objects.bulk_create(
+                checkpoints[i:i + INSERT_CHUNK_SIZE],
+            )
+        created += len(checkpoints)
+    return created
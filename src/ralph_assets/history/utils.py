@@ -5,11 +5,17 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from django.core import serializers
 from django.db.models.fields import FieldDoesNotExist
 from django.db.models.fields.related import RelatedField
+from django.utils.encoding import is_protected_type, smart_unicode
 
-from ralph_assets.history.models import History
+from ralph_assets.history.models import (
+    DEFERRED,
+    History,
+    get_history_state,
+    get_remembered_history_state,
+    remember_history_values,
+)
 
 
 def field_changes(instance, ignore=('id', 'ralph_device_id')):
@@ -67,94 +73,110 @@ def get_choices(instance, field, id):
             return value
 
 
-class DictDiffer(object):
-    """Two dicts compared for detect changes."""
-    def __init__(self, current_dict, past_dict):
-        self.current_dict, self.past_dict = current_dict, past_dict
-        self.set_current = set(current_dict.keys())
-        self.set_past = set(past_dict.keys())
-        self.intersect = self.set_current.intersection(self.set_past)
+def _serialize(value):
+    """Returns *value* as stored in history (like Django's python
+    serializer)."""
+    if is_protected_type(value):
+        return value
+    return smart_unicode(value)
 
-    def changed(self):
-        for change in self.intersect:
-            past_value = self.past_dict[change]
-            current_value = self.current_dict[change]
-            # cast to unicode
-            if unicode(past_value) != unicode(current_value):
-                yield change
+
+def get_history_values(obj):
+    """Returns values of the fields of *obj* registered in history,
+    formatted like ``History`` values (labels of relations and choices)."""
+    from ralph_assets.history import registry
+    values = {}
+    for name in registry.get(obj.__class__, ()):
+        field = obj._meta.get_field(name)
+        if isinstance(field, RelatedField):
+            value = str(getattr(obj, name))
+        elif field.choices:
+            value = get_choices(obj, name, getattr(obj, field.attname))
+        else:
+            value = _serialize(getattr(obj, field.attname))
+        values[name] = unicode(value) if value else '-'
+    return values
 
 
 class HistoryContext(object):
+    """Logs changes of registered fields made by a single save.
+
+    The values are compared with the state remembered by ``HistoryMixin``
+    when the instance was loaded (or last saved), so unchanged saves don't
+    query the database. Instances created with an explicit primary key or
+    with deferred fields are compared with the database row instead.
+    """
 
     def __init__(self):
-        self.serializer = serializers.get_serializer("python")()
         self.obj = None
 
-    def get_fields_snapshot(self, objs):
-        if not any(objs):
-            return
-        kwargs = {}
-        fields = self.registry.get(objs[0].__class__, [])
-        if fields:
-            kwargs.update({'fields': fields})
-        return self.serializer.serialize(objs, **kwargs)
-
-    @property
-    def registry(self):
-        from ralph_assets.history import registry
-        return registry
+    def get_past_state(self):
+        obj = self.obj
+        if obj.pk is None:
+            return None
+        state = get_remembered_history_state(obj)
+        if state is None or obj._state.adding or DEFERRED in state.values():
+            try:
+                pre_obj = self.model._default_manager.get(pk=obj.pk)
+            except self.model.DoesNotExist:
+                return None
+            state = get_history_state(pre_obj)
+        return state
 
     def pre_save(self):
-        self.pre_obj = None
-        try:
-            self.pre_obj = self.model._default_manager.get(pk=self.obj.pk)
-        except self.model.DoesNotExist:
-            return
-        self.past_snapshot = self.get_fields_snapshot(
-            [self.pre_obj]
-        )[0]['fields']
-
-    def post_save(self):
-        if not self.pre_obj:
-            return
-        current_snapshot = self.get_fields_snapshot([self.obj])[0]['fields']
+        self.past_state = self.get_past_state()
 
-        fields_diff = DictDiffer(
-            current_snapshot, self.past_snapshot
-        ).changed()
+    def get_related_label(self, field, pk):
+        """Returns label of object *pk* of *field* relation (it queries only
+        for relations which have changed)."""
+        if pk is None:
+            return str(None)
+        try:
+            return str(field.rel.to._base_manager.get(
+                **{field.rel.field_name: pk}
+            ))
+        except field.rel.to.DoesNotExist:
+            return str(None)
 
+    def get_diff(self, past_state, current_state):
         diff_data = []
-        for field in fields_diff:
-            old_value = self.past_snapshot[field]
-            new_value = current_snapshot[field]
-            old_field = self.pre_obj._meta.get_field_by_name(field)[0]
-            new_field = self.obj._meta.get_field_by_name(field)[0]
-            if isinstance(new_field, RelatedField):
-                old_value = str(getattr(self.pre_obj, field))
-                new_value = str(getattr(self.obj, field))
-            elif hasattr(old_field, 'choices') and old_field.choices:
-                if int(old_value) == int(new_value):
-                    continue
-                old_value = get_choices(self.pre_obj, field, old_value)
-                new_value = get_choices(self.obj, field, new_value)
-            elif hasattr(self.obj, 'get_{}_display'.format(field)):
-                old_value = getattr(
-                    self.pre_obj, 'get_{}_display'.format(field)
-                )()
-                new_value = getattr(
-                    self.obj, 'get_{}_display'.format(field)
-                )()
-
+        for name, current in current_state.iteritems():
+            past = past_state.get(name, DEFERRED)
+            if past is DEFERRED or current is DEFERRED:
+                continue
+            if unicode(past) == unicode(current):
+                continue
+            field = self.model._meta.get_field(name)
+            if isinstance(field, RelatedField):
+                old_value = self.get_related_label(field, past)
+                new_value = str(getattr(self.obj, name))
+            elif field.choices:
+                try:
+                    if int(past) == int(current):
+                        continue
+                except (TypeError, ValueError):
+                    pass
+                old_value = get_choices(self.obj, name, past)
+                new_value = get_choices(self.obj, name, current)
+            else:
+                old_value = _serialize(past)
+                new_value = _serialize(current)
             if old_value != new_value:
-                diff_data.append(
-                    {
-                        'field': field,
-                        'old': old_value,
-                        'new': new_value,
-                    }
-                )
+                diff_data.append({
+                    'field': name,
+                    'old': old_value,
+                    'new': new_value,
+                })
+        return diff_data
+
+    def post_save(self):
+        current_state = get_history_state(self.obj)
+        remember_history_values(self.obj)
+        if self.past_state is None:
+            return
         History.objects.log_changes(
-            self.obj, getattr(self.obj, 'saving_user', None), diff_data
+            self.obj, getattr(self.obj, 'saving_user', None),
+            self.get_diff(self.past_state, current_state),
         )
 
     def start(self, sender, obj, m2m=False, pk_set=set(), reverse=False):
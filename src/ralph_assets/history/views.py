@@ -38,33 +38,49 @@ class HistoryBase(AssetsBase):
 
 
 class HistoryListForModel(PaginateMixin, ContentTypeMixin, HistoryBase):
-    """View for history of object."""
+    """View for history of object. Archived changes (see
+    :mod:`ralph_assets.history.archive`) are shown with ``archived``
+    parameter."""
     template_name = 'assets/history/history_for_model.html'
+    paginate_ordering = '-date'
 
     def dispatch(self, request, *args, **kwargs):
         self.status = bool(request.GET.get('status', ''))
+        self.archived = bool(request.GET.get('archived', ''))
         return super(HistoryListForModel, self).dispatch(
             request, *args, **kwargs
         )
 
     def get_paginate_queryset(self):
-        history = History.objects.get_history_for_this_content_type(
-            content_type=self.content_type,
-            object_id=self.object_id,
-        )
         self.show_status_button = True
         try:
             self.model._meta.get_field_by_name('status')
         except FieldDoesNotExist:
             self.show_status_button = False
+        field_name = None
         if self.status and self.show_status_button:
-            history = history.filter(field_name__exact='status')
+            field_name = 'status'
+        if self.archived:
+            return History.objects.get_history_for_this_object(
+                obj=self.content_type.get_object_for_this_type(
+                    id=self.object_id,
+                ),
+                field_name=field_name,
+                archived=True,
+            )
+        history = History.objects.get_history_for_this_content_type(
+            content_type=self.content_type,
+            object_id=self.object_id,
+        )
+        if field_name:
+            history = history.filter(field_name__exact=field_name)
         return history
 
     def get_context_data(self, **kwargs):
         context = super(HistoryListForModel, self).get_context_data(**kwargs)
         context.update({
             'status': self.status,
+            'archived': self.archived,
             'show_status_button': self.show_status_button,
         })
         return context
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+
+"""Query count and latency instrumentation of views and code sections.
+
+:class:`Section` (a context manager, or :func:`instrumented` decorator)
+measures the number of queries, the database time, the Python time (the
+rest of the wall time) and the number of rows reported by the database
+driver for a named block of code; :class:`InstrumentationMiddleware` does
+it for every ``ralph_assets`` view, named after its dotted path (e.g.
+``ralph_assets.views.device.EditDevice``).
+
+Configured with ``ASSETS_INSTRUMENTATION`` setting: measurements of a name
+are summed up in one of Django caches (``CACHE`` alias) and shown by
+``instrumentation_stats`` command; ``BUDGETS`` maps names to limits of
+``queries``, ``db_time`` and ``time`` (in seconds), a section exceeding
+them is logged or, with ``RAISE`` (e.g. in tests), raises
+:class:`BudgetExceeded`. Slow queries of sections are captured as
+:class:`ralph_assets.models_instrumentation.SlowQuery` and saved when the
+outermost section exits outside of a managed transaction, or when the
+request finishes.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import logging
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import get_cache
+from django.core.signals import request_finished
+from django.db import connection, transaction
+from django.db.backends.util import CursorDebugWrapper
+
+from ralph_assets.models_instrumentation import (
+    get_slow_queries_settings,
+    record_slow_query,
+    save_slow_queries,
+)
+
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'ralph_assets.instrumentation'
+INSTRUMENTATION_DEFAULTS = {
+    'ENABLE': False,
+    'CACHE': 'default',
+    'BUDGETS': {},
+    'RAISE': False,
+}
+# measured values, compared with budgets
+MEASURES = ('queries', 'db_time', 'time')
+
+_local = threading.local()
+
+
+class BudgetExceeded(AssertionError):
+    pass
+
+
+def get_instrumentation_settings():
+    config = dict(INSTRUMENTATION_DEFAULTS)
+    config.update(getattr(settings, 'ASSETS_INSTRUMENTATION', {}))
+    return config
+
+
+def get_backend():
+    return get_cache(get_instrumentation_settings()['CACHE'])
+
+
+def _get_sections():
+    if not hasattr(_local, 'sections'):
+        _local.sections = []
+    return _local.sections
+
+
+class InstrumentedCursor(CursorDebugWrapper):
+    """Debug cursor passing time and row count of every query to the active
+    sections and capturing slow queries."""
+
+    def execute(self, sql, params=()):
+        start = time.time()
+        try:
+            result = super(InstrumentedCursor, self).execute(sql, params)
+        except Exception:
+            self._record(time.time() - start)
+            raise
+        self._record(time.time() - start, sql, params)
+        return result
+
+    def executemany(self, sql, param_list):
+        start = time.time()
+        try:
+            result = super(InstrumentedCursor, self).executemany(
+                sql, param_list,
+            )
+        except Exception:
+            self._record(time.time() - start)
+            raise
+        # there's no single plan of many queries
+        self._record(time.time() - start, sql)
+        return result
+
+    def _record(self, duration, sql=None, params=None):
+        """Adds the query to the sections, captures it when it's slow (and
+        succeeded, *sql* is given)."""
+        if getattr(_local, 'capturing', False):
+            # queries storing a slow query aren't measured
+            return
+        sections = _get_sections()
+        # -1 (or None) when the driver doesn't know it
+        rows = max(self.cursor.rowcount or 0, 0)
+        for section in sections:
+            section.queries += 1
+            section.db_time += duration
+            section.rows += rows
+        if not (sections and sql):
+            return
+        config = get_slow_queries_settings()
+        if config['ENABLE'] and duration >= config['THRESHOLD']:
+            self._capture(sections, sql, params, duration)
+
+    def _capture(self, sections, sql, params, duration):
+        request_params = next(
+            (s.params for s in reversed(sections) if s.params), None,
+        )
+        _local.capturing = True
+        try:
+            record_slow_query(
+                self.db, sections[-1].name, request_params, sql, params,
+                self.db.queries[-1]['sql'] if self.db.queries else sql,
+                duration,
+            )
+        finally:
+            _local.capturing = False
+
+
+class Section(object):
+    """Measures queries and time of the ``with`` block named *name*, the
+    result is added to the stats (when the instrumentation is enabled) and
+    checked against the budget of *name*. Does nothing when neither is
+    configured (nor slow queries are captured), unless *force* is given.
+    *params* (e.g. ``request.GET``) are stored with slow queries."""
+
+    def __init__(self, name, force=False, params=None):
+        self.name = name
+        self.force = force
+        self.params = params
+        self.queries = 0
+        self.rows = 0
+        self.db_time = 0.0
+        self.time = 0.0
+
+    @property
+    def python_time(self):
+        return max(self.time - self.db_time, 0.0)
+
+    def __enter__(self):
+        config = get_instrumentation_settings()
+        # without stats nor budget there's nothing to measure for
+        self.active = (
+            self.force or config['ENABLE'] or
+            self.name in config['BUDGETS'] or
+            get_slow_queries_settings()['ENABLE']
+        )
+        if not self.active:
+            return self
+        sections = _get_sections()
+        if not sections:
+            self._patch_connection()
+        sections.append(self)
+        self.started = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self.active:
+            return False
+        self.time = time.time() - self.started
+        sections = _get_sections()
+        sections.remove(self)
+        if not sections:
+            self._restore_connection()
+            # otherwise rolling back the transaction would discard them
+            if not transaction.is_managed():
+                save_slow_queries()
+        if get_instrumentation_settings()['ENABLE']:
+            record_stats(self)
+        if exc_type is None:
+            self.check_budget()
+        return False
+
+    def _patch_connection(self):
+        self.use_debug_cursor = connection.use_debug_cursor
+        self.queries_logged = len(connection.queries)
+        connection.use_debug_cursor = True
+        connection.make_debug_cursor = lambda cursor: InstrumentedCursor(
+            cursor, connection,
+        )
+
+    def _restore_connection(self):
+        del connection.make_debug_cursor
+        if not (self.use_debug_cursor or settings.DEBUG):
+            # the queries wouldn't be logged without the section
+            del connection.queries[self.queries_logged:]
+        connection.use_debug_cursor = self.use_debug_cursor
+
+    def get_measures(self):
+        return {
+            'queries': self.queries,
+            'rows': self.rows,
+            'db_time': self.db_time,
+            'python_time': self.python_time,
+            'time': self.time,
+        }
+
+    def check_budget(self):
+        config = get_instrumentation_settings()
+        budget = config['BUDGETS'].get(self.name)
+        if not budget:
+            return
+        measures = self.get_measures()
+        exceeded = [
+            '{} {:.3f} > {}'.format(
+                measure, measures[measure], budget[measure],
+            )
+            for measure in MEASURES
+            if measure in budget and measures[measure] > budget[measure]
+        ]
+        if not exceeded:
+            return
+        message = '{} exceeded its budget: {}'.format(
+            self.name, ', '.join(exceeded),
+        )
+        if config['RAISE']:
+            raise BudgetExceeded(message)
+        logger.warning(message)
+
+
+def instrumented(name):
+    """Decorator running the function in :class:`Section` *name*."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with Section(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _stats_key(name):
+    return '{}.stats.{}'.format(KEY_PREFIX, name)
+
+
+_NAMES_KEY = '{}.names'.format(KEY_PREFIX)
+
+
+def record_stats(section):
+    """Adds measures of *section* to the stats of its name (not atomic,
+    concurrent updates may be lost)."""
+    backend = get_backend()
+    key = _stats_key(section.name)
+    stats = backend.get(key) or {'calls': 0, 'max_queries': 0}
+    stats['calls'] += 1
+    for measure, value in section.get_measures().iteritems():
+        stats[measure] = stats.get(measure, 0) + value
+    stats['max_queries'] = max(stats['max_queries'], section.queries)
+    backend.set(key, stats, None)
+    names = backend.get(_NAMES_KEY) or []
+    if section.name not in names:
+        backend.set(_NAMES_KEY, names + [section.name], None)
+
+
+def get_stats():
+    """Returns dict name -> summed measures (and number of ``calls``)."""
+    backend = get_backend()
+    names = backend.get(_NAMES_KEY) or []
+    stats = backend.get_many([_stats_key(name) for name in names])
+    return dict(
+        (name, stats[_stats_key(name)]) for name in names
+        if _stats_key(name) in stats
+    )
+
+
+def reset_stats():
+    backend = get_backend()
+    names = backend.get(_NAMES_KEY) or []
+    backend.delete_many([_stats_key(name) for name in names])
+    backend.delete(_NAMES_KEY)
+
+
+class InstrumentationMiddleware(object):
+    """Runs every ``ralph_assets`` view in :class:`Section` named after the
+    view."""
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        module = getattr(view_func, '__module__', '') or ''
+        if not module.startswith('ralph_assets.'):
+            return None
+        section = Section(
+            '{}.{}'.format(module, view_func.__name__), params=request.GET,
+        )
+        section.__enter__()
+        request._assets_section = section
+        return None
+
+    def process_response(self, request, response):
+        section = getattr(request, '_assets_section', None)
+        if section is not None:
+            del request._assets_section
+            section.__exit__(None, None, None)
+        return response
+
+
+def save_slow_queries_on_request_finished(sender, **kwargs):
+    save_slow_queries()
+
+
+request_finished.connect(
+    save_slow_queries_on_request_finished,
+    dispatch_uid='assets.instrumentation.save_slow_queries',
+)
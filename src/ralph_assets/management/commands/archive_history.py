@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import textwrap
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from optparse import make_option
+
+from ralph_assets.history.archive import archive_days, archive_history
+
+
+class Command(BaseCommand):
+    """Move history older than ASSETS_HISTORY_ARCHIVE_DAYS days to the
+    archive table."""
+    help = textwrap.dedent(__doc__).strip()
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--days',
+            type='int',
+            dest='days',
+            default=None,
+            help="Archive history older than that many days",
+        ),
+        make_option(
+            '--chunk-size',
+            type='int',
+            dest='chunk_size',
+            default=500,
+            help="Number of rows moved in a single transaction",
+        ),
+    )
+
+    def handle(self, *args, **options):
+        days = options['days']
+        if days is None:
+            days = archive_days()
+        moved = archive_history(
+            before=datetime.now() - timedelta(days=days),
+            chunk_size=options['chunk_size'],
+        )
+        self.stdout.write('Archived {} history rows.\n'.format(moved))
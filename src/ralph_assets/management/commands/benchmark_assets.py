@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import datetime
+import json
+import textwrap
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from optparse import make_option
+
+from ralph_assets.benchmarks import BENCHMARKS, run_benchmarks
+from ralph_assets.synthetic import generate_inventory
+
+
+def _parse_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class Command(BaseCommand):
+    """Time asset search, CSV export, reports, REST and tastypie APIs, the
+    Scrooge and pricing feeds and XLS import on synthetic inventories of
+    growing sizes (generated as needed, run it on a throwaway database).
+    Results are written as JSON and can be compared with a previous run."""
+    help = textwrap.dedent(__doc__).strip()
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--scales',
+            dest='scales',
+            default='10000,100000',
+            help="Comma separated numbers of synthetic assets",
+        ),
+        make_option(
+            '--samples',
+            type='int',
+            dest='samples',
+            default=5,
+            help="Number of timed runs of each benchmark",
+        ),
+        make_option(
+            '--only',
+            dest='only',
+            default='',
+            help="Comma separated names of benchmarks to run",
+        ),
+        make_option(
+            '--output',
+            dest='output',
+            default=None,
+            help="Write results to this JSON file",
+        ),
+        make_option(
+            '--compare',
+            dest='compare',
+            default=None,
+            help="Compare results with this JSON file of a previous run",
+        ),
+    )
+
+    def handle(self, *args, **options):
+        try:
+            scales = sorted(int(scale) for scale in _parse_list(
+                options['scales']
+            ))
+        except ValueError:
+            raise CommandError('Scales have to be numbers.')
+        names = _parse_list(options['only'])
+        unknown = set(names) - set(name for name, _, _ in BENCHMARKS)
+        if unknown:
+            raise CommandError('Unknown benchmarks: {}'.format(
+                ', '.join(sorted(unknown)),
+            ))
+        results = {
+            'date': datetime.datetime.now().isoformat(),
+            'database': connection.vendor,
+            'scales': {},
+        }
+        for scale in scales:
+            self.log('Scale {}'.format(scale))
+            generate_inventory(scale, log=self.log)
+            results['scales'][str(scale)] = run_benchmarks(
+                options['samples'], names, log=self.log,
+            )
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+        if options['compare']:
+            with open(options['compare']) as previous:
+                self.compare(json.load(previous), results)
+
+    def log(self, message):
+        self.stdout.write(message + '\n')
+
+    def compare(self, previous, results):
+        """Shows ratios of median times of benchmarks run in both runs."""
+        for scale, benchmarks in sorted(
+            results['scales'].items(), key=lambda item: int(item[0]),
+        ):
+            before = previous['scales'].get(scale, {})
+            for name, measures in sorted(benchmarks.items()):
+                if name not in before:
+                    continue
+                self.stdout.write(
+                    '{} {}: {:.2f} -> {:.2f} ms ({:+.0%}), '
+                    '{} -> {} queries\n'.format(
+                        scale, name,
+                        before[name]['median_ms'], measures['median_ms'],
+                        measures['median_ms'] /
+                        max(before[name]['median_ms'], 0.001) - 1,
+                        before[name]['queries'], measures['queries'],
+                    )
+                )
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import datetime
+import random
+import textwrap
+import time
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from optparse import make_option
+
+from ralph_assets.history.models import History
+from ralph_assets.views.base import HISTORY_PAGE_SIZE
+from ralph_assets.views.pagination import paginate_keyset
+
+
+BENCHMARK_MODEL = 'historybenchmark'
+FIELDS = ('status', 'owner', 'user', 'warehouse', 'remarks')
+
+
+class Command(BaseCommand):
+    """Time history lookups (the history page of an object, its next page
+    and the last change of a field) on a table filled with synthetic rows.
+    The rows belong to a separate content type, run it on a copy of the
+    production database."""
+    help = textwrap.dedent(__doc__).strip()
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--rows',
+            type='int',
+            dest='rows',
+            default=10000000,
+            help="Number of synthetic history rows",
+        ),
+        make_option(
+            '--objects',
+            type='int',
+            dest='objects',
+            default=100000,
+            help="Number of objects the rows are spread over",
+        ),
+        make_option(
+            '--samples',
+            type='int',
+            dest='samples',
+            default=200,
+            help="Number of timed lookups of each kind",
+        ),
+        make_option(
+            '--chunk-size',
+            type='int',
+            dest='chunk_size',
+            default=1000,
+            help="Number of rows inserted at once (use 100 on SQLite)",
+        ),
+        make_option(
+            '--clean',
+            action='store_true',
+            dest='clean',
+            default=False,
+            help="Remove the synthetic rows and exit",
+        ),
+    )
+
+    def handle(self, *args, **options):
+        content_type, created = ContentType.objects.get_or_create(
+            app_label='ralph_assets', model=BENCHMARK_MODEL,
+            defaults={'name': 'history benchmark'},
+        )
+        if options['clean']:
+            self.clean(content_type)
+            return
+        rows = History.objects.filter(content_type=content_type).count()
+        if rows < options['rows']:
+            self.fill(
+                content_type, rows, options['rows'], options['objects'],
+                options['chunk_size'],
+            )
+        object_ids = [
+            random.randint(1, options['objects'])
+            for _ in xrange(options['samples'])
+        ]
+        history = History.objects.filter(content_type=content_type)
+        self.report('history page', object_ids, lambda object_id: list(
+            paginate_keyset(
+                history.filter(object_id=object_id), '-date', None,
+                HISTORY_PAGE_SIZE,
+            )
+        ))
+        cursors = dict(
+            (object_id, paginate_keyset(
+                history.filter(object_id=object_id), '-date', None,
+                HISTORY_PAGE_SIZE,
+            ).next_cursor) for object_id in object_ids
+        )
+        self.report('next history page', object_ids, lambda object_id: list(
+            paginate_keyset(
+                history.filter(object_id=object_id), '-date',
+                cursors[object_id], HISTORY_PAGE_SIZE,
+            )
+        ))
+        self.report('last change of field', object_ids, lambda object_id: list(
+            history.filter(
+                object_id=object_id, field_name=random.choice(FIELDS),
+            ).order_by('-date', '-id')[:1]
+        ))
+
+    def fill(self, content_type, start, rows, objects, chunk_size):
+        self.stdout.write('Inserting {} rows...\n'.format(rows - start))
+        first_date = datetime.datetime(2010, 1, 1)
+        # rows are spread over 5 years
+        step = datetime.timedelta(seconds=5 * 365 * 24 * 3600 / rows)
+        for chunk_start in xrange(start, rows, chunk_size):
+            chunk_end = min(chunk_start + chunk_size, rows)
+            History.objects.bulk_create([
+                History(
+                    content_type=content_type,
+                    object_id=i % objects + 1,
+                    field_name=FIELDS[i // objects % len(FIELDS)],
+                    old_value='value {}'.format(i - objects),
+                    new_value='value {}'.format(i),
+                    date=first_date + i * step,
+                )
+                for i in xrange(chunk_start, chunk_end)
+            ])
+
+    def clean(self, content_type):
+        # deleting through the ORM would load all rows
+        qn = connection.ops.quote_name
+        connection.cursor().execute(
+            'DELETE FROM {} WHERE {} = %s'.format(
+                qn(History._meta.db_table),
+                qn(History._meta.get_field('content_type').column),
+            ),
+            [content_type.id],
+        )
+        transaction.commit_unless_managed()
+        content_type.delete()
+
+    def report(self, name, object_ids, lookup):
+        timings = []
+        for object_id in object_ids:
+            started = time.time()
+            lookup(object_id)
+            timings.append((time.time() - started) * 1000)
+        timings.sort()
+        self.stdout.write(
+            '{}: median {:.2f} ms, 95th percentile {:.2f} ms, '
+            'max {:.2f} ms\n'.format(
+                name,
+                timings[len(timings) // 2],
+                timings[int(len(timings) * 0.95)],
+                timings[-1],
+            )
+        )
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import textwrap
+
+from django.core.management.base import BaseCommand
+
+from ralph_assets.models_search import remove_expired_batches
+
+
+class Command(BaseCommand):
+    """Remove batches of identifiers staged by searches and unused for
+    a day. Run it periodically."""
+    help = textwrap.dedent(__doc__).strip()
+
+    def handle(self, *args, **options):
+        removed = remove_expired_batches()
+        self.stdout.write('Removed {} identifiers.\n'.format(removed))
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import textwrap
+
+from django.core.management.base import BaseCommand
+from django.db.models import get_models
+from optparse import make_option
+
+from ralph_assets.history.models import HistoryMixin
+from ralph_assets.history.states import create_checkpoints
+
+
+class Command(BaseCommand):
+    """Save checkpoints of objects with history, used to rebuild their state
+    at a past date. Run it periodically."""
+    help = textwrap.dedent(__doc__).strip()
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--interval',
+            type='int',
+            dest='interval',
+            default=None,
+            help="Minimal number of changes since the last checkpoint "
+                 "(ASSETS_HISTORY_CHECKPOINT_INTERVAL setting by default)",
+        ),
+    )
+
+    def handle(self, *args, **options):
+        for model in get_models():
+            if not issubclass(model, HistoryMixin):
+                continue
+            created = create_checkpoints(
+                model._default_manager.all(), interval=options['interval'],
+            )
+            self.stdout.write('{}: created {} checkpoints.\n'.format(
+                model._meta.object_name, created,
+            ))
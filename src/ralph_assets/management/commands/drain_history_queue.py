@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import textwrap
+
+from django.core.management.base import BaseCommand
+from optparse import make_option
+
+from ralph_assets.history.queue import drain_queues, get_queues_lag
+
+
+class Command(BaseCommand):
+    """Show lag of asynchronous history queues and write their waiting
+    rows with a burst worker in this process (e.g. after stopping
+    workers)."""
+    help = textwrap.dedent(__doc__).strip()
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--status',
+            action='store_true',
+            dest='status',
+            default=False,
+            help="Only show the number and age of waiting jobs",
+        ),
+    )
+
+    def handle(self, *args, **options):
+        for name, count, age in get_queues_lag():
+            self.stdout.write('{}: {} jobs waiting, oldest {}\n'.format(
+                name, count, age if age is not None else '-',
+            ))
+        if options['status']:
+            return
+        processed = drain_queues()
+        self.stdout.write('Processed {} jobs.\n'.format(processed))
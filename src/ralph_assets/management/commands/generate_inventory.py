@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import textwrap
+
+from django.core.management.base import BaseCommand
+from optparse import make_option
+
+from ralph_assets.synthetic import generate_inventory
+
+
+class Command(BaseCommand):
+    """Fill the database with synthetic assets (with device infos, racks,
+    Ralph devices, licences, supports and history) for benchmarks. Adds only
+    the assets missing to the given number, run it on a throwaway database.
+    """
+    help = textwrap.dedent(__doc__).strip()
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--assets',
+            type='int',
+            dest='assets',
+            default=100000,
+            help="Number of synthetic assets",
+        ),
+        make_option(
+            '--chunk-size',
+            type='int',
+            dest='chunk_size',
+            default=1000,
+            help="Number of assets inserted in a single transaction",
+        ),
+        make_option(
+            '--seed',
+            type='int',
+            dest='seed',
+            default=0,
+            help="Seed of the random generator",
+        ),
+    )
+
+    def handle(self, *args, **options):
+        added = generate_inventory(
+            options['assets'],
+            chunk_size=options['chunk_size'],
+            seed=options['seed'],
+            log=lambda message: self.stdout.write(message + '\n'),
+        )
+        self.stdout.write('Added {} assets.\n'.format(added))
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+import textwrap
+
+from django.core.management.base import BaseCommand
+from optparse import make_option
+
+from ralph_assets.instrumentation import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    """Show query counts and timings of instrumented views and sections
+    (averages per call), the slowest first."""
+    help = textwrap.dedent(__doc__).strip()
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--json',
+            action='store_true',
+            dest='json',
+            default=False,
+            help="Dump the summed up stats as JSON",
+        ),
+        make_option(
+            '--reset',
+            action='store_true',
+            dest='reset',
+            default=False,
+            help="Remove the stats after showing them",
+        ),
+    )
+
+    def handle(self, *args, **options):
+        stats = get_stats()
+        if options['json']:
+            self.stdout.write(json.dumps(stats, indent=2, sort_keys=True))
+            self.stdout.write('\n')
+        else:
+            self.show(stats)
+        if options['reset']:
+            reset_stats()
+
+    def show(self, stats):
+        self.stdout.write(
+            '{:>7} {:>8} {:>8} {:>8} {:>10} {:>10} {:>10}  {}\n'.format(
+                'calls', 'queries', 'max', 'rows', 'db ms', 'python ms',
+                'total ms', 'name',
+            )
+        )
+        ordered = sorted(
+            stats.iteritems(),
+            key=lambda item: item[1]['time'] / item[1]['calls'],
+            reverse=True,
+        )
+        for name, row in ordered:
+            calls = row['calls']
+            self.stdout.write(
+                '{:>7} {:>8.1f} {:>8} {:>8.1f} {:>10.2f} {:>10.2f} '
+                '{:>10.2f}  {}\n'.format(
+                    calls,
+                    row['queries'] / calls,
+                    row['max_queries'],
+                    row['rows'] / calls,
+                    row['db_time'] * 1000 / calls,
+                    row['python_time'] * 1000 / calls,
+                    row['time'] * 1000 / calls,
+                    name,
+                )
+            )
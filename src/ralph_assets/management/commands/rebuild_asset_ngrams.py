@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import textwrap
+
+from django.core.management.base import BaseCommand
+from optparse import make_option
+
+from ralph_assets.models_ngram import rebuild_asset_ngrams
+
+
+class Command(BaseCommand):
+    """Rebuild trigram index used by the fuzzy asset lookup."""
+    help = textwrap.dedent(__doc__).strip()
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--chunk-size',
+            type='int',
+            dest='chunk_size',
+            default=1000,
+            help="Number of assets indexed at once",
+        ),
+    )
+
+    def handle(self, *args, **options):
+        rebuild_asset_ngrams(chunk_size=options['chunk_size'])
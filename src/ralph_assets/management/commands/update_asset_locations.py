@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import textwrap
+
+from django.core.management.base import BaseCommand
+from optparse import make_option
+
+from ralph_assets.models_assets import update_device_info_locations
+
+
+class Command(BaseCommand):
+    """Fill location completeness flag of assets searched by
+    ``without_assigned_location``."""
+    help = textwrap.dedent(__doc__).strip()
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--chunk-size',
+            type='int',
+            dest='chunk_size',
+            default=1000,
+            help="Number of assets updated at once",
+        ),
+    )
+
+    def handle(self, *args, **options):
+        updated = update_device_info_locations(
+            chunk_size=options['chunk_size'],
+        )
+        self.stdout.write('Updated {} device infos.\n'.format(updated))
@@ -6,8 +6,6 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-import difflib
-
 from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse
 from django.utils.html import escape
@@ -53,6 +51,10 @@ from ralph_assets.models_util import (
     WithForm,
 )
 from ralph_assets.models_dc_assets import ServerRoom, Rack
+from ralph_assets.models_instrumentation import SlowQuery
+from ralph_assets.device_links import linked_devices_query
+from ralph_assets.models_ngram import AssetNgram, find_similar_assets
+from ralph_assets.models_search import SearchIdentifier
 from ralph.discovery.models import Device, DeviceType
 
 
@@ -109,13 +111,10 @@ class LinkedDeviceNameLookup(DeviceLookup):
     model = Asset
 
     def get_query(self, text, request):
-        matched_devices_ids = Device.objects.values_list(
-            'id', flat=True
-        ).filter(name__icontains=text)
         query = Q(
             Q(barcode__icontains=text)
             | Q(sn__icontains=text)
-            | Q(device_info__ralph_device_id__in=matched_devices_ids)
+            | linked_devices_query(Device.objects.filter(name__icontains=text))
         )
         return self.get_base_objects().filter(query).order_by()[:10]
 
@@ -406,33 +405,11 @@ class AssetLookupFuzzy(AssetLookupBase):
         dev_ids = Device.objects.filter(
             model__type=DeviceType.unknown,
         ).values_list('id', flat=True)
-        assets = Asset.objects.select_related(
-            'model__name',
-        ).filter(
+        assets = Asset.objects.filter(
             Q(device_info__ralph_device_id=None) |
             Q(device_info__ralph_device_id__in=dev_ids),
         ).filter(part_info=None)
-
-        def comparator(asset):
-            seq = "".join(
-                [part or '' for part in
-                    [
-                        asset.sn,
-                        asset.barcode,
-                        asset.model.name,
-                    ]]
-            ).replace(" ", "").lower()
-            ratio = difflib.SequenceMatcher(
-                None,
-                seq,
-                query.replace(" ", "").lower(),
-            ).ratio()
-            if ratio:
-                return 1 / ratio
-            return 999
-
-        assets = sorted(assets, key=comparator)
-        return assets[:10]
+        return find_similar_assets(query, assets)
 
     def format_match(self, obj):
         ret = obj.__unicode__()
@@ -500,6 +477,7 @@ __all__ = [
     'AssetCategoryType',
     'AssetManufacturer',
     'AssetModel',
+    'AssetNgram',
     'AssetOwner',
     'AssetSource',
     'AssetStatus',
@@ -518,7 +496,9 @@ __all__ = [
     'PartInfo',
     'ReportOdtSource',
     'ReportOdtSourceLanguage',
+    'SearchIdentifier',
     'Service',
+    'SlowQuery',
     'SoftwareCategory',
     'Transition',
     'TransitionsHistory',
@@ -12,8 +12,6 @@ import datetime
 import logging
 import os
 
-from dateutil.relativedelta import relativedelta
-
 from dj.choices import Country
 from django.contrib.auth.models import User
 from lck.django.choices import Choices
@@ -41,6 +39,7 @@ from django.template import Context, Template
 from django.utils.translation import ugettext_lazy as _
 
 from ralph.business.models import Venture
+from ralph.discovery.models_component import Processor
 from ralph.discovery.models_device import (
     Device,
     DeviceEnvironment,
@@ -48,15 +47,17 @@ from ralph.discovery.models_device import (
     ServiceCatalog,
 )
 from ralph.discovery.models_util import SavingUser
-from ralph_assets.history.models import HistoryMixin
+from ralph_assets import deprecation
+from ralph_assets.history.models import History, HistoryMixin
 from ralph_assets.history.utils import field_changes
 from ralph.util.models import SyncFieldMixin
 from ralph_assets.models_util import (
     Regionalized,
     RegionalizedDBManager,
     WithForm,
+    remember_values,
 )
-from ralph_assets.utils import iso2_to_iso3
+from ralph_assets.utils import iso2_to_iso3, iter_chunks
 from ralph_assets.models_dc_assets import (  # noqa
     DataCenter,
     DeprecatedRalphDC,
@@ -86,6 +87,8 @@ if not ASSET_HOSTNAME_TEMPLATE:
 HOSTNAME_FIELD_HELP_TIP = getattr(settings, 'HOSTNAME_FIELD_HELP_TIP', '')
 
 REPORT_LANGUAGES = getattr(settings, 'REPORT_LANGUAGES', None)
+# fields of the asset ``DeviceInfo.location_complete`` depends on
+ASSET_LOCATION_FIELDS = ('model_id', 'device_info_id')
 
 
 def _replace_empty_with_none(obj, fields):
@@ -671,13 +674,8 @@ class Asset(
         asset_cores_count = self.model.cores_count if self.model else 0
         if settings.SHOW_RALPH_CORES_DIFF:
             device_cores_count = None
-            try:
-                if self.device_info and self.device_info.ralph_device_id:
-                    device_cores_count = Device.objects.get(
-                        pk=self.device_info.ralph_device_id,
-                    ).get_core_count()
-            except Device.DoesNotExist:
-                pass
+            if self.device_info and self.device_info.ralph_device_id:
+                device_cores_count = self.device_info.get_ralph_cores_count()
             if (device_cores_count is not None and
                asset_cores_count != device_cores_count):
                 logger.warning(
@@ -725,14 +723,9 @@ class Asset(
                     self.generate_hostname(commit, template_vars)
 
     def get_ralph_device(self):
-        if not self.device_info or not self.device_info.ralph_device_id:
-            return None
-        try:
-            return Device.objects.get(
-                pk=self.device_info.ralph_device_id,
-            )
-        except Device.DoesNotExist:
+        if not self.device_info:
             return None
+        return self.device_info.get_ralph_device()
 
     def get_synced_objs_and_fields(self):
         # Implementation of the abstract method from SyncFieldMixin.
@@ -849,39 +842,53 @@ class Asset(
         self.save_comment = None
         self.saving_user = None
         super(Asset, self).__init__(*args, **kwargs)
+        remember_values(self, ASSET_LOCATION_FIELDS)
 
     def get_deprecation_months(self):
-        return int(
-            (1 / (self.deprecation_rate / 100) * 12)
-            if self.deprecation_rate else 0
+        return deprecation.deprecation_months(self.deprecation_rate)
+
+    def get_deprecation_date(self):
+        """Returns the last day the asset isn't deprecated (None without
+        invoice date)."""
+        return deprecation.deprecation_date(
+            self.invoice_date, self.deprecation_rate,
+            self.deprecation_end_date,
         )
 
     def is_deprecated(self, date=None):
-        date = date or datetime.date.today()
-        if self.force_deprecation or not self.invoice_date:
-            return True
-        if self.deprecation_end_date:
-            deprecation_date = self.deprecation_end_date
+        return deprecation.is_deprecated(
+            date or datetime.date.today(), self.force_deprecation,
+            self.invoice_date, self.get_deprecation_date(),
+        )
+
+    def get_deprecation_intervals(self, date_from, date_to):
+        """Splits days from *date_from* to *date_to* into tuples (first
+        day, last day, is deprecated), like ``is_deprecated`` of every day
+        would."""
+        return deprecation.deprecation_intervals(
+            date_from, date_to, self.force_deprecation, self.invoice_date,
+            self.get_deprecation_date(),
+        )
+
+    def get_liquidation_date(self):
+        """Returns the day the asset got its 'liquidated' status (None when
+        it doesn't have it, or when its history still waits in the queues
+        of asynchronous history, see :mod:`ralph_assets.history.queue`)."""
+        if self.status != AssetStatus.liquidated:
+            return None
+        if hasattr(self, '_prefetched_liquidated_at'):
+            liquidated = self._prefetched_liquidated_at
         else:
-            deprecation_date = self.invoice_date + relativedelta(
-                months=self.get_deprecation_months(),
-            )
-        return deprecation_date < date
+            liquidated = History.objects.get_last_change_dates(
+                Asset, [self.id], 'status', 'liquidated',
+            ).get(self.id)
+        return liquidated.date() if liquidated else None
 
     def is_liquidated(self, date=None):
         date = date or datetime.date.today()
         # check if asset has status 'liquidated' and if yes, check if it has
         # this status on given date
-        if self.status == AssetStatus.liquidated and self._liquidated_at(date):
-            return True
-        return False
-
-    def _liquidated_at(self, date):
-        liquidated_history = self.get_history().filter(
-            new_value='liquidated',
-            field_name='status',
-        ).order_by('-date')[:1]
-        return liquidated_history and liquidated_history[0].date.date() <= date
+        return deprecation.is_liquidated(date, self.get_liquidation_date())
 
     def delete_with_info(self, *args, **kwargs):
         """
@@ -900,7 +907,7 @@ class Asset(
     def is_discovered(self):
         if self.part_info:
             if self.part_info.device:
-                return self.part_info.device.is_discovered()
+                return self.part_info.device.is_discovered
             return False
         try:
             dev = self.device_info.get_ralph_device()
@@ -955,6 +962,89 @@ class Asset(
         return self.device_info.get_orientation_desc()
 
 
+def prefetch_ralph_devices(assets):
+    """Loads Ralph devices linked with *assets* (and with devices containing
+    them, for parts) using one query, so ``get_ralph_device``,
+    ``linked_device``, ``venture``, ``is_discovered`` and ``cores_count``
+    don't query them one by one. Returns *assets*.
+    """
+    device_infos = []
+    for asset in assets:
+        if asset.device_info_id:
+            device_infos.append(asset.device_info)
+        if asset.part_info_id and asset.part_info.device_id:
+            part_device = asset.part_info.device
+            if part_device.device_info_id:
+                device_infos.append(part_device.device_info)
+    ids = set(
+        info.ralph_device_id for info in device_infos if info.ralph_device_id
+    )
+    if not ids:
+        return assets
+    devices = Device.objects.select_related(
+        'model', 'venture', 'venture__department',
+    ).in_bulk(ids)
+    cores = None
+    if settings.SHOW_RALPH_CORES_DIFF:
+        cores = dict((id, 0) for id in devices)
+        for cpu in Processor.objects.filter(
+            device_id__in=devices.keys(),
+        ).select_related('model'):
+            cores[cpu.device_id] += cpu.get_cores()
+    for info in device_infos:
+        if info.ralph_device_id:
+            info.set_prefetched_ralph_device(
+                devices.get(info.ralph_device_id),
+                cores.get(info.ralph_device_id) if cores else None,
+            )
+    return assets
+
+
+def prefetch_liquidation_dates(assets):
+    """Loads dates when liquidated *assets* got this status (from the
+    online and the archived history, a query each), so ``is_liquidated``
+    and ``get_liquidation_date`` don't read history of every asset.
+    Returns *assets*.
+    """
+    liquidated = [
+        asset for asset in assets if asset.status == AssetStatus.liquidated
+    ]
+    if not liquidated:
+        return assets
+    dates = History.objects.get_last_change_dates(
+        Asset, [asset.id for asset in liquidated], 'status', 'liquidated',
+    )
+    for asset in liquidated:
+        asset._prefetched_liquidated_at = dates.get(asset.id)
+    return assets
+
+
+def update_device_info_locations(queryset=None, chunk_size=1000):
+    """Recomputes ``location_complete`` of device infos of assets from
+    *queryset* (all by default), only the changed rows are updated (without
+    saving, so no history is written). Returns the number of updated device
+    infos."""
+    if queryset is None:
+        queryset = Asset.admin_objects.all()
+    queryset = queryset.filter(device_info__isnull=False).select_related(
+        'device_info', 'model__category',
+    )
+    updated = 0
+    for assets in iter_chunks(queryset, chunk_size):
+        for asset in assets:
+            info = asset.device_info
+            category = asset.model.category if asset.model_id else None
+            is_blade = bool(category and category.is_blade)
+            old = info.location_complete
+            info.update_location(is_blade=is_blade)
+            if old != info.location_complete:
+                DeviceInfo.objects.filter(pk=info.pk).update(
+                    location_complete=info.location_complete,
+                )
+                updated += 1
+    return updated
+
+
 class CoaOemOs(Named):
     """Define oem installed operating system"""
 
@@ -28,7 +28,11 @@ from ralph.discovery.models_device import (
     DeviceType,
 )
 from ralph.discovery.models_util import SavingUser
-from ralph_assets.history.models import HistoryMixin
+from ralph_assets.history.models import (
+    DEFAULT_HISTORY_FIELD_EXCLUDE,
+    HistoryMixin,
+)
+from ralph_assets.models_util import remember_values, values_changed
 
 
 logger = logging.getLogger(__name__)
@@ -42,6 +46,11 @@ INVALID_SLOT_NUMBER = 6
 
 # i.e. number in range 1-16 and optional postfix 'A' or 'B'
 VALID_SLOT_NUMBER_FORMAT = re.compile('^([1-9][A,B]?|1[0-6][A,B]?)$')
+# fields ``DeviceInfo.location_complete`` depends on
+LOCATION_FIELDS = (
+    'data_center_id', 'server_room_id', 'rack_id', 'position',
+    'orientation', 'slot_no',
+)
 
 
 class Orientation(Choices):
@@ -295,6 +304,12 @@ class DeviceInfo(HistoryMixin, TimeTrackable, SavingUser, SoftDeletable):
         choices=Orientation(),
         default=Orientation.front.id,
     )
+    # denormalized flag searched by assets search, see update_location
+    location_complete = models.BooleanField(default=False, db_index=True)
+
+    exclude_fields_from_history = DEFAULT_HISTORY_FIELD_EXCLUDE + (
+        'location_complete',
+    )
 
     def clean_fields(self, exclude=None):
         """
@@ -358,19 +373,82 @@ class DeviceInfo(HistoryMixin, TimeTrackable, SavingUser, SoftDeletable):
     def get_ralph_device(self):
         if not self.ralph_device_id:
             return None
+        prefetched = getattr(self, '_prefetched_ralph_device', None)
+        if prefetched and prefetched[0] == self.ralph_device_id:
+            return prefetched[1]
         try:
             dev = Device.objects.get(id=self.ralph_device_id)
             return dev
         except Device.DoesNotExist:
             return None
 
+    def get_ralph_cores_count(self):
+        """Returns cores count of the linked Ralph device or None."""
+        prefetched = getattr(self, '_prefetched_ralph_cores_count', None)
+        if prefetched and prefetched[0] == self.ralph_device_id:
+            return prefetched[1]
+        device = self.get_ralph_device()
+        return device.get_core_count() if device else None
+
+    def set_prefetched_ralph_device(self, device, cores_count=None):
+        """Remembers *device* (or None when it doesn't exist) loaded by
+        :func:`ralph_assets.models_assets.prefetch_ralph_devices`."""
+        self._prefetched_ralph_device = (self.ralph_device_id, device)
+        if cores_count is not None:
+            self._prefetched_ralph_cores_count = (
+                self.ralph_device_id, cores_count,
+            )
+
     def get_orientation_desc(self):
         return Orientation.name_from_id(self.orientation)
 
+    def has_complete_location(self, is_blade=None):
+        """Returns True when data center, server room, rack, position and
+        orientation (and slot number for blades) are set."""
+        fields = [
+            self.data_center_id, self.server_room_id, self.rack_id,
+            self.position, self.orientation,
+        ]
+        if is_blade:
+            fields.append(self.slot_no)
+        return None not in fields
+
+    def _is_blade(self):
+        if not self.pk:
+            return None
+        asset = getattr(self, '_asset_cache', None)
+        if asset is None:
+            # one query instead of loading asset, model and category
+            return type(self)._base_manager.filter(pk=self.pk).values_list(
+                'asset__model__category__is_blade', flat=True,
+            )[0]
+        if not asset.model_id:
+            return None
+        model = asset.model
+        if not model.category_id:
+            return None
+        return model.category.is_blade
+
+    def update_location(self, is_blade=None):
+        """Sets ``location_complete`` (*is_blade* is taken from the asset's
+        category when not given)."""
+        if is_blade is None:
+            is_blade = self._is_blade()
+        self.location_complete = self.has_complete_location(is_blade)
+
+    def save(self, *args, **kwargs):
+        # the asset's category is checked by models_signals receivers
+        if not self.pk or values_changed(self, LOCATION_FIELDS):
+            self.update_location()
+        result = super(DeviceInfo, self).save(*args, **kwargs)
+        remember_values(self, LOCATION_FIELDS)
+        return result
+
     def __init__(self, *args, **kwargs):
         self.save_comment = None
         self.saving_user = None
         super(DeviceInfo, self).__init__(*args, **kwargs)
+        remember_values(self, LOCATION_FIELDS)
 
 
 @receiver(
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+"""Slow queries captured by the instrumentation.
+
+With ``ASSETS_SLOW_QUERIES`` setting enabled, every query executed inside
+an instrumented section (:mod:`ralph_assets.instrumentation`, e.g. a
+``ralph_assets`` view run by the middleware) and taking longer than
+``THRESHOLD`` seconds is stored as :class:`SlowQuery`, with the name of the
+section, the request (search) parameters and EXPLAIN output of selects.
+Only the last ``MAX_RECORDS`` queries are kept. ``filters`` lists the
+non-empty search parameters, so the admin list can be filtered by the
+combinations of filters which need new indexes.
+
+Captured queries are kept in memory and saved by :func:`save_slow_queries`
+once the measured code left its transaction (at the end of the request),
+so rolling the request back doesn't discard them. EXPLAIN runs in
+a savepoint, its failure doesn't abort the measured transaction.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import datetime
+import logging
+import threading
+import urllib
+
+from django.conf import settings
+from django.db import DatabaseError, models
+from django.utils.translation import ugettext_lazy as _
+
+
+SLOW_QUERIES_DEFAULTS = {
+    'ENABLE': False,
+    'THRESHOLD': 1.0,
+    'MAX_RECORDS': 1000,
+    'EXPLAIN': True,
+}
+# request parameters which don't filter the results
+IGNORED_PARAMS = ('page', 'sort', 'cursor', 'export', '_report_jobid')
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class SlowQuery(models.Model):
+    date = models.DateTimeField(default=datetime.datetime.now, db_index=True)
+    source = models.CharField(
+        verbose_name=_("view or section"), max_length=255, db_index=True,
+    )
+    filters = models.CharField(max_length=255, blank=True, db_index=True)
+    params = models.TextField(verbose_name=_("parameters"), blank=True)
+    duration = models.FloatField(verbose_name=_("duration (s)"))
+    sql = models.TextField()
+    explain = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = _("slow query")
+        verbose_name_plural = _("slow queries")
+        ordering = ('-id',)
+
+    def __unicode__(self):
+        return '{} ({:.3f} s)'.format(self.source, self.duration)
+
+
+def get_slow_queries_settings():
+    config = dict(SLOW_QUERIES_DEFAULTS)
+    config.update(getattr(settings, 'ASSETS_SLOW_QUERIES', {}))
+    return config
+
+
+def _encode_params(params):
+    """Returns pairs (name, value) of non-empty *params* (a ``QueryDict``
+    or dict)."""
+    lists = params.lists() if hasattr(params, 'lists') else [
+        (name, [value]) for name, value in params.items()
+    ]
+    return sorted(
+        (name, value) for name, values in lists
+        for value in values if value not in ('', None)
+    )
+
+
+def explain(db, sql, params):
+    """Returns plan of select *sql* on connection *db* (a fresh cursor is
+    used, so rows of the explained query aren't lost), or an empty string
+    when the database can't explain it."""
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return ''
+    prefix = 'EXPLAIN QUERY PLAN ' if db.vendor == 'sqlite' else 'EXPLAIN '
+    # a failed statement would abort the whole transaction on PostgreSQL
+    sid = db.savepoint()
+    cursor = db._cursor()
+    try:
+        cursor.execute(prefix + sql, params)
+        plan = '\n'.join(
+            ' | '.join(unicode(column) for column in row)
+            for row in cursor.fetchall()
+        )
+    except DatabaseError:
+        logger.warning('Could not explain slow query.', exc_info=True)
+        db.savepoint_rollback(sid)
+        return ''
+    finally:
+        cursor.close()
+    db.savepoint_commit(sid)
+    return plan
+
+
+def _get_pending():
+    if not hasattr(_local, 'pending'):
+        _local.pending = []
+    return _local.pending
+
+
+def record_slow_query(db, source, params, sql, sql_params, executed,
+                      duration):
+    """Captures the query, to be stored by :func:`save_slow_queries`.
+    *executed* is the query with its parameters, *params* are the request
+    parameters."""
+    config = get_slow_queries_settings()
+    pairs = _encode_params(params or {})
+    _get_pending().append(SlowQuery(
+        source=source[:255],
+        filters=','.join(sorted(set(
+            name for name, value in pairs if name not in IGNORED_PARAMS
+        )))[:255],
+        params=urllib.urlencode([
+            (name, unicode(value).encode('utf-8')) for name, value in pairs
+        ]),
+        duration=duration,
+        sql=executed,
+        explain=(
+            explain(db, sql, sql_params)
+            if config['EXPLAIN'] and sql_params is not None else ''
+        ),
+    ))
+
+
+def save_slow_queries():
+    """Stores the captured queries and removes the ones over the limit.
+    Call it outside of the measured transaction."""
+    pending = _get_pending()
+    if not pending:
+        return
+    _local.pending = []
+    config = get_slow_queries_settings()
+    for query in pending:
+        query.save()
+    stale = list(SlowQuery.objects.order_by('-id').values_list(
+        'id', flat=True,
+    )[config['MAX_RECORDS']:config['MAX_RECORDS'] + 1])
+    if stale:
+        SlowQuery.objects.filter(id__lte=stale[0]).delete()
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+
+"""Trigram index of asset texts.
+
+The fuzzy lookup uses trigrams of normalized sn, barcode and model name
+joined together: it picks the assets sharing the most trigrams with the
+query and only those are ranked with ``difflib``, instead of the whole
+table.
+
+Fields searched with substrings (sn, niw, remarks...) are indexed one by
+one, so ``icontains`` filters can be narrowed down to assets having all
+trigrams of the searched value before the substring itself is checked.
+Texts are lowercased and stripped of accents, so the trigrams don't miss
+values the database collation considers equal; values with other non-ASCII
+characters are indexed with ``UNINDEXED_NGRAM`` only and always checked.
+
+The index is maintained on save only with ``ASSETS_NGRAM_INDEX`` enabled;
+assets of a renamed model are reindexed by an rq job (``ASSETS_NGRAM_QUEUE``
+queue).
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import difflib
+import unicodedata
+
+import django_rq
+from django.conf import settings
+from django.db import models
+from django.db.models import Count, Q
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+from django.utils.encoding import force_unicode
+
+from ralph_assets.models_assets import Asset, AssetModel, OfficeInfo
+from ralph_assets.models_util import remember_values, values_changed
+from ralph_assets.utils import iter_chunks
+
+
+NGRAM_SIZE = 3
+# how many assets sharing most trigrams with the query are ranked
+FUZZY_CANDIDATES = 200
+# how many trigrams of the searched value are used to narrow substring search
+SUBSTRING_NGRAMS = 4
+# marks values of searched fields having characters the index can't handle
+UNINDEXED_NGRAM = ''
+# rq queue rebuilding trigrams of assets of renamed models
+NGRAM_QUEUE = getattr(settings, 'ASSETS_NGRAM_QUEUE', 'default')
+
+FUZZY_FIELD = 'fuzzy'
+# fields searched by substring: name -> function returning its value
+SEARCH_TEXT_FIELDS = {
+    'invoice_no': lambda asset: asset.invoice_no,
+    'imei': lambda asset: (
+        asset.office_info.imei if asset.office_info_id else None
+    ),
+    'niw': lambda asset: asset.niw,
+    'order_no': lambda asset: asset.order_no,
+    'provider': lambda asset: asset.provider,
+    'remarks': lambda asset: asset.remarks,
+    'sn': lambda asset: asset.sn,
+    'task_url': lambda asset: asset.task_url,
+}
+
+
+class AssetNgram(models.Model):
+    asset = models.ForeignKey(Asset, related_name='ngrams')
+    field = models.CharField(max_length=16, default=FUZZY_FIELD)
+    ngram = models.CharField(max_length=NGRAM_SIZE, db_index=True)
+
+    # (field, ngram, asset) index is created by migration 0031
+
+
+def ngram_index_enabled():
+    """The index is used only when ``ASSETS_NGRAM_INDEX`` setting is on (it
+    has to be filled with ``rebuild_asset_ngrams`` command first)."""
+    return getattr(settings, 'ASSETS_NGRAM_INDEX', False)
+
+
+def normalize(text):
+    return text.replace(' ', '').lower()
+
+
+def normalize_search_text(text):
+    """Returns *text* lowercased and with accents stripped, so trigrams of
+    values equal in case and accent insensitive collations are equal too."""
+    text = unicodedata.normalize('NFKD', force_unicode(text or ''))
+    return ''.join(
+        char for char in text if not unicodedata.combining(char)
+    ).lower()
+
+
+def is_indexable(text):
+    """Characters other than ASCII (left after :func:`normalize_search_text`)
+    can be compared differently by the database collation, trigrams of such
+    texts can't be used."""
+    try:
+        text.encode('ascii')
+    except UnicodeError:
+        return False
+    return True
+
+
+def get_fuzzy_text(asset):
+    """Returns the text of *asset* compared with fuzzy lookup queries."""
+    return normalize(''.join(
+        part or '' for part in [
+            asset.sn,
+            asset.barcode,
+            asset.model.name if asset.model_id else None,
+        ]
+    ))
+
+
+def get_ngrams(text):
+    """Returns set of trigrams of *text* (or *text* itself when shorter)."""
+    if len(text) <= NGRAM_SIZE:
+        return {text} if text else set()
+    return {
+        text[i:i + NGRAM_SIZE] for i in xrange(len(text) - NGRAM_SIZE + 1)
+    }
+
+
+def get_search_ngrams(value):
+    """Returns trigrams of *value* of a field searched by substring, values
+    which aren't indexable get only ``UNINDEXED_NGRAM``."""
+    text = normalize_search_text(value)
+    if not is_indexable(text):
+        return {UNINDEXED_NGRAM}
+    return get_ngrams(text)
+
+
+def similarity(text, query):
+    """Ranking used by the fuzzy lookup, both arguments are normalized."""
+    return difflib.SequenceMatcher(None, text, query).ratio()
+
+
+def _make_ngrams(asset):
+    ngrams = [
+        AssetNgram(asset_id=asset.id, field=FUZZY_FIELD, ngram=ngram)
+        for ngram in get_ngrams(get_fuzzy_text(asset))
+    ]
+    for field, get_value in SEARCH_TEXT_FIELDS.iteritems():
+        ngrams.extend(
+            AssetNgram(asset_id=asset.id, field=field, ngram=ngram)
+            for ngram in get_search_ngrams(get_value(asset))
+        )
+    return ngrams
+
+
+def update_asset_ngrams(asset):
+    """Replaces trigrams of *asset* if they have changed."""
+    new = _make_ngrams(asset)
+    current = set(
+        AssetNgram.objects.filter(asset=asset).values_list('field', 'ngram')
+    )
+    if current == set((ngram.field, ngram.ngram) for ngram in new):
+        return
+    AssetNgram.objects.filter(asset=asset).delete()
+    AssetNgram.objects.bulk_create(new)
+
+
+def rebuild_asset_ngrams(queryset=None, chunk_size=1000):
+    """Rebuilds trigrams of all assets from *queryset* (all by default)."""
+    if queryset is None:
+        queryset = Asset.admin_objects.all()
+    queryset = queryset.select_related('model', 'office_info')
+    for assets in iter_chunks(queryset, chunk_size):
+        AssetNgram.objects.filter(asset__in=assets).delete()
+        AssetNgram.objects.bulk_create(
+            [ngram for asset in assets for ngram in _make_ngrams(asset)]
+        )
+
+
+def find_similar_assets(query, queryset, limit=10):
+    """Returns up to *limit* assets from *queryset* most similar to *query*.
+
+    Assets are ranked by ``difflib`` ratio between their fuzzy text and the
+    query, candidates are the assets sharing most trigrams with the query.
+    Without the index, or when fewer than *limit* assets share any trigram
+    with the query (short, misspelt or non-ASCII queries), all assets from
+    *queryset* are ranked, so the lookup never returns less than before.
+    """
+    query = normalize(query)
+    ngrams = get_ngrams(query)
+    if not ngram_index_enabled() or not ngrams:
+        return _rank(queryset.select_related('model'), query, limit)
+    ngrams_qs = AssetNgram.objects.filter(
+        asset__in=queryset, field=FUZZY_FIELD,
+    )
+    if len(query) < NGRAM_SIZE:
+        ngrams_qs = ngrams_qs.filter(ngram__contains=query)
+    else:
+        ngrams_qs = ngrams_qs.filter(ngram__in=ngrams)
+    candidate_ids = [
+        row['asset'] for row in ngrams_qs.values('asset').annotate(
+            shared=Count('id'),
+        ).order_by('-shared')[:FUZZY_CANDIDATES]
+    ]
+    if len(candidate_ids) < limit:
+        return _rank(queryset.select_related('model'), query, limit)
+    candidates = Asset.admin_objects.select_related('model').filter(
+        id__in=candidate_ids,
+    )
+    return _rank(candidates, query, limit)
+
+
+def _rank(assets, query, limit):
+    return sorted(
+        assets, key=lambda asset: -similarity(get_fuzzy_text(asset), query),
+    )[:limit]
+
+
+def substring_query(field, lookup, value):
+    """Returns ``Q`` matching assets with *value* contained (case
+    insensitive) in *lookup*, which is indexed as *field*.
+
+    The ``icontains`` lookup is restricted to assets having a few trigrams
+    of *value* (or not indexable value), so the database doesn't need to
+    scan the whole table. Trigrams are matched by joins of the index in
+    a single subquery.
+    """
+    query = Q(**{'{}__icontains'.format(lookup): value})
+    text = normalize_search_text(value)
+    if (
+        len(text) < NGRAM_SIZE or not is_indexable(text) or
+        not ngram_index_enabled()
+    ):
+        return query
+    # take trigrams spread over the whole value
+    positions = range(len(text) - NGRAM_SIZE + 1)
+    step = max(1, len(positions) // SUBSTRING_NGRAMS)
+    ngrams = [
+        text[i:i + NGRAM_SIZE] for i in positions[::step][:SUBSTRING_NGRAMS]
+    ]
+    candidates = AssetNgram.objects.filter(field=field, ngram=ngrams[0])
+    for ngram in ngrams[1:]:
+        # every filter() on the relation joins the index once more
+        candidates = candidates.filter(
+            asset__ngrams__field=field, asset__ngrams__ngram=ngram,
+        )
+    unindexed = AssetNgram.objects.filter(field=field, ngram=UNINDEXED_NGRAM)
+    return query & (
+        Q(id__in=candidates.values_list('asset', flat=True)) |
+        Q(id__in=unindexed.values_list('asset', flat=True))
+    )
+
+
+def rebuild_model_ngrams(model_id):
+    """Rebuilds trigrams of assets of the model, run by rq workers after the
+    model is renamed."""
+    rebuild_asset_ngrams(Asset.admin_objects.filter(model_id=model_id))
+
+
+@receiver(post_save, sender=Asset, dispatch_uid='assets.asset.ngrams')
+def asset_post_save_ngrams(sender, instance, raw, **kwargs):
+    if not raw and ngram_index_enabled():
+        update_asset_ngrams(instance)
+
+
+@receiver(post_init, sender=AssetModel, dispatch_uid='assets.model.name')
+def asset_model_post_init_ngrams(sender, instance, **kwargs):
+    remember_values(instance, ('name',))
+
+
+@receiver(post_save, sender=AssetModel, dispatch_uid='assets.model.ngrams')
+def asset_model_post_save_ngrams(sender, instance, raw, created, **kwargs):
+    changed = values_changed(instance, ('name',))
+    remember_values(instance, ('name',))
+    if raw or created or not changed or not ngram_index_enabled():
+        return
+    # the model can have thousands of assets, don't index them in the request
+    django_rq.get_queue(NGRAM_QUEUE).enqueue(
+        rebuild_model_ngrams, instance.id,
+    )
+
+
+@receiver(
+    post_save, sender=OfficeInfo, dispatch_uid='assets.officeinfo.ngrams',
+)
+def office_info_post_save_ngrams(sender, instance, raw, **kwargs):
+    if raw or not ngram_index_enabled():
+        return
+    try:
+        asset = instance.asset
+    except Asset.DoesNotExist:
+        return
+    update_asset_ngrams(asset)
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+"""Staging table for long lists of identifiers pasted into the search.
+
+Instead of a huge ``OR`` (or ``IN``) clause the identifiers are inserted
+into :class:`SearchIdentifier` once, as a batch, and the search query joins
+against them with a subquery. Batches are named after their content, so
+paginating or re-running the same search reuses the staged rows. Batches
+unused for ``BATCH_TTL`` are removed by :func:`remove_expired_batches`
+(``clear_search_identifiers`` command), never by the search itself.
+
+Only the search views stage batches, other views (bulk edit, transitions,
+reports) reuse a batch staged by the search they come from, or search with
+plain lookups. A batch is inserted in a single transaction and values are
+unique within it, so a batch staged by concurrent searches isn't doubled.
+Values which can't be stored (longer than the searched columns, ids out of
+the integer range) are never matched.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q
+
+
+# batches unused for that long are removed
+BATCH_TTL = datetime.timedelta(days=1)
+# rows inserted by single query (SQLite limits number of query parameters)
+INSERT_CHUNK_SIZE = 200
+# the longest searched identifier column (barcode, sn, niw)
+VALUE_MAX_LENGTH = 200
+NUMBER_MAX = 2 ** 31 - 1
+
+
+class SearchIdentifier(models.Model):
+    batch = models.CharField(max_length=32, db_index=True)
+    value = models.CharField(max_length=VALUE_MAX_LENGTH)
+    number = models.IntegerField(null=True, blank=True)
+    created = models.DateTimeField(default=datetime.datetime.now)
+
+    class Meta:
+        unique_together = ('batch', 'value')
+
+
+def bulk_search_threshold():
+    """Lists shorter than ``ASSETS_BULK_SEARCH_THRESHOLD`` setting are
+    searched with plain lookups."""
+    return getattr(settings, 'ASSETS_BULK_SEARCH_THRESHOLD', 100)
+
+
+def is_storable(value, numeric=False):
+    """Returns whether *value* (unicode) fits in :class:`SearchIdentifier`.
+    """
+    if numeric:
+        return abs(int(value)) <= NUMBER_MAX
+    return len(value) <= VALUE_MAX_LENGTH
+
+
+def get_batch_name(values, numeric=False):
+    return hashlib.md5(
+        '\n'.join([str(numeric)] + sorted(set(values))).encode('utf-8')
+    ).hexdigest()
+
+
+def find_batch(values, numeric=False):
+    """Returns name of the batch of *values* staged already or None, without
+    writing anything."""
+    batch = get_batch_name(values, numeric)
+    if SearchIdentifier.objects.filter(batch=batch).exists():
+        return batch
+    return None
+
+
+def _insert(rows):
+    for i in xrange(0, len(rows), INSERT_CHUNK_SIZE):
+        SearchIdentifier.objects.bulk_create(rows[i:i + INSERT_CHUNK_SIZE])
+
+
+def _insert_batch(rows):
+    """Inserts *rows* of a batch at once, a batch inserted concurrently by
+    another search is kept instead."""
+    if transaction.is_managed():
+        sid = transaction.savepoint()
+        try:
+            _insert(rows)
+        except IntegrityError:
+            transaction.savepoint_rollback(sid)
+        else:
+            transaction.savepoint_commit(sid)
+        return
+    try:
+        with transaction.commit_on_success():
+            _insert(rows)
+    except IntegrityError:
+        pass
+
+
+def stage_identifiers(values, numeric=False):
+    """Stores *values* (unicode, see :func:`is_storable`) as a batch (if not
+    stored already) and returns the batch name."""
+    batch = get_batch_name(values, numeric)
+    now = datetime.datetime.now()
+    # the batch is used again, it expires later
+    if SearchIdentifier.objects.filter(batch=batch).update(created=now):
+        return batch
+    _insert_batch([
+        SearchIdentifier(
+            batch=batch, value=value, number=int(value) if numeric else None,
+            created=now,
+        ) for value in sorted(set(values))
+    ])
+    return batch
+
+
+def remove_expired_batches(now=None):
+    """Removes batches unused for ``BATCH_TTL`` before *now*, returns the
+    number of removed rows."""
+    now = now or datetime.datetime.now()
+    expired = SearchIdentifier.objects.filter(created__lt=now - BATCH_TTL)
+    count = expired.count()
+    expired.delete()
+    return count
+
+
+class StagedIdentifiers(object):
+    """Identifiers searched in *lookup* staged as a batch.
+
+    :param name: name of the search field
+    :param lookup: ORM path the identifiers are compared with
+    :param values: the identifiers
+    :param numeric: identifiers are integers (e.g. primary keys)
+    :param create: stage the batch when it's missing, otherwise ``batch``
+        is None (see :func:`find_batch`)
+    """
+
+    def __init__(self, name, lookup, values, numeric=False, create=True):
+        self.name = name
+        self.lookup = lookup
+        self.numeric = numeric
+        values = set(unicode(value) for value in values)
+        self.count = len(values)
+        self.rejected = sorted(
+            value for value in values if not is_storable(value, numeric)
+        )
+        values.difference_update(self.rejected)
+        if create:
+            self.batch = stage_identifiers(values, numeric)
+        else:
+            self.batch = find_batch(values, numeric)
+
+    @property
+    def column(self):
+        return 'number' if self.numeric else 'value'
+
+    def get_identifiers(self):
+        return SearchIdentifier.objects.filter(batch=self.batch)
+
+    @property
+    def query(self):
+        return Q(**{'{}__in'.format(self.lookup): self.get_identifiers(
+        ).values_list(self.column, flat=True)})
+
+    def unmatched(self, queryset):
+        """Returns sorted list of identifiers matching no object from
+        *queryset* (single query)."""
+        # NULLs would make the whole NOT IN condition unknown
+        matched = queryset.exclude(
+            **{'{}__isnull'.format(self.lookup): True}
+        ).values_list(self.lookup, flat=True)
+        return sorted(list(self.get_identifiers().exclude(
+            **{'{}__in'.format(self.column): matched}
+        ).values_list('value', flat=True)) + self.rejected)
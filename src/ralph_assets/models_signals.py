@@ -6,10 +6,16 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 
-from ralph_assets.models import Asset, DeviceInfo
+from ralph_assets.models import Asset, AssetCategory, AssetModel, DeviceInfo
+from ralph_assets.models_assets import (
+    ASSET_LOCATION_FIELDS,
+    update_device_info_locations,
+)
+from ralph_assets.models_util import remember_values, values_changed
+from ralph_assets.search_cache import SEARCH_CACHE_MODELS, bump_generation
 
 
 SAVE_PRIORITY = 215
@@ -118,3 +124,80 @@ def update_core_localization(asset_dev_info):
 )
 def asset_device_info_post_save(sender, instance, **kwargs):
     update_core_localization(asset_dev_info=instance)
+
+
+def _update_locations(assets):
+    if update_device_info_locations(assets):
+        bump_generation(DeviceInfo)
+
+
+# fields of models (besides assets and device infos) locations depend on
+LOCATION_DEPENDENCIES = {
+    AssetModel: ('category_id',),
+    AssetCategory: ('is_blade',),
+}
+
+
+def remember_location_values(sender, instance, **kwargs):
+    remember_values(instance, LOCATION_DEPENDENCIES[sender])
+
+
+for model in LOCATION_DEPENDENCIES:
+    post_init.connect(
+        remember_location_values, sender=model,
+        dispatch_uid='assets.location_values.{}'.format(model.__name__),
+    )
+
+
+def _location_changed(instance, raw, attnames):
+    """Returns True when *attnames* of saved *instance* changed since it
+    was loaded (or last saved) and remembers the new values."""
+    changed = not raw and values_changed(instance, attnames)
+    remember_values(instance, attnames)
+    return changed
+
+
+@receiver(post_save, sender=Asset, dispatch_uid='assets.asset.location')
+def asset_post_save_location(sender, instance, raw, created, **kwargs):
+    # blades need slot number to have complete location
+    changed = _location_changed(instance, raw, ASSET_LOCATION_FIELDS)
+    if (changed or created and not raw) and instance.device_info_id:
+        _update_locations(Asset.admin_objects.filter(pk=instance.pk))
+
+
+@receiver(
+    post_save, sender=AssetModel, dispatch_uid='assets.model.location',
+)
+def asset_model_post_save_location(sender, instance, raw, created, **kwargs):
+    if (
+        _location_changed(instance, raw, LOCATION_DEPENDENCIES[sender]) and
+        not created
+    ):
+        _update_locations(Asset.admin_objects.filter(model=instance))
+
+
+@receiver(
+    post_save, sender=AssetCategory, dispatch_uid='assets.category.location',
+)
+def asset_category_post_save_location(
+    sender, instance, raw, created, **kwargs
+):
+    if (
+        _location_changed(instance, raw, LOCATION_DEPENDENCIES[sender]) and
+        not created
+    ):
+        _update_locations(
+            Asset.admin_objects.filter(model__category=instance),
+        )
+
+
+def search_cache_invalidate(sender, **kwargs):
+    bump_generation(sender)
+
+
+for model in SEARCH_CACHE_MODELS:
+    for signal in (post_save, post_delete):
+        signal.connect(
+            search_cache_invalidate, sender=model,
+            dispatch_uid='assets.search_cache.{}'.format(model.__name__),
+        )
@@ -83,3 +83,23 @@ class Regionalized(models.Model):
 
     def __unicode__(self):
         return self.region.name
+
+
+def remember_values(instance, attnames):
+    """Remembers current values of *attnames* (e.g. ``rack_id``) of
+    *instance* for :func:`values_changed`. Values are read from the instance
+    dict, so deferred fields aren't loaded."""
+    remembered = instance.__dict__.setdefault('_remembered_values', {})
+    for attname in attnames:
+        remembered[attname] = instance.__dict__.get(attname)
+
+
+def values_changed(instance, attnames):
+    """Returns True when any of *attnames* of *instance* differs from the
+    value remembered by :func:`remember_values` (or wasn't remembered)."""
+    remembered = instance.__dict__.get('_remembered_values', {})
+    missing = object()
+    return any(
+        remembered.get(attname, missing) != instance.__dict__.get(attname)
+        for attname in attnames
+    )
@@ -10,6 +10,7 @@ from django.http import Http404
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from ralph_assets.instrumentation import instrumented
 from ralph_assets.models_assets import Orientation, Rack
 from ralph_assets.models_dc_assets import RackAccessory
 from ralph.ui.views.common import ACLGateway
@@ -21,6 +22,9 @@ from ralph_assets.rest.serializers.models_dc_asssets import (
 )
 
 
+SECTION = 'ralph_assets.rest.asset_info_per_rack.AssetsView'
+
+
 class AssetsView(ACLGateway, APIView):
 
     def get_object(self, pk):
@@ -29,9 +33,11 @@ class AssetsView(ACLGateway, APIView):
         except Rack.DoesNotExist:
             raise Http404
 
+    @instrumented(SECTION + '.assets')
     def _get_assets(self, rack, side):
         return AssetSerializer(rack.get_root_assets(side), many=True).data
 
+    @instrumented(SECTION + '.accessories')
     def _get_accessories(self, rack, side):
         accessories = RackAccessory.objects.select_related('accessory').filter(
             rack=rack,
@@ -39,6 +45,7 @@ class AssetsView(ACLGateway, APIView):
         )
         return RackAccessorySerializer(accessories, many=True).data
 
+    @instrumented(SECTION + '.pdus')
     def _get_pdus(self, rack):
         return PDUSerializer(rack.get_pdus(), many=True).data
 
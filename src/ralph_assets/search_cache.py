@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+"""Cache of asset search results (counts and primary keys of pages).
+
+Entries are keyed by the normalized search (see
+:attr:`ralph_assets.search_planner.SearchPlan.key`), the search mode and the
+generations of the tables the search reads. Every save or delete of an
+asset (or its device, office or part info) bumps the generation of its
+table, so later searches miss the old entries, which are left to expire.
+Bulk ``update()`` calls don't send signals and changes of other related
+models (e.g. model names) are noticed only after ``TIMEOUT``.
+
+Configured with ``ASSETS_SEARCH_CACHE`` setting; entries live in one of
+Django caches (``CACHE`` alias), which bounds their number (e.g.
+``MAX_ENTRIES`` of locmem backend). Only the first ``MAX_PAGES`` pages of
+a search are cached.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import get_cache
+from django.core.paginator import Page, Paginator
+
+from ralph_assets.models_assets import Asset, OfficeInfo, PartInfo
+from ralph_assets.models_dc_assets import DeviceInfo
+
+
+KEY_PREFIX = 'ralph_assets.search'
+SEARCH_CACHE_DEFAULTS = {
+    'ENABLE': False,
+    'CACHE': 'default',
+    'TIMEOUT': 300,
+    'MAX_PAGES': 10,
+}
+# saving these models invalidates cached searches
+SEARCH_CACHE_MODELS = (Asset, DeviceInfo, OfficeInfo, PartInfo)
+
+
+def get_search_cache_settings():
+    config = dict(SEARCH_CACHE_DEFAULTS)
+    config.update(getattr(settings, 'ASSETS_SEARCH_CACHE', {}))
+    return config
+
+
+def get_backend():
+    return get_cache(get_search_cache_settings()['CACHE'])
+
+
+def _generation_key(model):
+    return '{}.generation.{}'.format(KEY_PREFIX, model._meta.db_table)
+
+
+def _new_generation():
+    # generation lost by the cache mustn't restart from an old value
+    return int(time.time() * 1000)
+
+
+def get_generations(backend=None):
+    """Returns the current generations of ``SEARCH_CACHE_MODELS`` tables."""
+    backend = backend or get_backend()
+    keys = [_generation_key(model) for model in SEARCH_CACHE_MODELS]
+    generations = backend.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            backend.add(key, _new_generation())
+            generations[key] = backend.get(key)
+    return [generations[key] for key in keys]
+
+
+def bump_generation(model):
+    """Invalidates cached searches reading the table of *model* (nothing
+    is cached while the cache is disabled, entries from before expire
+    with their timeout)."""
+    if not get_search_cache_settings()['ENABLE']:
+        return
+    backend = get_backend()
+    key = _generation_key(model)
+    try:
+        backend.incr(key)
+    except ValueError:
+        backend.set(key, _new_generation())
+
+
+class SearchResultCache(object):
+    """Entries of a single search, *key_parts* (JSON serializable) identify
+    the search."""
+
+    def __init__(self, *key_parts):
+        config = get_search_cache_settings()
+        self.timeout = config['TIMEOUT']
+        self.max_pages = config['MAX_PAGES']
+        self.backend = get_backend()
+        serialized = json.dumps(
+            [list(key_parts), get_generations(self.backend)], sort_keys=True,
+        )
+        self.key = hashlib.md5(serialized.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def enabled(cls):
+        return get_search_cache_settings()['ENABLE']
+
+    def make_key(self, *name):
+        return '{}.{}.{}'.format(
+            KEY_PREFIX, self.key, '.'.join(unicode(part) for part in name),
+        )
+
+    def get_or_set(self, name, get_value):
+        """Returns value cached as *name* (a tuple), calls *get_value* and
+        stores its result on miss."""
+        key = self.make_key(*name)
+        value = self.backend.get(key)
+        if value is None:
+            value = get_value()
+            self.backend.set(key, value, self.timeout)
+        return value
+
+
+class CachedSearchPaginator(Paginator):
+    """Paginator taking the count and the primary keys of the first pages
+    from :class:`SearchResultCache`.
+
+    :param sort: ordering of *object_list* (part of the pages keys)
+    """
+
+    def __init__(self, object_list, per_page, cache, sort=None):
+        super(CachedSearchPaginator, self).__init__(object_list, per_page)
+        self.cache = cache
+        self.sort = sort
+
+    def _get_count(self):
+        if self._count is None:
+            self._count = self.cache.get_or_set(
+                ('count',), self.object_list.count,
+            )
+        return self._count
+    count = property(_get_count)
+
+    def page(self, number):
+        page = super(CachedSearchPaginator, self).page(number)
+        if page.number > self.cache.max_pages:
+            return page
+        pks = self.cache.get_or_set(
+            ('page', self.sort, self.per_page, page.number),
+            lambda: list(page.object_list.values_list('pk', flat=True)),
+        )
+        objects = self.object_list.in_bulk(pks)
+        return Page(
+            [objects[pk] for pk in pks if pk in objects], page.number, self,
+        )
@@ -0,0 +1,411 @@
+# -*- coding: utf-8 -*-
+
+"""Table-driven query planner for the asset search form.
+
+Every search field is described once by a :class:`SearchField` entry in
+``ASSET_SEARCH_FIELDS``. The registry is compiled at import time into
+a :class:`SearchPlanner`, which turns request parameters into
+a :class:`SearchPlan` - the ``Q`` object, the relations it joins (to make
+the results distinct only when a joined relation can repeat rows) and
+a normalized key identifying the search.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import hashlib
+import json
+import re
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from ralph.discovery.models_device import Device
+from ralph_assets.device_links import linked_devices_query
+from ralph_assets.models_assets import Asset, AssetCategory
+from ralph_assets.models_dc_assets import DataCenter, Rack, ServerRoom
+from ralph_assets.models_ngram import substring_query
+from ralph_assets.models_search import (
+    StagedIdentifiers,
+    bulk_search_threshold,
+)
+
+
+QUOTATION_MARKS = re.compile(r"^\".+\"$")
+SEARCH_DELIMITERS = re.compile(r";|\|")
+
+# lookup kinds
+EXACT = 'exact'
+CONTAINS = 'contains'
+ICONTAINS = 'icontains'
+
+ASSET_SEARCH_DATE_FIELDS = (
+    'invoice_date',
+    'request_date',
+    'delivery_date',
+    'production_use_date',
+    'provider_order_date',
+    'loan_end_date',
+)
+
+
+class SearchField(object):
+    """Declarative description of a single search field.
+
+    :param name: name of the GET parameter
+    :param lookup: ORM path the value is compared with
+    :param kind: one of ``EXACT``, ``CONTAINS`` or ``ICONTAINS``
+    :param exact: value enclosed in quotation marks is matched exactly
+    :param multi: value separated by ``;`` or ``|`` is matched as a list
+        of exact values
+    :param joins: relations required by this field (defaults to the
+        relations found in *lookup*)
+    :param builder: callable ``builder(value)`` returning ``Q`` (or
+        ``None``) for fields which don't fit into simple lookups
+    :param indexed: ``ICONTAINS`` search goes through the trigram index
+        (see :mod:`ralph_assets.models_ngram`)
+    :param bulk: long lists of values are staged in a table (see
+        :mod:`ralph_assets.models_search`) instead of OR'ed lookups
+    :param numeric: value is a comma separated list of integers
+    """
+
+    def __init__(
+        self, name, lookup=None, kind=EXACT, exact=False, multi=False,
+        joins=None, builder=None, indexed=False, bulk=False, numeric=False,
+    ):
+        self.name = name
+        self.lookup = lookup or name
+        self.kind = kind
+        self.exact = exact
+        self.multi = multi
+        self.builder = builder
+        self.indexed = indexed
+        self.bulk = bulk
+        self.numeric = numeric
+        if joins is None:
+            joins = [] if builder else _relations(self.lookup)
+        self.joins = frozenset(joins)
+
+    def normalize(self, value):
+        """Returns (mode, value) where mode is one of: exact, multi, value."""
+        if QUOTATION_MARKS.search(value):
+            return 'exact', value[1:-1]
+        if self.multi and SEARCH_DELIMITERS.search(value):
+            values = set(
+                item.strip() for item in SEARCH_DELIMITERS.split(value)
+            )
+            values.discard('')
+            return 'multi', sorted(values)
+        return 'value', value
+
+    def build(self, mode, value):
+        if self.builder:
+            return self.builder(value)
+        if mode == 'multi':
+            return _fields_or(self.lookup, value)
+        if self.kind == EXACT or (mode == 'exact' and self.exact):
+            return Q(**{self.lookup: value})
+        if self.indexed and self.kind == ICONTAINS:
+            return substring_query(self.name, self.lookup, value)
+        return Q(**{'{}__{}'.format(self.lookup, self.kind): value})
+
+    def stage(self, mode, value, create=True):
+        """Returns :class:`ralph_assets.models_search.StagedIdentifiers`
+        when *value* is a list long enough to be staged (and it's staged
+        already, without *create*), otherwise None."""
+        if not self.bulk:
+            return None
+        if self.numeric:
+            if mode != 'value':
+                return None
+            values = [int(id) for id in value.split(',')]
+        elif mode == 'multi':
+            values = value
+        else:
+            return None
+        if len(values) < bulk_search_threshold():
+            return None
+        identifiers = StagedIdentifiers(
+            self.name, self.lookup, values, numeric=self.numeric,
+            create=create,
+        )
+        return identifiers if identifiers.batch else None
+
+
+def _is_multi_valued(model, relation):
+    """Returns True when *relation* (e.g. 'model__manufacturer') of *model*
+    can join many rows to a single row of *model* (reverse foreign keys and
+    many-to-many relations)."""
+    for name in relation.split('__'):
+        field, _, direct, m2m = model._meta.get_field_by_name(name)
+        if m2m or not (direct or field.field.unique):
+            return True
+        model = field.rel.to if direct else field.model
+    return False
+
+
+def _relations(lookup):
+    """Returns relations paths used by *lookup*, e.g. 'a__b__c' gives
+    ['a', 'a__b']."""
+    parts = lookup.split('__')[:-1]
+    return ['__'.join(parts[:i + 1]) for i in range(len(parts))]
+
+
+def _fields_or(lookup, values):
+    q = Q()
+    for value in values:
+        q |= Q(**{lookup: value})
+    return q
+
+
+def _part_info_query(value):
+    if value == 'device':
+        return Q(part_info__isnull=True)
+    elif value == 'part':
+        return Q(part_info__gte=0)
+
+
+def _category_query(value):
+    category = AssetCategory.objects.get(slug=value)
+    children = [x.slug for x in category.get_children()]
+    return Q(model__category_id__in=[value] + children)
+
+
+def _deleted_query(value):
+    if value.lower() == 'on':
+        return Q(deleted__in=(True, False))
+
+
+DEPRECATION_RATE_QUERIES = {
+    'null': Q(deprecation_rate__isnull=True),
+    'deprecated': Q(deprecation_rate=0),
+    '6': Q(deprecation_rate__gt=0, deprecation_rate__lte=6),
+    '12': Q(deprecation_rate__gt=6, deprecation_rate__lte=12),
+    '24': Q(deprecation_rate__gt=12, deprecation_rate__lte=24),
+    '48': Q(deprecation_rate__gt=24, deprecation_rate__lte=48),
+    '48<': Q(deprecation_rate__gt=48),
+    # value used by the search form
+    '48>': Q(deprecation_rate__gt=48),
+}
+
+
+def _deprecation_rate_query(value):
+    return DEPRECATION_RATE_QUERIES[value]
+
+
+def _unlinked_query(value):
+    if value.lower() == 'on':
+        return ~Q(device_info=None) & Q(device_info__ralph_device_id=None)
+
+
+def _id_query(value):
+    return Q(id__in=[int(id) for id in value.split(",")])
+
+
+def _required_support_query(value):
+    return Q(required_support=(value == 'yes'))
+
+
+def _support_assigned_query(value):
+    return Q(supports__isnull=(value == 'none'))
+
+
+def _without_assigned_location_query(value):
+    # see DeviceInfo.has_complete_location
+    return Q(device_info=None) | Q(device_info__location_complete=False)
+
+
+def _location_name_query(value):
+    # exact name (compared with the database collation) of the rack, the
+    # server room or the data center of the device info or of its rack;
+    # the names are resolved in the small location tables first, so the
+    # assets are filtered by indexed keys of device info only
+    racks = list(Rack.objects.filter(
+        Q(name=value) | Q(server_room__name=value) |
+        Q(data_center__name=value)
+    ).values_list('id', flat=True))
+    server_rooms = list(ServerRoom.objects.filter(
+        name=value,
+    ).values_list('id', flat=True))
+    data_centers = list(DataCenter.objects.filter(
+        name=value,
+    ).values_list('id', flat=True))
+    return (
+        Q(device_info__rack__in=racks) |
+        Q(device_info__server_room__in=server_rooms) |
+        Q(device_info__data_center__in=data_centers)
+    )
+
+
+def _venture_department_query(value):
+    return linked_devices_query(
+        Device.objects.filter(venture__department_id=int(value)),
+    )
+
+
+_ = SearchField
+ASSET_SEARCH_FIELDS = [
+    _('barcode', kind=CONTAINS, exact=True, multi=True, bulk=True),
+    _('budget_info', 'budget_info__name', kind=ICONTAINS, exact=True),
+    _('category', builder=_category_query, joins=['model']),
+    _('company', 'owner__profile__company', kind=ICONTAINS),
+    _('cost_center', 'owner__profile__cost_center'),
+    _('deleted', builder=_deleted_query),
+    _('department', 'owner__profile__department', kind=ICONTAINS),
+    _('deprecation_rate', builder=_deprecation_rate_query),
+    _('device_environment', 'device_environment__name', kind=ICONTAINS,
+      exact=True),
+    _('device_info', joins=[]),
+    _('employee_id', 'owner__profile__employee_id'),
+    _('guardian', 'guardian__id', joins=[]),
+    _('hostname', kind=CONTAINS, exact=True, multi=True, bulk=True),
+    _('id', builder=_id_query, bulk=True, numeric=True),
+    _('imei', 'office_info__imei', kind=ICONTAINS, exact=True,
+      indexed=True),
+    _('invoice_no', kind=ICONTAINS, exact=True, indexed=True),
+    _('location', kind=ICONTAINS),
+    _('location_name', builder=_location_name_query, joins=['device_info']),
+    _('manufacturer', 'model__manufacturer__name', kind=ICONTAINS,
+      exact=True),
+    _('model', 'model__name', kind=ICONTAINS, exact=True),
+    _('niw', kind=ICONTAINS, exact=True, multi=True, indexed=True,
+      bulk=True),
+    _('order_no', kind=ICONTAINS, exact=True, indexed=True),
+    _('owner', 'owner'),
+    _('part_info', builder=_part_info_query),
+    _('profit_center', 'owner__profile__profit_center'),
+    _('provider', kind=ICONTAINS, exact=True, indexed=True),
+    _('purpose', 'office_info__purpose'),
+    _('ralph_device_id', 'device_info__ralph_device_id', kind=ICONTAINS,
+      exact=True),
+    _('region', 'region'),
+    _('remarks', kind=ICONTAINS, indexed=True),
+    _('required_support', builder=_required_support_query),
+    _('segment', 'owner__profile__segment', kind=ICONTAINS),
+    _('service', 'service__name', kind=ICONTAINS, exact=True),
+    _('service_name'),
+    _('sn', kind=ICONTAINS, exact=True, multi=True, indexed=True,
+      bulk=True),
+    _('source'),
+    _('status'),
+    _('support_assigned', builder=_support_assigned_query,
+      joins=['supports']),
+    _('task_url', kind=ICONTAINS, exact=True, indexed=True),
+    _('unlinked', builder=_unlinked_query, joins=['device_info']),
+    _('user', 'user'),
+    _('venture_department', builder=_venture_department_query,
+      joins=['device_info']),
+    _('warehouse', 'warehouse'),
+    _('without_assigned_location', builder=_without_assigned_location_query,
+      joins=['device_info']),
+]
+del _
+
+
+class SearchPlan(object):
+    """The result of planning a single search.
+
+    :param query: ``Q`` object selecting matching assets
+    :param terms: normalized search terms as ``(field, mode, value)``
+    :param joins: relations needed by the query
+    :param staged: :class:`ralph_assets.models_search.StagedIdentifiers`
+        of the lists searched through the staging table
+    :param distinct: some of *joins* can repeat rows, the results have to
+        be made distinct
+    """
+
+    def __init__(self, query, terms, joins, staged=(), distinct=False):
+        self.query = query
+        self.terms = terms
+        self.joins = joins
+        self.staged = tuple(staged)
+        self.distinct = distinct
+
+    @property
+    def is_empty(self):
+        return not self.query.children
+
+    @property
+    def key(self):
+        """Stable identifier of the search, insensitive to the order of
+        parameters and multi-values."""
+        serialized = json.dumps(self.terms, sort_keys=True)
+        return hashlib.md5(serialized.encode('utf-8')).hexdigest()
+
+
+class SearchPlanner(object):
+    """Turns search parameters into :class:`SearchPlan` of searching
+    *model*."""
+
+    def __init__(self, model, fields, date_fields=()):
+        self.fields = OrderedDict(
+            (field.name, field) for field in sorted(
+                fields, key=lambda field: field.name,
+            )
+        )
+        self.date_fields = tuple(date_fields)
+        self.model = model
+
+    @cached_property
+    def multi_valued(self):
+        """Relations joined by the fields which can repeat rows (resolved
+        on first use, when all models are loaded)."""
+        return frozenset(
+            relation for field in self.fields.itervalues()
+            for relation in field.joins
+            if _is_multi_valued(self.model, relation)
+        )
+
+    def get_terms(self, params):
+        terms = []
+        for name, field in self.fields.iteritems():
+            value = params.get(name)
+            if value:
+                mode, value = field.normalize(value)
+                terms.append((name, mode, value))
+        for name in self.date_fields:
+            for suffix in ('_from', '_to'):
+                value = params.get(name + suffix)
+                if value:
+                    terms.append((name + suffix, 'range', value))
+        return terms
+
+    def plan(self, params, stage=True):
+        """Returns :class:`SearchPlan` for *params* (e.g. ``request.GET``).
+        Without *stage* long lists are only searched through batches staged
+        already (nothing is written).
+        """
+        terms = self.get_terms(params)
+        query = Q()
+        joins = set()
+        staged = []
+        for name, mode, value in terms:
+            if mode == 'range':
+                lookup = '{}__{}'.format(
+                    name.rsplit('_', 1)[0],
+                    'gte' if name.endswith('_from') else 'lte',
+                )
+                query &= Q(**{lookup: value})
+                continue
+            field = self.fields[name]
+            identifiers = field.stage(mode, value, create=stage)
+            if identifiers:
+                staged.append(identifiers)
+                field_query = identifiers.query
+            else:
+                field_query = field.build(mode, value)
+            if field_query is not None:
+                query &= field_query
+                joins.update(field.joins)
+        return SearchPlan(
+            query, terms, frozenset(joins), staged,
+            distinct=bool(joins & self.multi_valued),
+        )
+
+
+asset_search_planner = SearchPlanner(
+    Asset, ASSET_SEARCH_FIELDS, ASSET_SEARCH_DATE_FIELDS,
+)
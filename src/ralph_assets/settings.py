@@ -33,6 +33,68 @@ ASSETS_TRANSITIONS = {
 
 ASSET_HIDE_ACTION_SEARCH = False
 
+# paginate search results with cursors (previous/next links) instead of
+# page numbers, it keeps deep pages fast on large databases
+ASSETS_KEYSET_PAGINATION = False
+
+# use trigram index in fuzzy asset lookup and substring search, fill it with
+# `rebuild_asset_ngrams` command before enabling
+ASSETS_NGRAM_INDEX = False
+# rq queue reindexing assets of renamed models
+ASSETS_NGRAM_QUEUE = 'default'
+
+# lists of identifiers (barcodes, sn...) pasted into the search with at least
+# that many values are staged in a table and joined instead of OR'ed lookups
+ASSETS_BULK_SEARCH_THRESHOLD = 100
+
+# cache counts and first pages of asset searches, entries are invalidated by
+# saving assets; CACHE is the alias of a cache from Django CACHES setting
+ASSETS_SEARCH_CACHE = {
+    'ENABLE': False,
+    'CACHE': 'default',
+    'TIMEOUT': 300,
+    'MAX_PAGES': 10,
+}
+
+# `create_history_checkpoints` command saves state of objects changed that
+# many times since their last checkpoint (used to rebuild past states)
+ASSETS_HISTORY_CHECKPOINT_INTERVAL = 50
+
+# `archive_history` command moves history older than that many days to the
+# archive table
+ASSETS_HISTORY_ARCHIVE_DAYS = 730
+
+# write history of field changes with rq workers, rows of an object always go
+# to the same queue (run a single worker per queue); `drain_history_queue`
+# command shows their lag
+ASSETS_ASYNC_HISTORY = {
+    'ENABLE': False,
+    'QUEUES': ('history',),
+}
+
+# measure queries and time of ralph_assets views (add
+# `ralph_assets.instrumentation.InstrumentationMiddleware` to
+# MIDDLEWARE_CLASSES) and named sections, summed up in CACHE and shown by
+# `instrumentation_stats` command; BUDGETS maps view/section names to limits
+# of 'queries', 'db_time' and 'time' (seconds), exceeding them is logged or
+# raised with RAISE
+ASSETS_INSTRUMENTATION = {
+    'ENABLE': False,
+    'CACHE': 'default',
+    'BUDGETS': {},
+    'RAISE': False,
+}
+
+# store queries of instrumented views and sections taking longer than
+# THRESHOLD seconds (with EXPLAIN of selects) in the admin's slow queries
+# list, the last MAX_RECORDS of them are kept
+ASSETS_SLOW_QUERIES = {
+    'ENABLE': False,
+    'THRESHOLD': 1.0,
+    'MAX_RECORDS': 1000,
+    'EXPLAIN': True,
+}
+
 # force locale during pdf raport genration
 GENERATED_DOCS_LOCALE = None
 
@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+
+"""Synthetic inventory for performance measurements.
+
+:func:`generate_inventory` fills the database with a realistic mix of data
+center assets (with device infos in racks and linked Ralph devices) and
+back office assets, together with licences, supports and history of their
+changes, inserted in bulk (without signals, so the denormalized search
+data is rebuilt for every chunk). Synthetic assets are recognized by
+``SN_PREFIX`` of their serial numbers, generating a larger inventory adds
+only the missing assets, so a single database can be grown through the
+benchmarked scales (see :mod:`ralph_assets.benchmarks`).
+
+Rows get explicit primary keys, so use a throwaway database and don't
+write to it concurrently.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import datetime
+import random
+from decimal import Decimal
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from ralph.account.models import Region
+from ralph.cmdb.models_ci import CI_STATE_TYPES, CI_TYPES, CIType
+from ralph.discovery.models import (
+    Device,
+    DeviceEnvironment,
+    DeviceModel,
+    ServiceCatalog,
+)
+
+from ralph_assets.history.models import INSERT_CHUNK_SIZE, History
+from ralph_assets.licences.models import (
+    Licence,
+    LicenceAsset,
+    LicenceType,
+    SoftwareCategory,
+)
+from ralph_assets.models_assets import (
+    Asset,
+    AssetCategory,
+    AssetCategoryType,
+    AssetManufacturer,
+    AssetModel,
+    AssetSource,
+    AssetStatus,
+    AssetType,
+    Warehouse,
+    update_device_info_locations,
+)
+from ralph_assets.models_dc_assets import (
+    DataCenter,
+    DeviceInfo,
+    Orientation,
+    Rack,
+    ServerRoom,
+)
+from ralph_assets.models_ngram import (
+    ngram_index_enabled,
+    rebuild_asset_ngrams,
+)
+from ralph_assets.models_support import Support, SupportStatus, SupportType
+from ralph_assets.search_cache import bump_generation
+
+
+SN_PREFIX = 'synthetic-'
+NAME_PREFIX = 'Synthetic'
+# proportions of the generated inventory
+DC_SHARE = 0.6
+ASSETS_PER_RACK = 40
+ASSETS_PER_LICENCE = 20
+ASSETS_PER_SUPPORT = 50
+HISTORY_PER_ASSET = 4
+DICTIONARY_SIZE = 20
+HISTORY_FIELDS = ('status', 'remarks', 'warehouse')
+FIRST_DATE = datetime.date(2010, 1, 1)
+
+
+def count_synthetic_assets():
+    return Asset.admin_objects.filter(sn__startswith=SN_PREFIX).count()
+
+
+def _next_id(model, field='id'):
+    last = model._base_manager.aggregate(last=Max(field))['last']
+    return (last or 0) + 1
+
+
+def _bulk_create(model, objects):
+    for i in xrange(0, len(objects), INSERT_CHUNK_SIZE):
+        model.objects.bulk_create(objects[i:i + INSERT_CHUNK_SIZE])
+
+
+def _reset_sequences(models):
+    """Moves sequences of primary keys (where the database has them) past
+    the explicitly inserted ones."""
+    cursor = connection.cursor()
+    for sql in connection.ops.sequence_reset_sql(no_style(), models):
+        cursor.execute(sql)
+
+
+class Dictionaries(object):
+    """Objects referenced by the generated rows, created once."""
+
+    def __init__(self):
+        self.region = Region.get_default_region()
+        self.warehouses = self._named(Warehouse, 'warehouse')
+        self.manufacturers = self._named(AssetManufacturer, 'manufacturer')
+        self.models = {}
+        for category_type in (
+            AssetCategoryType.data_center, AssetCategoryType.back_office,
+        ):
+            category, _ = AssetCategory.objects.get_or_create(
+                slug='synthetic-{}'.format(category_type.name),
+                defaults={
+                    'name': '{} {}'.format(NAME_PREFIX, category_type.desc),
+                    'type': category_type.id,
+                },
+            )
+            self.models[category_type.id] = [
+                AssetModel.objects.get_or_create(
+                    name='{} {} model {}'.format(
+                        NAME_PREFIX, category_type.name, i,
+                    ),
+                    defaults={
+                        'category': category,
+                        'manufacturer': self.manufacturers[
+                            i % len(self.manufacturers)
+                        ],
+                        'type': category_type.id,
+                        'power_consumption': 100 + i * 10,
+                        'height_of_device': 1 + i % 4,
+                        'cores_count': 2 ** (i % 6),
+                    },
+                )[0] for i in xrange(DICTIONARY_SIZE)
+            ]
+        self.data_center, _ = DataCenter.objects.get_or_create(
+            name='{} data center'.format(NAME_PREFIX),
+        )
+        self.server_room, _ = ServerRoom.objects.get_or_create(
+            name='{} server room'.format(NAME_PREFIX),
+            data_center=self.data_center,
+        )
+        self.device_model, _ = DeviceModel.objects.get_or_create(
+            name='{} device model'.format(NAME_PREFIX),
+        )
+        self.services = self._cis(ServiceCatalog, CI_TYPES.SERVICE, 'service')
+        self.environments = self._cis(
+            DeviceEnvironment, CI_TYPES.ENVIRONMENT, 'environment',
+        )
+        self.licence_type, _ = LicenceType.objects.get_or_create(
+            name='{} licence type'.format(NAME_PREFIX),
+        )
+        self.software_category, _ = SoftwareCategory.objects.get_or_create(
+            name='{} software'.format(NAME_PREFIX),
+            defaults={'asset_type': AssetType.back_office.id},
+        )
+        self.support_type, _ = SupportType.objects.get_or_create(
+            name='{} support type'.format(NAME_PREFIX),
+        )
+        self.asset_content_type = ContentType.objects.get_for_model(Asset)
+
+    def _named(self, model, kind):
+        return [
+            model.objects.get_or_create(
+                name='{} {} {}'.format(NAME_PREFIX, kind, i),
+            )[0] for i in xrange(DICTIONARY_SIZE)
+        ]
+
+    def _cis(self, model, ci_type, kind):
+        return [
+            model.objects.get_or_create(
+                name='{} {} {}'.format(NAME_PREFIX, kind, i),
+                defaults={
+                    'type': CIType.objects.get(pk=ci_type.id),
+                    'state': CI_STATE_TYPES.ACTIVE.id,
+                },
+            )[0] for i in xrange(DICTIONARY_SIZE // 4)
+        ]
+
+
+class InventoryGenerator(object):
+    """Generates synthetic assets numbered from *start*, with objects
+    depending on them."""
+
+    def __init__(self, start, seed=0):
+        self.index = start
+        self.random = random.Random(seed + start)
+        self.dictionaries = Dictionaries()
+        self.ids = dict(
+            (model, _next_id(model))
+            for model in (Asset, Device, DeviceInfo, Licence, Rack, Support)
+        )
+        self.next_tree_id = _next_id(Licence, 'tree_id')
+        # the current rack and the next free position in it
+        self.rack = None
+        self.position = 1
+
+    def _take_id(self, model):
+        pk = self.ids[model]
+        self.ids[model] += 1
+        return pk
+
+    def _date(self, max_days=5 * 365):
+        return FIRST_DATE + datetime.timedelta(
+            days=self.random.randint(0, max_days),
+        )
+
+    def generate(self, count):
+        """Inserts *count* assets, returns their ids."""
+        rand = self.random
+        dictionaries = self.dictionaries
+        devices = []
+        device_infos = []
+        assets = []
+        for _ in xrange(count):
+            number = self.index
+            self.index += 1
+            is_dc = rand.random() < DC_SHARE
+            category_type = (
+                AssetCategoryType.data_center if is_dc
+                else AssetCategoryType.back_office
+            )
+            asset = Asset(
+                id=self._take_id(Asset),
+                type=(
+                    AssetType.data_center if is_dc else AssetType.back_office
+                ).id,
+                model=rand.choice(dictionaries.models[category_type.id]),
+                source=AssetSource.shipment.id,
+                status=rand.choice((
+                    AssetStatus.new, AssetStatus.in_progress,
+                    AssetStatus.used, AssetStatus.liquidated,
+                )).id,
+                sn='{}{:09d}'.format(SN_PREFIX, number),
+                barcode='SYN{:09d}'.format(number),
+                niw='NIW-{:09d}'.format(number),
+                invoice_no='INV-{}'.format(number // 100),
+                invoice_date=self._date(),
+                price=Decimal(rand.randint(100, 100000)) / 10,
+                deprecation_rate=rand.choice((0, 25, 50)),
+                warehouse=rand.choice(dictionaries.warehouses),
+                region=dictionaries.region,
+                service=rand.choice(dictionaries.services),
+                device_environment=rand.choice(dictionaries.environments),
+                remarks='synthetic asset {}'.format(number),
+                support_period=24,
+            )
+            if is_dc:
+                device = Device(
+                    id=self._take_id(Device),
+                    name='synthetic-{}.dc'.format(number),
+                    sn=asset.sn,
+                    barcode=asset.barcode,
+                    model=dictionaries.device_model,
+                )
+                devices.append(device)
+                device_info = DeviceInfo(
+                    id=self._take_id(DeviceInfo),
+                    ralph_device_id=device.id,
+                    data_center=dictionaries.data_center,
+                    server_room=dictionaries.server_room,
+                    rack=self._next_rack(),
+                    position=self.position,
+                    orientation=rand.choice((
+                        Orientation.front, Orientation.back,
+                    )).id,
+                    slot_no='',
+                )
+                self.position += 1
+                device_infos.append(device_info)
+                asset.device_info_id = device_info.id
+            else:
+                asset.hostname = 'SYNBO{:09d}'.format(number)
+            assets.append(asset)
+        _bulk_create(Device, devices)
+        _bulk_create(DeviceInfo, device_infos)
+        _bulk_create(Asset, assets)
+        self._generate_licences(assets)
+        self._generate_supports(assets)
+        self._generate_history(assets)
+        return [obj.id for obj in assets]
+
+    def _next_rack(self):
+        if self.rack is None or self.position > ASSETS_PER_RACK:
+            pk = self._take_id(Rack)
+            self.rack = Rack.objects.create(
+                id=pk,
+                name='{} rack {}'.format(NAME_PREFIX, pk),
+                data_center=self.dictionaries.data_center,
+                server_room=self.dictionaries.server_room,
+            )
+            self.position = 1
+        return self.rack
+
+    def _generate_licences(self, assets):
+        dictionaries = self.dictionaries
+        licences = []
+        links = []
+        for i in xrange(0, len(assets), ASSETS_PER_LICENCE):
+            pk = self._take_id(Licence)
+            invoice_date = self._date()
+            licence = Licence(
+                id=pk,
+                licence_type=dictionaries.licence_type,
+                software_category=dictionaries.software_category,
+                manufacturer=self.random.choice(dictionaries.manufacturers),
+                number_bought=ASSETS_PER_LICENCE,
+                niw='SYNLIC{:09d}'.format(pk),
+                asset_type=assets[i].type,
+                invoice_date=invoice_date,
+                valid_thru=invoice_date + datetime.timedelta(days=3 * 365),
+                price=Decimal(self.random.randint(10, 1000)),
+                region=dictionaries.region,
+                # a root of its own tree
+                tree_id=self.next_tree_id,
+                lft=1,
+                rght=2,
+                level=0,
+            )
+            self.next_tree_id += 1
+            licences.append(licence)
+            links.extend(
+                LicenceAsset(licence_id=licence.id, asset_id=linked.id)
+                for linked in assets[i:i + ASSETS_PER_LICENCE]
+            )
+        _bulk_create(Licence, licences)
+        _bulk_create(LicenceAsset, links)
+
+    def _generate_supports(self, assets):
+        dictionaries = self.dictionaries
+        Link = Support.assets.through
+        supports = []
+        links = []
+        for i in xrange(0, len(assets), ASSETS_PER_SUPPORT):
+            pk = self._take_id(Support)
+            date_from = self._date()
+            support = Support(
+                id=pk,
+                name='{} support {}'.format(NAME_PREFIX, pk),
+                contract_id='SYNSUP{:09d}'.format(pk),
+                asset_type=assets[i].type,
+                status=SupportStatus.new.id,
+                date_from=date_from,
+                date_to=date_from + datetime.timedelta(days=3 * 365),
+                price=Decimal(self.random.randint(100, 10000)),
+                support_type=dictionaries.support_type,
+                region=dictionaries.region,
+            )
+            supports.append(support)
+            links.extend(
+                Link(support_id=support.id, asset_id=linked.id)
+                for linked in assets[i:i + ASSETS_PER_SUPPORT]
+            )
+        _bulk_create(Support, supports)
+        _bulk_create(Link, links)
+
+    def _generate_history(self, assets):
+        content_type = self.dictionaries.asset_content_type
+        rows = []
+        for asset in assets:
+            date = datetime.datetime.combine(
+                asset.invoice_date, datetime.time(12),
+            )
+            for i in xrange(HISTORY_PER_ASSET):
+                date += datetime.timedelta(days=self.random.randint(1, 90))
+                rows.append(History(
+                    content_type=content_type,
+                    object_id=asset.id,
+                    field_name=HISTORY_FIELDS[i % len(HISTORY_FIELDS)],
+                    old_value='value {}'.format(i),
+                    new_value='value {}'.format(i + 1),
+                    date=date,
+                ))
+        _bulk_create(History, rows)
+
+
+def generate_inventory(assets, chunk_size=1000, seed=0, log=None):
+    """Adds synthetic assets (with related objects) until there are
+    *assets* of them, each chunk of *chunk_size* assets in a separate
+    transaction. Returns the number of added assets."""
+    start = count_synthetic_assets()
+    if start >= assets:
+        return 0
+    generator = InventoryGenerator(start, seed)
+    added = 0
+    while start + added < assets:
+        count = min(chunk_size, assets - start - added)
+        with transaction.commit_on_success():
+            ids = generator.generate(count)
+            chunk = Asset.admin_objects.filter(id__in=ids)
+            update_device_info_locations(chunk, chunk_size)
+            if ngram_index_enabled():
+                rebuild_asset_ngrams(chunk, chunk_size)
+        added += count
+        if log:
+            log('{} synthetic assets'.format(start + added))
+    with transaction.commit_on_success():
+        _reset_sequences([
+            Asset, Device, DeviceInfo, Licence, Rack, Support,
+        ])
+    bump_generation(Asset)
+    return added
@@ -80,3 +80,25 @@ def multi_assign_form(form, counter=''):
 )
 def mode_switch(context):
     return {'mode': context['mode']}
+
+
+@register.inclusion_tag('assets/templatetags/keyset_pagination.html')
+def keyset_pagination(
+    page, url_query, cursor_variable_name='cursor', show_csv=False,
+    export_variable_name='export',
+):
+    """Render previous/next links of a page paginated by
+    :class:`ralph_assets.views.pagination.KeysetPaginationMixin`."""
+    def cursor_url(cursor):
+        query = url_query.copy()
+        query.pop('page', None)
+        query[cursor_variable_name] = cursor
+        return query.urlencode()
+    return {
+        'page': page,
+        'url_query': url_query,
+        'url_previous_page': cursor_url(page.previous_cursor),
+        'url_next_page': cursor_url(page.next_cursor),
+        'show_csv': show_csv,
+        'export_variable_name': export_variable_name,
+    }
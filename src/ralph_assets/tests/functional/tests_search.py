@@ -11,6 +11,7 @@ import urllib
 from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse
 from django.test import TestCase
+from django.test.utils import override_settings
 
 from ralph.cmdb.tests.utils import (
     DeviceEnvironmentFactory,
@@ -32,7 +33,9 @@ from ralph_assets.models_assets import (
 )
 from ralph.ui.tests.global_utils import login_as_su
 from ralph.util.tests.utils import RegionFactory
-from ralph_assets.tests.utils import supports
+from ralph_assets.search_cache import get_backend
+from ralph_assets.tests.unit.test_search_cache import SEARCH_CACHE_SETTINGS
+from ralph_assets.tests.utils import CaptureQueries, supports
 
 
 class BaseSearchTest(TestCase):
@@ -879,6 +882,16 @@ class TestSearchEngine(TestCase):
             assets_count - 1,
         )
 
+    def test_support_assignment_distinct(self):
+        DCAssetFactory(**dict(
+            supports=(
+                supports.DCSupportFactory(), supports.DCSupportFactory(),
+            ),
+        ))
+        self._check_results_length(
+            self.testing_urls['dc'], 'support_assigned', 'any', 1,
+        )
+
     def test_rack_empty(self):
         self._check_results_length(
             self.testing_urls['dc'], 'location_name', 'imaginary_rack', 0,
@@ -986,3 +999,166 @@ class TestDCLocationSearching(BaseSearchTest, TestCase):
         required_fields = self.get_required_fields()
         asset_data = {'model__category': None}
         self._check_fields(search_query, required_fields, asset_data)
+
+
+class TestSearchQueryCount(BaseSearchTest):
+    def setUp(self):
+        super(TestSearchQueryCount, self).setUp()
+        for _ in range(3):
+            DCAssetFactory(provider='Provider1')
+
+    def _get_captured(self, url, data_dict):
+        with CaptureQueries() as captured:
+            response = self.client.get(
+                '{}?{}'.format(url, urllib.urlencode(data_dict)),
+            )
+        return response, captured
+
+    def test_search_counts_once(self):
+        response, captured = self._get_captured(
+            self.testing_urls['dc'], {'provider': 'Provider1'},
+        )
+        self.assertEqual(response.context['assets_count'], 3)
+        self.assertEqual(captured.count('COUNT('), 1)
+
+    def test_search_without_filters_counts_once(self):
+        response, captured = self._get_captured(self.testing_urls['dc'], {})
+        self.assertIsNone(response.context['assets_count'])
+        self.assertEqual(captured.count('COUNT('), 1)
+
+
+@override_settings(ASSETS_KEYSET_PAGINATION=True)
+class TestSearchKeysetPagination(BaseSearchTest):
+    def setUp(self):
+        super(TestSearchKeysetPagination, self).setUp()
+        statuses = [AssetStatus.new, AssetStatus.used, AssetStatus.damaged]
+        for i in range(20):
+            DCAssetFactory(
+                status=statuses[i % len(statuses)],
+                # a few NULLs to seek through
+                barcode=None if i % 4 == 0 else 'keyset-{}'.format(i),
+            )
+
+    def _get_page(self, data_dict):
+        url = '{}?{}'.format(
+            self.testing_urls['dc'], urllib.urlencode(data_dict),
+        )
+        return self.client.get(url).context['bob_page']
+
+    def _check_walk(self, sort, ordering):
+        all_ids = [
+            asset.id for asset in Asset.objects_dc.order_by(*ordering)
+        ]
+        first = self._get_page({'sort': sort})
+        self.assertEqual([a.id for a in first], all_ids[:15])
+        self.assertFalse(first.has_previous())
+        self.assertTrue(first.has_next())
+        second = self._get_page({'sort': sort, 'cursor': first.next_cursor})
+        self.assertEqual([a.id for a in second], all_ids[15:])
+        self.assertTrue(second.has_previous())
+        self.assertFalse(second.has_next())
+        back = self._get_page({'sort': sort, 'cursor': second.previous_cursor})
+        self.assertEqual([a.id for a in back], all_ids[:15])
+        self.assertFalse(back.has_previous())
+        self.assertTrue(back.has_next())
+
+    def test_walk_sorted_ascending(self):
+        self._check_walk('status', ['status', 'pk'])
+
+    def test_walk_sorted_descending(self):
+        self._check_walk('-status', ['-status', '-pk'])
+
+    def test_walk_sorted_by_column_with_nulls(self):
+        self._check_walk('-barcode', ['-barcode', '-pk'])
+        self._check_walk('barcode', ['barcode', 'pk'])
+
+    def test_walk_unsorted(self):
+        self._check_walk('', ['pk'])
+
+    def test_cursor_of_other_sort_is_ignored(self):
+        first = self._get_page({'sort': '-status'})
+        page = self._get_page({'sort': 'status', 'cursor': first.next_cursor})
+        self.assertFalse(page.has_previous())
+        self.assertEqual(page.paginator.count, 20)
+
+    def test_invalid_cursor_shows_first_page(self):
+        page = self._get_page({'cursor': 'not a cursor'})
+        self.assertFalse(page.has_previous())
+        self.assertEqual(len(page), 15)
+
+
+@override_settings(ASSETS_BULK_SEARCH_THRESHOLD=100)
+class TestSearchPastedIdentifiers(BaseSearchTest):
+    def setUp(self):
+        super(TestSearchPastedIdentifiers, self).setUp()
+        self.assets = [
+            DCAssetFactory(barcode='pasted-{}'.format(i)) for i in range(5)
+        ]
+
+    def test_pasted_barcodes(self):
+        barcodes = ['pasted-{}'.format(i) for i in range(10000)]
+        url = '{}?{}'.format(
+            self.testing_urls['dc'],
+            urllib.urlencode({'barcode': '|'.join(barcodes)}),
+        )
+        with CaptureQueries() as captured:
+            response = self.client.get(url)
+        self.assertEqual(
+            set(response.context['bob_page'].paginator.object_list),
+            set(self.assets),
+        )
+        selects = [
+            sql for sql in captured.queries if sql.startswith('SELECT')
+        ]
+        self.assertLess(max(len(sql) for sql in selects), 5000)
+        warnings = [
+            unicode(message) for message in response.context['messages']
+        ]
+        self.assertEqual(len(warnings), 1)
+        self.assertIn('9995 of 10000 values of barcode', warnings[0])
+        self.assertIn('pasted-10, ', warnings[0])
+        self.assertNotIn('pasted-1, ', warnings[0])
+
+
+@override_settings(**SEARCH_CACHE_SETTINGS)
+class TestSearchCache(BaseSearchTest):
+    def setUp(self):
+        super(TestSearchCache, self).setUp()
+        get_backend().clear()
+        self.assets = [
+            DCAssetFactory(status=AssetStatus.new) for i in range(20)
+        ]
+        self.url = '{}?status={}&sort=-barcode'.format(
+            self.testing_urls['dc'], AssetStatus.new.id,
+        )
+
+    def _get_page(self, url):
+        with CaptureQueries() as captured:
+            page = self.client.get(url).context['bob_page']
+        return page, captured
+
+    def test_repeated_search_is_cached(self):
+        first, captured = self._get_page(self.url)
+        self.assertEqual(captured.count('COUNT('), 1)
+        second, captured = self._get_page(self.url)
+        self.assertEqual(captured.count('COUNT('), 0)
+        self.assertEqual(second.paginator.count, 20)
+        self.assertEqual(
+            [asset.id for asset in second], [asset.id for asset in first],
+        )
+
+    def test_save_invalidates_cache(self):
+        self._get_page(self.url)
+        asset = self.assets[0]
+        asset.status = AssetStatus.used
+        asset.save()
+        page, captured = self._get_page(self.url)
+        self.assertEqual(captured.count('COUNT('), 1)
+        self.assertEqual(page.paginator.count, 19)
+        self.assertNotIn(asset, page)
+
+    def test_pages_are_cached_separately(self):
+        first, _ = self._get_page(self.url)
+        second, _ = self._get_page(self.url + '&page=2')
+        self.assertEqual(len(second), 5)
+        self.assertFalse(set(first) & set(second))
@@ -6,18 +6,22 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import mock
-from datetime import date
+from datetime import date, datetime, timedelta
 
 from django.test import TestCase
 from ralph.account.models import Region
 
 from ralph_assets import models
 from ralph_assets import api_scrooge
+from ralph_assets.history.archive import archive_history
+from ralph_assets.history.models import History
+from ralph_assets.instrumentation import Section
 from ralph_assets.tests.utils.assets import (
     DCAssetFactory,
     AssetModelFactory,
     WarehouseFactory,
 )
+from ralph_assets.tests.utils.licences import LicenceFactory
 from ralph_assets.tests.utils.supports import (
     DCSupportFactory,
     BOSupportFactory,
@@ -172,6 +176,115 @@ class TestApiScrooge(TestCase):
         self.assertEquals(result, [])
         self.assertTrue(logger_mock.info.called)
 
+    def _liquidate(self, asset):
+        asset.status = models.AssetStatus.liquidated
+        asset.save()
+
+    def test_get_assets_skips_liquidated(self):
+        liquidated = DCAssetFactory(invoice_date=date(2013, 10, 11))
+        self._liquidate(liquidated)
+        asset = DCAssetFactory(invoice_date=date(2013, 10, 11))
+        result = list(api_scrooge.get_assets(date.today()))
+        self.assertEqual([a['asset_id'] for a in result], [asset.id])
+        # liquidated later than the given date
+        result = list(api_scrooge.get_assets(date(2013, 11, 12)))
+        self.assertEqual(
+            sorted(a['asset_id'] for a in result),
+            sorted([liquidated.id, asset.id]),
+        )
+
+    def _count_queries(self, **kwargs):
+        with Section('test', force=True) as section:
+            result = list(api_scrooge.get_assets(date.today(), **kwargs))
+        return section.queries, len(result)
+
+    def test_get_assets_queries_per_chunk(self):
+        for _ in xrange(2):
+            self._liquidate(DCAssetFactory())
+            DCAssetFactory()
+        queries, count = self._count_queries()
+        self.assertEqual(count, 2)
+        for _ in xrange(3):
+            self._liquidate(DCAssetFactory())
+            DCAssetFactory()
+        self.assertEqual(self._count_queries(), (queries, 5))
+        # every chunk costs the same (plus the query of the empty one)
+        chunk_queries = queries - 1
+        self.assertEqual(
+            self._count_queries(chunk_size=4),
+            (3 * chunk_queries + 1, 5),
+        )
+
+    def test_get_assets_skips_archived_liquidation(self):
+        liquidated = DCAssetFactory(invoice_date=date(2010, 10, 11))
+        self._liquidate(liquidated)
+        History.objects.filter(
+            object_id=liquidated.id, new_value='liquidated',
+        ).update(date=datetime(2011, 1, 1))
+        archive_history(before=datetime(2012, 1, 1))
+        self.assertFalse(History.objects.filter(
+            object_id=liquidated.id, new_value='liquidated',
+        ).exists())
+        self.assertEqual(list(api_scrooge.get_assets(date.today())), [])
+        self.assertEqual(
+            list(api_scrooge.get_assets_in_range(
+                date(2012, 1, 1), date(2012, 1, 31),
+            )),
+            [],
+        )
+        self.assertTrue(models.Asset.admin_objects.get(
+            pk=liquidated.pk,
+        ).is_liquidated(date.today()))
+
+    def test_get_assets_in_range(self):
+        start = date.today() - timedelta(days=10)
+        end = date.today() + timedelta(days=5)
+        DCAssetFactory(invoice_date=start - timedelta(days=30))
+        DCAssetFactory(invoice_date=start + timedelta(days=3))
+        DCAssetFactory(invoice_date=end + timedelta(days=1))
+        DCAssetFactory(
+            invoice_date=start - timedelta(days=400),
+            deprecation_end_date=start + timedelta(days=4),
+        )
+        self._liquidate(DCAssetFactory(invoice_date=start))
+        liquidated_before = DCAssetFactory(invoice_date=start)
+        self._liquidate(liquidated_before)
+        History.objects.filter(
+            object_id=liquidated_before.id, new_value='liquidated',
+        ).update(date=start - timedelta(days=1))
+        daily = {}
+        for day in xrange((end - start).days + 1):
+            day = start + timedelta(days=day)
+            for data in api_scrooge.get_assets(day):
+                daily.setdefault(data['asset_id'], []).append(
+                    (day, data.pop('is_depreciated'), data),
+                )
+        ranged = list(api_scrooge.get_assets_in_range(start, end))
+        self.assertEqual(len(ranged), 4)
+        for data in ranged:
+            days = []
+            for interval in data.pop('intervals'):
+                day = interval['date_from']
+                while day <= interval['date_to']:
+                    days.append((day, interval['is_depreciated'], data))
+                    day += timedelta(days=1)
+            self.assertEqual(days, daily[data['asset_id']])
+
+    def test_get_supports_in_range(self):
+        for date_from, date_to in (
+            (date(2013, 11, 1), date(2013, 11, 5)),
+            (date(2013, 11, 20), date(2014, 1, 1)),
+            (date(2013, 12, 1), date(2014, 1, 1)),
+        ):
+            DCSupportFactory(date_from=date_from, date_to=date_to)
+        supports = api_scrooge.get_supports_in_range(
+            date(2013, 11, 10), date(2013, 11, 30),
+        )
+        self.assertEqual(
+            [support['date_from'] for support in supports],
+            [date(2013, 11, 20)],
+        )
+
     def test_get_supports(self):
         DCSupportFactory(
             date_from=date(2013, 11, 12),
@@ -196,3 +309,47 @@ class TestApiScrooge(TestCase):
         )
         supports = get_supports(date(2013, 11, 12))
         self.assertEqual(len(list(supports)), 1)
+
+    def _get_supports(self):
+        with Section('test', force=True) as section:
+            supports = list(get_supports(date(2013, 11, 12)))
+        return supports, section.queries
+
+    def test_get_supports_assets(self):
+        support = DCSupportFactory(
+            date_from=date(2013, 11, 12), date_to=date(2014, 11, 12),
+        )
+        assets = [DCAssetFactory(), DCAssetFactory()]
+        support.assets.add(*assets)
+        supports, queries = self._get_supports()
+        self.assertEqual(
+            supports[0]['assets'], sorted(asset.id for asset in assets),
+        )
+        for _ in xrange(3):
+            DCSupportFactory(
+                date_from=date(2013, 11, 12), date_to=date(2014, 11, 12),
+            ).assets.add(DCAssetFactory())
+        supports, more_queries = self._get_supports()
+        self.assertEqual(len(supports), 4)
+        self.assertEqual(more_queries, queries)
+
+    def test_get_licences_assets(self):
+        licence = LicenceFactory(
+            asset_type=models.AssetType.data_center,
+            invoice_date=date(2013, 1, 1),
+            valid_thru=date(2014, 1, 1),
+        )
+        asset = DCAssetFactory()
+        licence.assign(asset)
+        LicenceFactory(
+            asset_type=models.AssetType.data_center,
+            invoice_date=date(2013, 1, 1),
+            valid_thru=date(2014, 1, 1),
+        )
+        licences = sorted(
+            api_scrooge.get_licences(date(2013, 11, 12)),
+            key=lambda row: len(row['assets']),
+        )
+        self.assertEqual(
+            [row['assets'] for row in licences], [[], [asset.id]],
+        )
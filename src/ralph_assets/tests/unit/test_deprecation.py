@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import datetime
+import random
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.test import TestCase
+
+from ralph_assets.deprecation import DeprecationBatch, add_months
+from ralph_assets.models_assets import Asset
+
+
+def _reference_is_deprecated(row, date):
+    """Deprecation computed like ``Asset.is_deprecated`` did it with
+    ``relativedelta``."""
+    invoice_date, rate, end_date, force, _ = row
+    if force or not invoice_date:
+        return True
+    if end_date:
+        deprecation_date = end_date
+    else:
+        months = int((1 / (rate / 100) * 12) if rate else 0)
+        deprecation_date = invoice_date + relativedelta(months=months)
+    return deprecation_date < date
+
+
+class TestDeprecationBatch(TestCase):
+
+    def setUp(self):
+        self.random = random.Random(0)
+
+    def _date(self):
+        return datetime.date(2008, 1, 1) + datetime.timedelta(
+            days=self.random.randrange(4000),
+        )
+
+    def _maybe(self, value):
+        return value if self.random.random() < 0.8 else None
+
+    def _rows(self, count=500):
+        return [
+            (
+                self._maybe(self._date()),
+                self.random.choice([
+                    Decimal('0'), Decimal('25.00'), Decimal('33.33'),
+                    Decimal('50.00'), Decimal('100.00'),
+                    Decimal(self.random.randrange(1, 10000)) / 100,
+                ]),
+                self._date() if self.random.random() < 0.2 else None,
+                self.random.random() < 0.1,
+                self._maybe(self._date()),
+            )
+            for _ in xrange(count)
+        ]
+
+    def test_add_months(self):
+        for _ in xrange(2000):
+            date = self._date()
+            months = self.random.randrange(-24, 240)
+            self.assertEqual(
+                add_months(date, months), date + relativedelta(months=months),
+            )
+
+    def test_add_months_end_of_month(self):
+        self.assertEqual(
+            add_months(datetime.date(2012, 1, 31), 1),
+            datetime.date(2012, 2, 29),
+        )
+        self.assertEqual(
+            add_months(datetime.date(2012, 11, 30), 14),
+            datetime.date(2014, 1, 30),
+        )
+
+    def test_equals_reference(self):
+        rows = self._rows()
+        batch = DeprecationBatch(*zip(*rows))
+        dates = [self._date() for _ in xrange(20)]
+        statuses = batch.is_deprecated_on(dates)
+        for date in dates:
+            self.assertEqual(statuses[date], [
+                _reference_is_deprecated(row, date) for row in rows
+            ])
+
+    def test_equals_asset_methods(self):
+        rows = self._rows(200)
+        assets = [
+            Asset(
+                invoice_date=invoice_date,
+                deprecation_rate=rate,
+                deprecation_end_date=end_date,
+                force_deprecation=force,
+            )
+            for invoice_date, rate, end_date, force, _ in rows
+        ]
+        batch = DeprecationBatch.from_assets(assets)
+        self.assertEqual(batch.deprecation_months, [
+            asset.get_deprecation_months() for asset in assets
+        ])
+        self.assertEqual(batch.deprecation_dates, [
+            asset.get_deprecation_date() for asset in assets
+        ])
+        for _ in xrange(10):
+            date = self._date()
+            self.assertEqual(batch.is_deprecated(date), [
+                asset.is_deprecated(date) for asset in assets
+            ])
+        dates_from = [self._date() for asset in assets]
+        dates_to = [
+            date_from + datetime.timedelta(days=self.random.randrange(3000))
+            for date_from in dates_from
+        ]
+        self.assertEqual(
+            batch.deprecation_intervals(dates_from, dates_to),
+            [
+                asset.get_deprecation_intervals(date_from, date_to)
+                for asset, date_from, date_to in zip(
+                    assets, dates_from, dates_to,
+                )
+            ],
+        )
+
+    def test_liquidation(self):
+        rows = self._rows()
+        batch = DeprecationBatch(*zip(*rows))
+        date = self._date()
+        self.assertEqual(batch.is_liquidated(date), [
+            row[4] is not None and row[4] <= date for row in rows
+        ])
+        self.assertEqual(
+            DeprecationBatch([None], [0], [None], [False]).is_liquidated(date),
+            [False],
+        )
+
+    def test_columns_of_different_lengths(self):
+        with self.assertRaises(ValueError):
+            DeprecationBatch([None, None], [0], [None], [False])
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from django.test import TestCase
+
+from ralph.business.models import Department, Venture
+from ralph.discovery.models_device import Device
+from ralph.discovery.tests.util import DeviceFactory
+from ralph_assets.device_links import (
+    devices_without_asset,
+    linked_devices_query,
+)
+from ralph_assets.models_assets import Asset
+from ralph_assets.tests.utils import CaptureQueries
+from ralph_assets.tests.utils.assets import DCAssetFactory
+
+
+class TestDeviceLinks(TestCase):
+    def setUp(self):
+        self.department = Department.objects.create(name='Department')
+        self.venture = Venture.objects.create(
+            name='Venture', symbol='venture', department=self.department,
+        )
+        self.linked = self._link(DeviceFactory(venture=self.venture))
+        self.other = self._link(DeviceFactory())
+        self.unlinked_device = DeviceFactory(venture=self.venture)
+
+    def _link(self, device):
+        asset = DCAssetFactory()
+        asset.device_info.ralph_device_id = device.id
+        asset.device_info.save()
+        return asset
+
+    def _search(self):
+        return Asset.objects.filter(linked_devices_query(
+            Device.objects.filter(venture__department_id=self.department.id),
+        ))
+
+    def test_linked_devices_query(self):
+        self.assertEqual(list(self._search()), [self.linked])
+
+    def test_cost_doesnt_depend_on_devices_count(self):
+        with CaptureQueries() as captured:
+            list(self._search())
+        sql = unicode(self._search().query)
+        for _ in range(50):
+            self._link(DeviceFactory(venture=self.venture))
+        with CaptureQueries() as more_captured:
+            self.assertEqual(self._search().count(), 51)
+        self.assertEqual(len(captured), 1)
+        self.assertEqual(len(more_captured), 1)
+        self.assertEqual(unicode(self._search().query), sql)
+
+    def test_devices_without_asset(self):
+        deleted = self._link(DeviceFactory())
+        deleted.device_info.deleted = True
+        deleted.device_info.save()
+        devices = devices_without_asset()
+        self.assertIn(self.unlinked_device, devices)
+        self.assertIn(
+            Device.objects.get(id=deleted.device_info.ralph_device_id),
+            devices,
+        )
+        self.assertNotIn(
+            Device.objects.get(id=self.linked.device_info.ralph_device_id),
+            devices,
+        )
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import cStringIO
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.files.storage import FileSystemStorage
+from django.http import Http404
+from django.test import TestCase
+from django.test.client import RequestFactory
+
+from ralph_assets.models import Asset, OfficeInfo
+from ralph_assets.tests.utils import CaptureQueries
+from ralph_assets.tests.utils.assets import DCAssetFactory
+from ralph_assets.utils import iter_chunks
+from ralph_assets.views.export import (
+    AssetCsvExporter,
+    make_csv_file_response,
+)
+from ralph_assets.views.search import AssetSearchDataTable
+
+
+class TestAssetCsvExporter(TestCase):
+    def setUp(self):
+        self.assets = [DCAssetFactory() for _ in range(7)]
+        view = AssetSearchDataTable()
+        view.request = RequestFactory().get('/')
+        view.set_mode('dc')
+        self.exporter = AssetCsvExporter(view, 'office_info', OfficeInfo)
+        self.exporter.chunk_size = 3
+        self.location = tempfile.mkdtemp()
+        self.storage = FileSystemStorage(location=self.location)
+
+    def tearDown(self):
+        shutil.rmtree(self.location)
+
+    def test_iter_chunks(self):
+        chunks = list(iter_chunks(Asset.objects.all(), 3))
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 1])
+        self.assertEqual(
+            [asset.pk for chunk in chunks for asset in chunk],
+            sorted(asset.pk for asset in self.assets),
+        )
+
+    def test_rows(self):
+        rows = list(self.exporter.iter_rows(Asset.objects.all()))
+        self.assertEqual(rows[0][0], 'type')
+        self.assertEqual(len(rows), 1 + len(self.assets))
+        self.assertTrue(all(row[0] == 'device' for row in rows[1:]))
+        header = rows[0]
+        barcodes = [row[header.index('Barcode')] for row in rows[1:]]
+        self.assertEqual(
+            barcodes,
+            [asset.barcode for asset in sorted(
+                self.assets, key=lambda asset: asset.pk,
+            )],
+        )
+
+    def test_queries_per_chunk_are_constant(self):
+        with CaptureQueries() as captured:
+            list(self.exporter.iter_rows(Asset.objects.all()))
+        # count + 3 chunks (assets and devices) + empty chunk
+        self.assertLessEqual(len(captured), 1 + 3 * 2 + 1)
+
+    def test_save(self):
+        name = self.exporter.save(Asset.objects.all(), self.storage)
+        with self.storage.open(name) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 1 + len(self.assets))
+
+    def test_response_can_be_repeated(self):
+        name = self.exporter.save(Asset.objects.all(), self.storage)
+        contents = [
+            b''.join(make_csv_file_response(name, 'ralph.csv', self.storage))
+            for _ in range(2)
+        ]
+        with self.storage.open(name) as f:
+            self.assertEqual(contents[0], f.read())
+        self.assertEqual(contents[0], contents[1])
+
+    def test_expired_exports_are_removed(self):
+        old = self.exporter.save(Asset.objects.none(), self.storage)
+        old_time = time.time() - 2 * 24 * 3600
+        os.utime(self.storage.path(old), (old_time, old_time))
+        new = self.exporter.save(Asset.objects.none(), self.storage)
+        self.assertFalse(self.storage.exists(old))
+        self.assertTrue(self.storage.exists(new))
+        with self.assertRaises(Http404):
+            make_csv_file_response(old, 'ralph.csv', self.storage)
+
+    def test_write(self):
+        f = cStringIO.StringIO()
+        self.exporter.write(Asset.objects.none(), f)
+        self.assertTrue(f.getvalue().startswith(b'type;'))
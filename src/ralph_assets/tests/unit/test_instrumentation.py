@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import mock
+from django.db import connection
+from django.http import HttpResponse, QueryDict
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+
+from ralph_assets.instrumentation import (
+    BudgetExceeded,
+    InstrumentationMiddleware,
+    Section,
+    get_backend,
+    get_stats,
+    instrumented,
+    reset_stats,
+)
+from ralph_assets.models_assets import Asset
+from ralph_assets.models_instrumentation import (
+    SlowQuery,
+    explain,
+    save_slow_queries,
+)
+from ralph_assets.tests.utils.assets import DCAssetFactory
+from ralph_assets.views.device import EditDevice
+
+
+def _settings(**config):
+    config.setdefault('ENABLE', True)
+    config.setdefault('CACHE', 'instrumentation')
+    return {
+        'ASSETS_INSTRUMENTATION': config,
+        'CACHES': {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+            },
+            'instrumentation': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'ralph-assets-instrumentation-tests',
+            },
+        },
+    }
+
+
+@override_settings(**_settings())
+class TestSection(TestCase):
+    def setUp(self):
+        get_backend().clear()
+        DCAssetFactory()
+        DCAssetFactory()
+
+    def test_counts_queries_and_rows(self):
+        with Section('assets') as section:
+            list(Asset.objects.all())
+            Asset.objects.count()
+        self.assertEqual(section.queries, 2)
+        self.assertGreaterEqual(section.time, section.db_time)
+        self.assertEqual(section.python_time, section.time - section.db_time)
+
+    def test_nested_sections(self):
+        with Section('outer') as outer:
+            Asset.objects.count()
+            with Section('inner') as inner:
+                Asset.objects.count()
+        self.assertEqual(outer.queries, 2)
+        self.assertEqual(inner.queries, 1)
+
+    def test_stats_are_summed_up(self):
+        count = instrumented('count')(Asset.objects.count)
+        count()
+        count()
+        stats = get_stats()['count']
+        self.assertEqual(stats['calls'], 2)
+        self.assertEqual(stats['queries'], 2)
+        self.assertEqual(stats['max_queries'], 1)
+        reset_stats()
+        self.assertEqual(get_stats(), {})
+
+    def test_queries_are_not_logged_without_debug(self):
+        logged = len(connection.queries)
+        with Section('assets'):
+            Asset.objects.count()
+        self.assertEqual(len(connection.queries), logged)
+
+    @override_settings(**_settings(ENABLE=False))
+    def test_disabled(self):
+        with Section('assets') as section:
+            Asset.objects.count()
+        self.assertEqual(section.queries, 0)
+        self.assertEqual(get_stats(), {})
+
+
+class TestBudget(TestCase):
+    @override_settings(**_settings(
+        ENABLE=False, RAISE=True, BUDGETS={'assets': {'queries': 1}},
+    ))
+    def test_exceeded_budget_raises(self):
+        with self.assertRaises(BudgetExceeded):
+            with Section('assets'):
+                Asset.objects.count()
+                Asset.objects.count()
+        with Section('assets'):
+            Asset.objects.count()
+
+    @override_settings(**_settings(BUDGETS={'assets': {'queries': 0}}))
+    @mock.patch('ralph_assets.instrumentation.logger')
+    def test_exceeded_budget_is_logged(self, logger):
+        with Section('assets'):
+            Asset.objects.count()
+        self.assertEqual(logger.warning.call_count, 1)
+
+
+@override_settings(**_settings())
+class TestInstrumentationMiddleware(TestCase):
+    def setUp(self):
+        get_backend().clear()
+        self.middleware = InstrumentationMiddleware()
+        self.request = RequestFactory().get('/')
+
+    def test_view_is_measured(self):
+        view = EditDevice.as_view()
+        self.middleware.process_view(self.request, view, (), {})
+        Asset.objects.count()
+        self.middleware.process_response(self.request, HttpResponse())
+        stats = get_stats()['ralph_assets.views.device.EditDevice']
+        self.assertEqual(stats['queries'], 1)
+
+    def test_other_views_are_skipped(self):
+        self.middleware.process_view(self.request, HttpResponse, (), {})
+        self.middleware.process_response(self.request, HttpResponse())
+        self.assertEqual(get_stats(), {})
+
+
+@override_settings(
+    ASSETS_SLOW_QUERIES={'ENABLE': True, 'THRESHOLD': 0, 'MAX_RECORDS': 3},
+    **_settings(ENABLE=False)
+)
+class TestSlowQueries(TestCase):
+    def test_query_is_captured_with_plan(self):
+        params = QueryDict('barcode=abc&status=&sort=sn&page=2')
+        with Section('search', params=params):
+            Asset.objects.filter(barcode='abc').count()
+        # the test runs in a transaction, queries wait for its end
+        self.assertFalse(SlowQuery.objects.exists())
+        save_slow_queries()
+        query = SlowQuery.objects.get()
+        self.assertEqual(query.source, 'search')
+        self.assertEqual(query.filters, 'barcode')
+        self.assertEqual(query.params, 'barcode=abc&page=2&sort=sn')
+        self.assertIn('abc', query.sql)
+        self.assertNotEqual(query.explain, '')
+
+    def test_queries_outside_sections_are_skipped(self):
+        Asset.objects.count()
+        save_slow_queries()
+        self.assertFalse(SlowQuery.objects.exists())
+
+    def test_number_of_queries_is_limited(self):
+        with Section('assets'):
+            for _ in xrange(5):
+                Asset.objects.count()
+        save_slow_queries()
+        self.assertEqual(SlowQuery.objects.count(), 3)
+
+    def test_failed_explain_is_skipped(self):
+        self.assertEqual(
+            explain(connection, 'SELECT * FROM missing_table', ()), '',
+        )
+        # the transaction is still usable
+        self.assertEqual(Asset.objects.count(), 0)
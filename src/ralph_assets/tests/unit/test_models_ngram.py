@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from django.test import TestCase
+from django.test.utils import override_settings
+from mock import patch
+
+from ralph_assets.models_assets import Asset
+from ralph_assets.models_ngram import (
+    FUZZY_FIELD,
+    UNINDEXED_NGRAM,
+    AssetNgram,
+    find_similar_assets,
+    get_fuzzy_text,
+    get_ngrams,
+    get_search_ngrams,
+    normalize,
+    normalize_search_text,
+    rebuild_asset_ngrams,
+    rebuild_model_ngrams,
+    similarity,
+)
+from ralph_assets.tests.utils.assets import (
+    AssetModelFactory,
+    DCAssetFactory,
+)
+
+
+class TestNgrams(TestCase):
+    def test_get_ngrams(self):
+        self.assertEqual(get_ngrams('abcd'), {'abc', 'bcd'})
+        self.assertEqual(get_ngrams('ab'), {'ab'})
+        self.assertEqual(get_ngrams(''), set())
+
+    def test_normalize(self):
+        self.assertEqual(normalize('Ab C'), 'abc')
+
+    def test_normalize_search_text(self):
+        self.assertEqual(normalize_search_text('Café CRÈME'), 'cafe creme')
+        self.assertEqual(normalize_search_text(None), '')
+
+    def test_search_ngrams(self):
+        self.assertEqual(get_search_ngrams('Żaba'), {'zab', 'aba'})
+        self.assertEqual(get_search_ngrams('Straße'), {UNINDEXED_NGRAM})
+        self.assertEqual(get_search_ngrams('Żółw'), {UNINDEXED_NGRAM})
+        self.assertEqual(get_search_ngrams(''), set())
+
+    @override_settings(ASSETS_NGRAM_INDEX=False)
+    def test_not_indexed_when_disabled(self):
+        model = AssetModelFactory(name='PowerEdge R620')
+        asset = DCAssetFactory(sn='SN-ALPHA-001', model=model)
+        with patch('ralph_assets.models_ngram.django_rq') as django_rq:
+            model.name = 'Blade'
+            model.save()
+        self.assertFalse(django_rq.get_queue.called)
+        self.assertFalse(AssetNgram.objects.filter(asset=asset).exists())
+
+
+@override_settings(ASSETS_NGRAM_INDEX=True)
+class TestAssetNgramIndex(TestCase):
+    def setUp(self):
+        self.model = AssetModelFactory(name='PowerEdge R620')
+        self.assets = [
+            DCAssetFactory(sn=sn, barcode=barcode, model=self.model)
+            for sn, barcode in [
+                ('SN-ALPHA-001', 'BC-1001'),
+                ('SN-ALPHA-002', 'BC-1002'),
+                ('SN-BETA-003', 'BC-2003'),
+                ('XYZ-777', 'QQ-9'),
+                ('sn alpha 010', 'BC-1010'),
+            ]
+        ]
+
+    def _indexed(self, asset):
+        return set(
+            AssetNgram.objects.filter(
+                asset=asset, field=FUZZY_FIELD,
+            ).values_list('ngram', flat=True)
+        )
+
+    def _brute_force(self, query):
+        query = normalize(query)
+        return sorted(
+            Asset.objects.select_related('model'),
+            key=lambda asset: -similarity(get_fuzzy_text(asset), query),
+        )
+
+    def test_index_follows_asset_save(self):
+        asset = self.assets[0]
+        self.assertEqual(
+            self._indexed(asset), get_ngrams(get_fuzzy_text(asset)),
+        )
+        asset.sn = 'CHANGED'
+        asset.save()
+        self.assertIn('cha', self._indexed(asset))
+        self.assertNotIn('alp', self._indexed(asset))
+
+    def test_index_follows_model_rename(self):
+        with patch('ralph_assets.models_ngram.django_rq') as django_rq:
+            self.model.save()
+            self.assertFalse(django_rq.get_queue.called)
+            self.model.name = 'Blade'
+            self.model.save()
+        django_rq.get_queue.return_value.enqueue.assert_called_once_with(
+            rebuild_model_ngrams, self.model.id,
+        )
+        self.assertIn('pow', self._indexed(self.assets[0]))
+        rebuild_model_ngrams(self.model.id)
+        self.assertIn('lad', self._indexed(self.assets[0]))
+        self.assertNotIn('pow', self._indexed(self.assets[0]))
+
+    def test_rebuild(self):
+        AssetNgram.objects.all().delete()
+        rebuild_asset_ngrams(chunk_size=2)
+        for asset in self.assets:
+            self.assertEqual(
+                self._indexed(asset), get_ngrams(get_fuzzy_text(asset)),
+            )
+
+    def test_same_ranking_as_difflib(self):
+        for query in ['SN-ALPHA-00', 'alpha 01', 'BC 2003', 'poweredge']:
+            result = find_similar_assets(query, Asset.objects.all(), limit=3)
+            expected = self._brute_force(query)[:3]
+            self.assertEqual(
+                [similarity(get_fuzzy_text(a), normalize(query))
+                 for a in result],
+                [similarity(get_fuzzy_text(a), normalize(query))
+                 for a in expected],
+            )
+
+    def test_same_results_as_difflib_without_common_ngrams(self):
+        limit = len(self.assets)
+        for query in ['z', 'qx', 'SN-AHLPA-01O', 'Żółw 777', 'ąę']:
+            result = find_similar_assets(query, Asset.objects.all(), limit)
+            expected = self._brute_force(query)[:limit]
+            self.assertEqual(len(result), limit)
+            self.assertEqual(
+                [similarity(get_fuzzy_text(a), normalize(query))
+                 for a in result],
+                [similarity(get_fuzzy_text(a), normalize(query))
+                 for a in expected],
+            )
+
+    def test_best_match_first(self):
+        result = find_similar_assets(
+            'SN-BETA-003BC-2003', Asset.objects.all(),
+        )
+        self.assertEqual(result[0], self.assets[2])
+
+    def test_queryset_limits_results(self):
+        result = find_similar_assets(
+            'alpha', Asset.objects.exclude(id=self.assets[0].id),
+        )
+        self.assertNotIn(self.assets[0], result)
+        self.assertIn(self.assets[1], result)
+
+    def test_search_fields_are_indexed(self):
+        asset = self.assets[3]
+        self.assertIn(
+            ('sn', 'xyz'),
+            set(AssetNgram.objects.filter(asset=asset).values_list(
+                'field', 'ngram',
+            )),
+        )
+
+    def test_short_query(self):
+        result = find_similar_assets('q', Asset.objects.all())
+        self.assertIn(self.assets[3], result)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import datetime
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+
+from ralph_assets.history.models import History
+from ralph_assets.models_assets import Asset
+from ralph_assets.views.pagination import (
+    CURSOR_NEXT,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    get_seek_field,
+    paginate_keyset,
+    seek_query,
+)
+
+
+class TestCursor(TestCase):
+    def test_round_trip(self):
+        token = encode_cursor('-barcode', CURSOR_NEXT, 'ąę"&?', 12)
+        self.assertEqual(
+            decode_cursor(token), ('-barcode', CURSOR_NEXT, 'ąę"&?', 12),
+        )
+
+    def test_token_is_url_safe(self):
+        token = encode_cursor('name', CURSOR_NEXT, '???>>>', 1)
+        self.assertRegexpMatches(token, r'^[A-Za-z0-9_-]+$')
+
+    def test_dates_are_serialized(self):
+        token = encode_cursor(
+            'invoice_date', CURSOR_NEXT, datetime.date(2014, 5, 1), 1,
+        )
+        self.assertEqual(decode_cursor(token)[2], '2014-05-01')
+
+    def test_datetimes_keep_microseconds(self):
+        token = encode_cursor(
+            'date', CURSOR_NEXT,
+            datetime.datetime(2014, 5, 1, 10, 20, 30, 123456), 1,
+        )
+        self.assertEqual(
+            decode_cursor(token)[2], '2014-05-01T10:20:30.123456',
+        )
+
+    def test_invalid_tokens(self):
+        for token in ('', 'garbage!', encode_cursor('a', 'x', 1, 1)):
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(token)
+
+    def test_seek_field(self):
+        self.assertEqual(get_seek_field(Asset, 'barcode'), 'barcode')
+        self.assertEqual(
+            get_seek_field(Asset, 'model__category'), 'model__category__pk',
+        )
+        self.assertEqual(
+            get_seek_field(Asset, 'model__manufacturer__name'),
+            'model__manufacturer__name',
+        )
+
+
+class TestPaginateKeyset(TestCase):
+    def setUp(self):
+        content_type = ContentType.objects.get_for_model(Asset)
+        date = datetime.datetime(2014, 5, 1, 10, 20, 30, 123456)
+        # pairs of changes made at the same time
+        self.history = [
+            History.objects.create(
+                content_type=content_type, object_id=1, field_name='sn',
+                date=date + datetime.timedelta(microseconds=i // 2),
+            ) for i in range(7)
+        ]
+        self.queryset = History.objects.filter(object_id=1)
+
+    def test_walks_all_rows_newest_first(self):
+        ids = []
+        token = None
+        while True:
+            page = paginate_keyset(self.queryset, '-date', token, 3)
+            ids.extend(history.id for history in page)
+            if not page.has_next():
+                break
+            token = page.next_cursor
+        self.assertEqual(
+            ids,
+            [history.id for history in sorted(
+                self.history, key=lambda h: (h.date, h.id), reverse=True,
+            )],
+        )
+
+    def test_previous_page(self):
+        first = paginate_keyset(self.queryset, '-date', None, 3)
+        second = paginate_keyset(self.queryset, '-date', first.next_cursor, 3)
+        previous = paginate_keyset(
+            self.queryset, '-date', second.previous_cursor, 3,
+        )
+        self.assertEqual(list(previous), list(first))
+        self.assertFalse(previous.has_previous())
+
+    def test_seek_query_places_nulls_like_database(self):
+        users = [
+            User.objects.create(username='user-{}'.format(i)) for i in range(2)
+        ]
+        for i, history in enumerate(self.history):
+            history.user = (users + [None])[i % 3]
+            history.save()
+        for nulls_highest in (False, True):
+            null_value = float('inf') if nulls_highest else float('-inf')
+            for descending in (False, True):
+                rows = sorted(
+                    self.history, reverse=descending,
+                    key=lambda h: (
+                        h.user_id if h.user_id is not None else null_value,
+                        h.id,
+                    ),
+                )
+                for i, history in enumerate(rows):
+                    after = self.queryset.filter(seek_query(
+                        'user', history.user_id, history.pk, descending,
+                        nulls_highest,
+                    ))
+                    self.assertEqual(
+                        set(after.values_list('id', flat=True)),
+                        set(h.id for h in rows[i + 1:]),
+                    )
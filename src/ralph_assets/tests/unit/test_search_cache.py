@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from django.test import TestCase
+from django.test.utils import override_settings
+from mock import patch
+
+from ralph_assets.models_assets import Asset
+from ralph_assets.search_cache import (
+    SearchResultCache,
+    _generation_key,
+    get_backend,
+    get_generations,
+)
+from ralph_assets.tests.utils.assets import DCAssetFactory
+
+
+SEARCH_CACHE_SETTINGS = {
+    'ASSETS_SEARCH_CACHE': {'ENABLE': True, 'CACHE': 'search'},
+    'CACHES': {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        },
+        'search': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'ralph-assets-search-tests',
+        },
+    },
+}
+
+
+@override_settings(**SEARCH_CACHE_SETTINGS)
+class TestSearchResultCache(TestCase):
+    def setUp(self):
+        get_backend().clear()
+
+    def test_save_bumps_generation(self):
+        before = get_generations()
+        asset = DCAssetFactory()
+        after_create = get_generations()
+        self.assertNotEqual(before, after_create)
+        asset.save()
+        self.assertNotEqual(after_create, get_generations())
+
+    def test_disabled_cache_is_not_touched(self):
+        with override_settings(ASSETS_SEARCH_CACHE={'ENABLE': False}):
+            with patch('ralph_assets.search_cache.get_backend') as backend:
+                DCAssetFactory().save()
+        self.assertFalse(backend.called)
+
+    def test_lost_generation_is_not_reused(self):
+        generations = get_generations()
+        get_backend().delete(_generation_key(Asset))
+        self.assertGreater(get_generations()[0], generations[0])
+
+    def test_entries_are_invalidated(self):
+        cache = SearchResultCache('dc', 'key')
+        self.assertEqual(cache.get_or_set(('count',), lambda: 1), 1)
+        self.assertEqual(
+            SearchResultCache('dc', 'key').get_or_set(('count',), lambda: 2),
+            1,
+        )
+        DCAssetFactory()
+        self.assertEqual(
+            SearchResultCache('dc', 'key').get_or_set(('count',), lambda: 3),
+            3,
+        )
+
+    def test_searches_are_separated(self):
+        SearchResultCache('dc', 'key').get_or_set(('count',), lambda: 1)
+        self.assertEqual(
+            SearchResultCache('bo', 'key').get_or_set(('count',), lambda: 2),
+            2,
+        )
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import datetime
+
+from django.http import QueryDict
+from django.test import TestCase
+from django.test.utils import override_settings
+from mock import patch
+
+from ralph_assets.models_assets import Asset
+from ralph_assets.models_ngram import rebuild_asset_ngrams
+from ralph_assets.models_search import (
+    BATCH_TTL,
+    SearchIdentifier,
+    remove_expired_batches,
+    stage_identifiers,
+)
+from ralph_assets.search_planner import asset_search_planner
+from ralph_assets.models_dc_assets import DeviceInfo
+from ralph_assets.tests.utils.assets import (
+    DCAssetFactory,
+    DataCenterFactory,
+    RackFactory,
+    ServerRoomFactory,
+)
+from ralph_assets.tests.utils.supports import DCSupportFactory
+
+
+class TestSearchPlanner(TestCase):
+    def _plan(self, query_string):
+        return asset_search_planner.plan(QueryDict(query_string))
+
+    def _search(self, query_string):
+        return Asset.objects.filter(self._plan(query_string).query)
+
+    def test_empty_plan(self):
+        plan = self._plan('')
+        self.assertTrue(plan.is_empty)
+        self.assertEqual(plan.joins, frozenset())
+
+    def test_unknown_params_are_ignored(self):
+        self.assertTrue(self._plan('page=2&sort=-sn').is_empty)
+
+    def test_key_ignores_params_order(self):
+        self.assertEqual(
+            self._plan('sn=abc&status=1').key,
+            self._plan('status=1&sn=abc').key,
+        )
+
+    def test_key_ignores_multi_values_order(self):
+        self.assertEqual(
+            self._plan('sn=abc;def').key,
+            self._plan('sn=def| abc ;').key,
+        )
+
+    def test_key_differs_for_exact_match(self):
+        self.assertNotEqual(
+            self._plan('sn=abc').key,
+            self._plan('sn="abc"').key,
+        )
+
+    def test_joins(self):
+        self.assertEqual(
+            self._plan('sn=abc&warehouse=1&owner=2').joins, frozenset(),
+        )
+        self.assertEqual(
+            self._plan('manufacturer=abc&imei=123').joins,
+            frozenset(['model', 'model__manufacturer', 'office_info']),
+        )
+
+    def test_distinct_only_for_multi_valued_joins(self):
+        self.assertFalse(self._plan('manufacturer=abc&imei=123').distinct)
+        self.assertFalse(self._plan('location_name=abc').distinct)
+        plan = self._plan('support_assigned=any')
+        self.assertTrue(plan.distinct)
+        asset = DCAssetFactory()
+        for _ in range(2):
+            DCSupportFactory().assets.add(asset)
+        self.assertEqual(
+            list(Asset.objects.filter(plan.query).distinct()), [asset],
+        )
+
+    def test_lookups(self):
+        first = DCAssetFactory(sn='sn-abc', barcode='BC-1')
+        second = DCAssetFactory(sn='sn-def', barcode='BC-2')
+        self.assertEqual(list(self._search('sn=SN-ABC')), [first])
+        self.assertEqual(list(self._search('sn="sn-ab"')), [])
+        self.assertEqual(
+            set(self._search('barcode=BC-1;BC-2')), set([first, second]),
+        )
+        self.assertEqual(list(self._search('barcode=BC-2&sn=abc')), [])
+
+
+class TestLocationNameSearch(TestCase):
+    def setUp(self):
+        self.data_center = DataCenterFactory(name='North')
+        self.server_room = ServerRoomFactory(
+            name='Room 1', data_center=self.data_center,
+        )
+        self.rack = RackFactory(
+            name='North/1', data_center=self.data_center,
+            server_room=self.server_room,
+        )
+        self.other_data_center = DataCenterFactory(name='South')
+        self.other_server_room = ServerRoomFactory(
+            name='Room 2', data_center=self.other_data_center,
+        )
+        # located only through the rack
+        self.in_rack = self._asset(rack=self.rack)
+        # located without rack
+        self.in_room = self._asset(
+            data_center=self.other_data_center,
+            server_room=self.other_server_room,
+        )
+        # data center of the device info differs from the rack's one
+        self.overridden = self._asset(
+            rack=self.rack, data_center=self.other_data_center,
+        )
+
+    def _asset(self, **location):
+        asset = DCAssetFactory()
+        fields = {'rack': None, 'data_center': None, 'server_room': None}
+        fields.update(location)
+        DeviceInfo.objects.filter(pk=asset.device_info_id).update(**fields)
+        return asset
+
+    def _search(self, name):
+        query = QueryDict('', mutable=True)
+        query['location_name'] = name
+        plan = asset_search_planner.plan(query)
+        return set(Asset.objects.filter(plan.query))
+
+    def test_rack_name(self):
+        self.assertEqual(
+            self._search('North/1'), set([self.in_rack, self.overridden]),
+        )
+
+    def test_server_room_of_device_info_or_rack(self):
+        self.assertEqual(
+            self._search('Room 1'), set([self.in_rack, self.overridden]),
+        )
+        self.assertEqual(self._search('Room 2'), set([self.in_room]))
+
+    def test_data_center_of_device_info_or_rack(self):
+        self.assertEqual(
+            self._search('North'), set([self.in_rack, self.overridden]),
+        )
+        self.assertEqual(
+            self._search('South'), set([self.in_room, self.overridden]),
+        )
+
+    def test_exact_name(self):
+        self.assertEqual(self._search('1'), set())
+        self.assertEqual(self._search('Room'), set())
+        self.assertEqual(self._search('Nowhere'), set())
+
+
+class TestIndexedSubstringSearch(TestCase):
+    def setUp(self):
+        self.assets = [
+            DCAssetFactory(
+                sn='SN-{}'.format(i), remarks='Rack {} - moved'.format(i),
+                provider='Provider {}'.format(i % 2),
+            ) for i in range(100, 104)
+        ]
+        # the index isn't maintained on save while it's disabled
+        rebuild_asset_ngrams()
+
+    def _search(self, query_string):
+        plan = asset_search_planner.plan(QueryDict(query_string))
+        return Asset.objects.filter(plan.query)
+
+    def test_same_results_with_index(self):
+        queries = [
+            'sn=n-10', 'sn=101', 'remarks=RACK 102', 'remarks=moved',
+            'provider=vider 1', 'remarks=ra', 'sn=missing', 'niw=xyz',
+        ]
+        for query in queries:
+            with override_settings(ASSETS_NGRAM_INDEX=False):
+                expected = set(self._search(query))
+            with override_settings(ASSETS_NGRAM_INDEX=True):
+                result = set(self._search(query))
+            self.assertEqual(result, expected, query)
+
+    def test_same_results_for_non_ascii_values(self):
+        for sn, remarks in [
+            ('ÉCLAIR-1', 'Café crème'),
+            ('Zażółć-2', 'Gęślą jaźń'),
+            ('STRAẞE-3', 'Straße 12'),
+        ]:
+            DCAssetFactory(sn=sn, remarks=remarks)
+        rebuild_asset_ngrams()
+        queries = [
+            'sn=éclair', 'sn=ECLAIR', 'sn=żółć', 'sn=zazolc', 'sn=ŻÓŁĆ',
+            'remarks=cafe', 'remarks=CAFÉ CR', 'remarks=gęśl', 'remarks=jazn',
+            'remarks=straße', 'remarks=strasse', 'sn=straẞe', 'remarks=é c',
+        ]
+        for query in queries:
+            with override_settings(ASSETS_NGRAM_INDEX=False):
+                expected = set(self._search(query))
+            with override_settings(ASSETS_NGRAM_INDEX=True):
+                result = set(self._search(query))
+            self.assertEqual(result, expected, query)
+
+    @override_settings(ASSETS_NGRAM_INDEX=True)
+    def test_index_is_used(self):
+        sql = unicode(self._search('remarks=moved').query)
+        self.assertIn('assetngram', sql)
+        # trigrams are joined in one subquery, the other one picks not
+        # indexable values
+        self.assertEqual(sql.count('SELECT'), 3)
+        self.assertEqual(set(self._search('remarks=moved')), set(self.assets))
+
+    @override_settings(ASSETS_NGRAM_INDEX=True)
+    def test_index_follows_changes(self):
+        asset = self.assets[0]
+        asset.remarks = 'Broken'
+        asset.save()
+        self.assertEqual(list(self._search('remarks=broke')), [asset])
+        self.assertNotIn(asset, self._search('remarks=moved'))
+
+
+@override_settings(ASSETS_BULK_SEARCH_THRESHOLD=100)
+class TestBulkIdentifierSearch(TestCase):
+    def setUp(self):
+        self.assets = [
+            DCAssetFactory(barcode='BULK-{}'.format(i)) for i in range(3)
+        ]
+        self.barcodes = ['BULK-{}'.format(i) for i in range(10000)]
+
+    def _plan(self, query_string, stage=True):
+        return asset_search_planner.plan(QueryDict(query_string), stage)
+
+    def test_short_list_is_not_staged(self):
+        plan = self._plan('barcode=BULK-0;BULK-1')
+        self.assertEqual(plan.staged, ())
+        self.assertEqual(SearchIdentifier.objects.count(), 0)
+
+    def test_long_list_is_staged(self):
+        plan = self._plan('barcode=' + '|'.join(self.barcodes))
+        self.assertEqual(len(plan.staged), 1)
+        self.assertEqual(plan.staged[0].count, 10000)
+        queryset = Asset.objects.filter(plan.query)
+        self.assertEqual(set(queryset), set(self.assets))
+        # the identifiers are joined, not inlined into the query
+        self.assertLess(len(unicode(queryset.query)), 2000)
+        unmatched = plan.staged[0].unmatched(queryset)
+        self.assertEqual(len(unmatched), 9997)
+        self.assertNotIn('BULK-0', unmatched)
+
+    def test_batch_is_reused(self):
+        self._plan('barcode=' + ';'.join(self.barcodes))
+        self._plan('barcode=' + '|'.join(reversed(self.barcodes)))
+        self.assertEqual(SearchIdentifier.objects.count(), 10000)
+
+    def test_ids_are_staged(self):
+        missing = range(10 ** 6, 10 ** 6 + 200)
+        ids = [asset.id for asset in self.assets] + missing
+        plan = self._plan('id=' + ','.join(str(id) for id in ids))
+        self.assertEqual(len(plan.staged), 1)
+        queryset = Asset.objects.filter(plan.query)
+        self.assertEqual(set(queryset), set(self.assets))
+        self.assertEqual(len(plan.staged[0].unmatched(queryset)), 200)
+
+    def test_values_are_split_by_semicolons_and_pipes_only(self):
+        self.assertEqual(
+            self._plan('barcode=BULK-0;BULK-1|BULK-2').terms,
+            [('barcode', 'multi', ['BULK-0', 'BULK-1', 'BULK-2'])],
+        )
+        self.assertEqual(
+            self._plan('barcode=BULK-0%0ABULK-1').terms,
+            [('barcode', 'value', 'BULK-0\nBULK-1')],
+        )
+
+    def test_expired_batches_are_removed_by_command_only(self):
+        self._plan('barcode=' + ';'.join(self.barcodes))
+        SearchIdentifier.objects.update(
+            created=datetime.datetime.now() - BATCH_TTL * 2,
+        )
+        self._plan('barcode=' + ';'.join(self.barcodes[:5000]))
+        self.assertEqual(SearchIdentifier.objects.count(), 15000)
+        self.assertEqual(remove_expired_batches(), 10000)
+        self.assertEqual(SearchIdentifier.objects.count(), 5000)
+
+    def test_too_long_values_are_not_staged(self):
+        too_long = 'X' * 300
+        barcodes = self.barcodes[:200] + [too_long]
+        plan = self._plan('barcode=' + ';'.join(barcodes))
+        self.assertEqual(plan.staged[0].count, 201)
+        self.assertEqual(SearchIdentifier.objects.count(), 200)
+        queryset = Asset.objects.filter(plan.query)
+        self.assertEqual(set(queryset), set(self.assets))
+        unmatched = plan.staged[0].unmatched(queryset)
+        self.assertEqual(len(unmatched), 198)
+        self.assertIn(too_long, unmatched)
+
+    def test_ids_out_of_range_are_not_staged(self):
+        ids = [asset.id for asset in self.assets] + range(
+            2 ** 31, 2 ** 31 + 200,
+        )
+        plan = self._plan('id=' + ','.join(str(id) for id in ids))
+        queryset = Asset.objects.filter(plan.query)
+        self.assertEqual(set(queryset), set(self.assets))
+        self.assertEqual(SearchIdentifier.objects.count(), 3)
+        self.assertEqual(len(plan.staged[0].unmatched(queryset)), 200)
+
+    def test_plan_without_staging_writes_nothing(self):
+        query_string = 'barcode=' + ';'.join(self.barcodes[:150])
+        plan = self._plan(query_string, stage=False)
+        self.assertEqual(plan.staged, ())
+        self.assertEqual(SearchIdentifier.objects.count(), 0)
+        self.assertEqual(
+            set(Asset.objects.filter(plan.query)), set(self.assets),
+        )
+        # the batch staged by the search is reused
+        self._plan(query_string)
+        plan = self._plan(query_string, stage=False)
+        self.assertEqual(len(plan.staged), 1)
+        self.assertEqual(
+            set(Asset.objects.filter(plan.query)), set(self.assets),
+        )
+
+    def test_batch_staged_concurrently_is_not_doubled(self):
+        values = self.barcodes[:300]
+        batch = stage_identifiers(values)
+        # another search didn't see the batch before inserting it
+        with patch(
+            'ralph_assets.models_search.SearchIdentifier.objects.filter',
+        ) as filter:
+            filter.return_value.update.return_value = 0
+            self.assertEqual(stage_identifiers(values), batch)
+        self.assertEqual(SearchIdentifier.objects.count(), 300)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from django.test import TestCase
+
+from ralph_assets.benchmarks import BenchmarkContext, run_benchmark
+from ralph_assets.history.models import History
+from ralph_assets.licences.models import LicenceAsset
+from ralph_assets.models_assets import Asset, AssetType
+from ralph_assets.tests.utils.assets import BOAssetFactory
+from ralph_assets.synthetic import (
+    HISTORY_PER_ASSET,
+    count_synthetic_assets,
+    generate_inventory,
+)
+
+
+class TestGenerateInventory(TestCase):
+    def test_generates_related_objects(self):
+        self.assertEqual(generate_inventory(30, chunk_size=20), 30)
+        assets = Asset.admin_objects.all()
+        self.assertEqual(assets.count(), 30)
+        for asset in assets.filter(type=AssetType.data_center.id):
+            self.assertIsNotNone(asset.device_info.rack_id)
+            self.assertIsNotNone(asset.linked_device)
+        self.assertEqual(LicenceAsset.objects.count(), 30)
+        self.assertEqual(History.objects.count(), 30 * HISTORY_PER_ASSET)
+
+    def test_adds_missing_assets(self):
+        generate_inventory(10)
+        self.assertEqual(generate_inventory(10), 0)
+        self.assertEqual(generate_inventory(25), 15)
+        self.assertEqual(count_synthetic_assets(), 25)
+        # explicit primary keys don't collide with later inserts
+        asset = BOAssetFactory()
+        self.assertGreater(asset.id, 25)
+
+
+class TestRunBenchmark(TestCase):
+    def test_measures(self):
+        generate_inventory(5)
+        context = BenchmarkContext()
+        measures = run_benchmark(
+            context, 'count', lambda context: Asset.objects.count(), 3,
+        )
+        self.assertEqual(measures['samples'], 3)
+        self.assertEqual(measures['queries'], 1)
+        self.assertGreaterEqual(measures['max_ms'], measures['median_ms'])
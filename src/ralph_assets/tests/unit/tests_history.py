@@ -5,9 +5,41 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from django.test import TestCase
+import json
+from datetime import datetime
 
-from ralph_assets.tests.utils.assets import DeviceInfoFactory
+from django.contrib.contenttypes.models import ContentType
+from django.core.urlresolvers import reverse
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import override_settings
+from mock import patch
+
+from ralph_assets.history.archive import archive_history
+from ralph_assets.history import queue
+from ralph_assets.history.models import (
+    ArchivedHistory,
+    History,
+    HistoryBuffer,
+    HistoryField,
+    get_m2m_snapshots,
+    history_transaction,
+)
+from ralph_assets.history.states import (
+    create_checkpoint,
+    create_checkpoints,
+    get_state_at,
+    get_states_at,
+)
+from ralph_assets.models_dc_assets import DeviceInfo
+from ralph_assets.models_support import Support
+from ralph_assets.tests.utils import CaptureQueries, ClientMixin
+from ralph_assets.tests.utils.assets import (
+    BOAssetFactory,
+    DeviceInfoFactory,
+    RackFactory,
+)
+from ralph_assets.tests.utils.supports import BOSupportFactory
 
 
 class HistoryTestCase(TestCase):
@@ -17,3 +49,449 @@ class HistoryTestCase(TestCase):
         device_info.position += 1
         device_info.save()
         self.assertEqual(old_length + 1, len(device_info.get_history()))
+
+
+class HistoryContextTestCase(TestCase):
+    def setUp(self):
+        self.device_info = DeviceInfo.objects.get(pk=DeviceInfoFactory().pk)
+
+    def _selects_of_device_info(self, captured):
+        return [
+            sql for sql in captured.queries
+            if sql.startswith('SELECT') and 'ralph_assets_deviceinfo' in sql
+        ]
+
+    def test_save_doesnt_refetch_object(self):
+        with CaptureQueries() as captured:
+            self.device_info.save()
+        self.assertEqual(self._selects_of_device_info(captured), [])
+        self.device_info.position += 1
+        with CaptureQueries() as captured:
+            self.device_info.save()
+        self.assertEqual(self._selects_of_device_info(captured), [])
+        self.assertEqual(len(self.device_info.get_history()), 1)
+
+    def test_state_is_picked_on_save(self):
+        with patch('ralph_assets.history.models.get_history_state') as state:
+            device_info = DeviceInfo.objects.get(pk=self.device_info.pk)
+        self.assertFalse(state.called)
+        device_info.position += 1
+        device_info.save()
+        self.assertEqual(
+            device_info.get_history(field_name='position')[0].new_value,
+            unicode(device_info.position),
+        )
+
+    def test_consecutive_saves(self):
+        position = self.device_info.position
+        for i in range(1, 3):
+            self.device_info.position = position + i
+            self.device_info.save()
+        history = self.device_info.get_history().filter(
+            field_name='position',
+        ).order_by('id')
+        self.assertEqual(
+            [(h.old_value, h.new_value) for h in history],
+            [
+                (unicode(position), unicode(position + 1)),
+                (unicode(position + 1), unicode(position + 2)),
+            ],
+        )
+
+    def test_related_field_labels(self):
+        old_rack = self.device_info.rack
+        new_rack = RackFactory()
+        self.device_info.rack = new_rack
+        self.device_info.save()
+        history = self.device_info.get_history(field_name='rack')[0]
+        self.assertEqual(history.old_value, str(old_rack))
+        self.assertEqual(history.new_value, str(new_rack))
+
+
+class HistoryBufferTestCase(TestCase):
+    def setUp(self):
+        self.devices_info = [
+            DeviceInfo.objects.get(pk=DeviceInfoFactory().pk)
+            for _ in range(3)
+        ]
+
+    def _change_positions(self):
+        for device_info in self.devices_info:
+            device_info.position += 1
+            device_info.save()
+
+    def _inserts_of_history(self, captured):
+        return [
+            sql for sql in captured.queries
+            if sql.startswith('INSERT') and 'ralph_assets_history' in sql
+        ]
+
+    def test_rows_are_inserted_on_exit(self):
+        with CaptureQueries() as captured:
+            with HistoryBuffer():
+                self._change_positions()
+                self.assertEqual(
+                    History.objects.filter(field_name='position').count(), 0,
+                )
+        self.assertEqual(len(self._inserts_of_history(captured)), 1)
+        self.assertEqual(
+            History.objects.filter(field_name='position').count(), 3,
+        )
+
+    def test_rows_are_discarded_on_exception(self):
+        with self.assertRaises(ValueError):
+            with HistoryBuffer():
+                self._change_positions()
+                raise ValueError()
+        self.assertEqual(
+            History.objects.filter(field_name='position').count(), 0,
+        )
+
+    def test_nested_buffer_joins_outer(self):
+        with HistoryBuffer():
+            with HistoryBuffer():
+                self._change_positions()
+            self.assertEqual(
+                History.objects.filter(field_name='position').count(), 0,
+            )
+        self.assertEqual(
+            History.objects.filter(field_name='position').count(), 3,
+        )
+
+
+class HistoryStatesTestCase(TestCase):
+    def setUp(self):
+        self.device_info = DeviceInfo.objects.get(pk=DeviceInfoFactory().pk)
+        self.position = self.device_info.position
+        for day in range(1, 4):
+            self._change_position(day, datetime(2014, 1, day))
+
+    def _change_position(self, change, date):
+        self.device_info.position = self.position + change
+        self.device_info.save()
+        History.objects.filter(
+            pk=self.device_info.get_history(field_name='position')[0].pk,
+        ).update(date=date)
+
+    def _position_at(self, date):
+        return get_state_at(self.device_info, date)['position']
+
+    def test_state_from_current_values(self):
+        self.assertEqual(
+            self._position_at(datetime(2013, 12, 31)), unicode(self.position),
+        )
+        self.assertEqual(
+            self._position_at(datetime(2014, 1, 2, 12)),
+            unicode(self.position + 2),
+        )
+        self.assertEqual(
+            self._position_at(datetime.now()), unicode(self.position + 3),
+        )
+
+    def test_state_from_checkpoints(self):
+        create_checkpoint(self.device_info, date=datetime(2014, 1, 5))
+        self._change_position(4, datetime(2014, 1, 10))
+        self.assertEqual(
+            self._position_at(datetime(2014, 1, 2, 12)),
+            unicode(self.position + 2),
+        )
+        self.assertEqual(
+            self._position_at(datetime(2014, 1, 6)),
+            unicode(self.position + 3),
+        )
+        self.assertEqual(
+            self._position_at(datetime(2014, 1, 11)),
+            unicode(self.position + 4),
+        )
+
+    def test_states_of_many_objects(self):
+        other = DeviceInfoFactory()
+        date = datetime(2014, 1, 2, 12)
+        states = dict(
+            (obj.pk, state['position']) for obj, state in get_states_at(
+                DeviceInfo.objects.filter(
+                    pk__in=[self.device_info.pk, other.pk],
+                ),
+                date,
+            )
+        )
+        self.assertEqual(states, {
+            self.device_info.pk: unicode(self.position + 2),
+            other.pk: unicode(other.position),
+        })
+
+    def test_create_checkpoints(self):
+        other = DeviceInfoFactory()
+        queryset = DeviceInfo.objects.filter(
+            pk__in=[self.device_info.pk, other.pk],
+        )
+        self.assertEqual(create_checkpoints(queryset, interval=3), 1)
+        self.assertEqual(create_checkpoints(queryset, interval=3), 0)
+        self.assertEqual(
+            self._position_at(datetime(2014, 1, 1, 12)),
+            unicode(self.position + 1),
+        )
+
+
+class HistoryArchiveTestCase(TestCase):
+    def setUp(self):
+        self.device_info = DeviceInfo.objects.get(pk=DeviceInfoFactory().pk)
+        self.position = self.device_info.position
+        for change in range(1, 4):
+            self.device_info.position = self.position + change
+            self.device_info.save()
+        self.device_info.get_history().update(date=datetime(2012, 1, 1))
+        self.history = [
+            (h.id, h.field_name, h.old_value, h.new_value)
+            for h in self.device_info.get_history().order_by('-id')
+        ]
+
+    def test_archive_moves_old_rows(self):
+        self.assertEqual(archive_history(before=datetime(2013, 1, 1)), 3)
+        self.assertEqual(len(self.device_info.get_history()), 0)
+        self.assertEqual(
+            ArchivedHistory.objects.filter(
+                object_id=self.device_info.id,
+            ).count(),
+            3,
+        )
+        self.assertEqual(
+            HistoryField.objects.filter(name='position').count(), 1,
+        )
+        self.assertEqual(
+            [
+                (h.id, h.field_name, h.old_value, h.new_value)
+                for h in self.device_info.get_history(archived=True)
+            ],
+            self.history,
+        )
+
+    def test_archived_history_is_chainable(self):
+        archive_history(before=datetime(2013, 1, 1))
+        self.device_info.position = self.position + 4
+        self.device_info.save()
+        history = self.device_info.get_history(archived=True).filter(
+            field_name='position',
+        )
+        self.assertEqual(history.count(), 4)
+        self.assertEqual(
+            [h.new_value for h in history.order_by('date', 'id')[1:3]],
+            [unicode(self.position + 2), unicode(self.position + 3)],
+        )
+        self.assertEqual(history[0].new_value, unicode(self.position + 4))
+        self.assertFalse(
+            self.device_info.get_history(archived=True).filter(
+                field_name='rack',
+            )
+        )
+
+    def test_newer_rows_stay_online(self):
+        self.assertEqual(archive_history(before=datetime(2011, 1, 1)), 0)
+        self.assertEqual(len(self.device_info.get_history()), 3)
+
+    def test_past_state_includes_archived_changes(self):
+        archive_history(before=datetime(2013, 1, 1))
+        self.assertEqual(
+            get_state_at(self.device_info, datetime(2011, 1, 1))['position'],
+            unicode(self.position),
+        )
+
+
+class HistoryViewArchiveTestCase(ClientMixin, TestCase):
+    def setUp(self):
+        self.login_as_superuser()
+        self.asset = BOAssetFactory()
+        for remarks in ('first', 'second'):
+            self.asset.remarks = remarks
+            self.asset.save()
+        self.asset.get_history().filter(new_value='first').update(
+            date=datetime(2012, 1, 1),
+        )
+        archive_history(before=datetime(2013, 1, 1))
+        self.url = reverse('history_for_model', kwargs={
+            'content_type': ContentType.objects.get_for_model(self.asset).id,
+            'object_id': self.asset.id,
+        })
+
+    def _values(self, response):
+        return [
+            h.new_value for h in response.context['page_content']
+            if h.field_name == 'remarks'
+        ]
+
+    def test_archived_changes_are_hidden_by_default(self):
+        self.assertEqual(self._values(self.client.get(self.url)), ['second'])
+
+    def test_archived_changes(self):
+        response = self.client.get(self.url, {'archived': '1'})
+        self.assertEqual(self._values(response), ['second', 'first'])
+        self.assertTrue(response.context['keyset_pagination'])
+
+
+class M2MSnapshotsTestCase(TestCase):
+    def setUp(self):
+        self.assets = [BOAssetFactory() for _ in range(2)]
+        self.supports = [BOSupportFactory() for _ in range(3)]
+        for support in self.supports:
+            support.assets.add(*self.assets)
+        History.objects.filter(field_name='assets').delete()
+        History.objects.log_changes(self.supports[0], None, [{
+            'field': 'assets',
+            'old': '[]',
+            'new': json.dumps([self.assets[0].id]),
+        }])
+        ContentType.objects.get_for_model(Support)
+
+    def test_snapshots_of_many_objects(self):
+        with CaptureQueries() as captured:
+            snapshots = get_m2m_snapshots(self.supports, 'assets')
+        self.assertLessEqual(len(captured), 5)
+        asset_ids = sorted(asset.id for asset in self.assets)
+        self.assertEqual(
+            [snapshot.current for snapshot in snapshots], [asset_ids] * 3,
+        )
+        self.assertEqual(snapshots[0].previous, [self.assets[0].id])
+        self.assertEqual(snapshots[0].added, set([self.assets[1].id]))
+        self.assertEqual(snapshots[1].added, set(asset_ids))
+
+    def test_snapshot_orders_like_snapshots_of_many_objects(self):
+        support = self.supports[1]
+        self.assertEqual(
+            support.get_snapshot(support, support.assets, 'assets').current,
+            get_m2m_snapshots([support], 'assets')[0].current,
+        )
+
+    def test_last_values_are_ordered_by_date(self):
+        content_type = ContentType.objects.get_for_model(Support)
+        for support in self.supports[1:]:
+            # the later change is logged first
+            for day, value in ((2, 'later'), (1, 'earlier')):
+                History.objects.create(
+                    content_type=content_type, object_id=support.id,
+                    field_name='assets', date=datetime(2014, 1, day),
+                    new_value=value,
+                )
+        ids = [support.id for support in self.supports]
+        values = History.objects.get_last_values(Support, ids, 'assets')
+        self.assertEqual(values[ids[1]], 'later')
+        self.assertEqual(values[ids[2]], 'later')
+        self.assertEqual(
+            History.objects.get_last_value(self.supports[1], 'assets'),
+            'later',
+        )
+
+    def test_buffer_caches_last_values(self):
+        with HistoryBuffer():
+            History.objects.get_last_value(self.supports[0], 'assets')
+            with CaptureQueries() as captured:
+                value = History.objects.get_last_value(
+                    self.supports[0], 'assets',
+                )
+        self.assertEqual(len(captured), 0)
+        self.assertEqual(value, json.dumps([self.assets[0].id]))
+
+
+ASYNC_HISTORY_SETTINGS = {
+    'ENABLE': True,
+    'QUEUES': ('history_1', 'history_2'),
+}
+
+
+class AsyncHistoryTestCase(TransactionTestCase):
+    def setUp(self):
+        self.device_info = DeviceInfo.objects.get(pk=DeviceInfoFactory().pk)
+
+    def _change_position(self):
+        self.device_info.position += 1
+        self.device_info.save()
+
+    def _position_history(self):
+        return self.device_info.get_history().filter(field_name='position')
+
+    def test_synchronous_by_default(self):
+        with patch('ralph_assets.history.queue.django_rq') as django_rq:
+            self._change_position()
+        self.assertFalse(django_rq.get_queue.called)
+        self.assertEqual(len(self.device_info.get_history()), 1)
+
+    @override_settings(ASSETS_ASYNC_HISTORY=ASYNC_HISTORY_SETTINGS)
+    def test_rows_are_enqueued(self):
+        with patch('ralph_assets.history.queue.django_rq') as django_rq:
+            self._change_position()
+            with history_transaction():
+                self._change_position()
+        self.assertEqual(len(self.device_info.get_history()), 0)
+        queue_name = queue.get_queue_name(
+            ContentType.objects.get_for_model(DeviceInfo).id,
+            self.device_info.id,
+        )
+        self.assertEqual(
+            [args for args, kwargs in django_rq.get_queue.call_args_list],
+            [(queue_name,), (queue_name,)],
+        )
+        for args, kwargs in django_rq.get_queue().enqueue.call_args_list:
+            func, rows = args
+            func(rows)
+        self.assertEqual(
+            [h.new_value for h in self._position_history().order_by('date')],
+            [
+                unicode(self.device_info.position - 1),
+                unicode(self.device_info.position),
+            ],
+        )
+
+    @override_settings(ASSETS_ASYNC_HISTORY=ASYNC_HISTORY_SETTINGS)
+    def test_rows_are_enqueued_after_commit(self):
+        with patch('ralph_assets.history.queue.django_rq') as django_rq:
+            with history_transaction():
+                self._change_position()
+                with history_transaction():
+                    self._change_position()
+                self.assertFalse(django_rq.get_queue.called)
+        self.assertEqual(django_rq.get_queue().enqueue.call_count, 1)
+
+    @override_settings(ASSETS_ASYNC_HISTORY=ASYNC_HISTORY_SETTINGS)
+    def test_rows_are_dropped_on_rollback(self):
+        with patch('ralph_assets.history.queue.django_rq') as django_rq:
+            with self.assertRaises(ValueError):
+                with history_transaction():
+                    self._change_position()
+                    raise ValueError()
+        self.assertFalse(django_rq.get_queue.called)
+        self.assertEqual(self._position_history().count(), 0)
+
+    @override_settings(ASSETS_ASYNC_HISTORY=ASYNC_HISTORY_SETTINGS)
+    def test_rows_are_inserted_in_managed_transaction(self):
+        with patch('ralph_assets.history.queue.django_rq') as django_rq:
+            with transaction.commit_on_success():
+                self._change_position()
+                self.assertEqual(self._position_history().count(), 1)
+        self.assertFalse(django_rq.get_queue.called)
+
+    @override_settings(ASSETS_ASYNC_HISTORY=ASYNC_HISTORY_SETTINGS)
+    def test_drain_runs_burst_worker(self):
+        with patch('ralph_assets.history.queue.django_rq') as django_rq:
+            with patch('ralph_assets.history.queue.Worker') as worker:
+                django_rq.get_queue.return_value.count = 0
+                queue.drain_queues()
+        worker.assert_called_once_with(
+            [django_rq.get_queue.return_value] * len(
+                ASYNC_HISTORY_SETTINGS['QUEUES']
+            ),
+            connection=django_rq.get_queue.return_value.connection,
+        )
+        self.assertEqual(
+            [call[0][0] for call in django_rq.get_queue.call_args_list],
+            list(ASYNC_HISTORY_SETTINGS['QUEUES']),
+        )
+        worker.return_value.work.assert_called_once_with(burst=True)
+
+    @override_settings(ASSETS_ASYNC_HISTORY=ASYNC_HISTORY_SETTINGS)
+    def test_object_always_uses_the_same_queue(self):
+        self.assertEqual(
+            set(queue.get_queue_name(1, 42) for _ in range(3)),
+            set([queue.get_queue_name(1, 42)]),
+        )
+        self.assertIn(
+            queue.get_queue_name(1, 42), ASYNC_HISTORY_SETTINGS['QUEUES'],
+        )
@@ -10,16 +10,29 @@ from datetime import timedelta
 from unittest import skip
 
 from django.test import TestCase
+from mock import patch
 
 from ralph.business.models import Venture
 from ralph.discovery.models_device import Device, DeviceType
 
 from ralph.discovery.tests.util import DeviceModelFactory
-from ralph_assets.api_pricing import get_assets, get_asset_parts
-from ralph_assets.models_assets import AssetStatus, PartInfo, Rack
+from ralph_assets.api_pricing import (
+    get_assets,
+    get_asset_parts,
+    get_assets_in_range,
+)
+from ralph_assets.models_assets import (
+    Asset,
+    AssetStatus,
+    PartInfo,
+    Rack,
+    prefetch_ralph_devices,
+    update_device_info_locations,
+)
 from ralph_assets.models_dc_assets import (
     DeprecatedRalphDC,
     DeprecatedRalphRack,
+    DeviceInfo,
 )
 from ralph_assets.licences.models import LicenceAsset, Licence, WrongModelError
 from ralph_assets.tests.utils.assets import (
@@ -30,6 +43,7 @@ from ralph_assets.tests.utils.assets import (
     RackFactory,
     ServiceFactory,
 )
+from ralph_assets.tests.utils import CaptureQueries
 from ralph_assets.tests.utils.supports import DCSupportFactory
 from ralph_assets.tests.utils.licences import LicenceFactory
 
@@ -101,6 +115,25 @@ class TestModelAsset(TestCase):
             True,
         )
 
+    def test_deprecation_intervals(self):
+        start = datetime.date(2013, 11, 20)
+        end = datetime.date(2014, 12, 20)
+        for asset in (
+            self.asset, self.asset2, self.asset3, self.asset_depr_date,
+        ):
+            days = []
+            for date_from, date_to, is_deprecated in (
+                asset.get_deprecation_intervals(start, end)
+            ):
+                while date_from <= date_to:
+                    days.append((date_from, is_deprecated))
+                    date_from += timedelta(days=1)
+            self.assertEqual(days, [
+                (start + timedelta(days=n),
+                 asset.is_deprecated(start + timedelta(days=n)))
+                for n in xrange((end - start).days + 1)
+            ])
+
     def test_asset_is_liquidated(self):
         date = datetime.date.today()
         self.assertFalse(self.asset.is_liquidated(date))
@@ -274,6 +307,26 @@ class TestApiAssets(TestCase):
             self.assertEqual(item['is_blade'], self.category.is_blade)
             self.assertEqual(item['cores_count'], self.asset.cores_count)
 
+    def tests_api_asset_in_range(self):
+        items = list(get_assets_in_range(
+            datetime.date(2013, 11, 1), datetime.date(2013, 12, 31),
+        ))
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items[0]['asset_id'], self.asset.id)
+        self.assertNotIn('is_deprecated', items[0])
+        self.assertEqual(items[0]['intervals'], [
+            {
+                'date_from': datetime.date(2013, 11, 1),
+                'date_to': datetime.date(2013, 11, 28),
+                'is_deprecated': False,
+            },
+            {
+                'date_from': datetime.date(2013, 11, 29),
+                'date_to': datetime.date(2013, 12, 31),
+                'is_deprecated': True,
+            },
+        ])
+
     def tests_api_asset_part(self):
         for item in get_asset_parts():
             self.assertEqual(item['price'], 100)
@@ -284,6 +337,148 @@ class TestApiAssets(TestCase):
             self.assertEqual(item['sn'], self.asset.sn)
             self.assertEqual(item['barcode'], self.asset.barcode)
 
+    def tests_api_asset_part_deprecation_date(self):
+        item, = get_asset_parts(datetime.date(2014, 3, 29))
+        self.assertFalse(item['is_deprecated'])
+        item, = get_asset_parts(datetime.date(2015, 1, 1))
+        self.assertTrue(item['is_deprecated'])
+
+    def tests_api_asset_part_queries(self):
+        with CaptureQueries() as captured:
+            self.assertEqual(len(list(get_asset_parts())), 1)
+        queries = len(captured)
+        for _ in xrange(3):
+            AssetFactory(
+                part_info=PartInfo.objects.create(device=self.asset),
+                model=self.model,
+            )
+        with CaptureQueries() as captured:
+            self.assertEqual(len(list(get_asset_parts())), 4)
+        self.assertEqual(len(captured), queries)
+
+
+class TestPrefetchRalphDevices(TestCase):
+    def setUp(self):
+        self.assets = [AssetFactory() for _ in range(3)]
+        part_info = PartInfo(device=self.assets[0])
+        part_info.save()
+        self.part = AssetFactory(part_info=part_info, device_info=None)
+
+    def _get_assets(self):
+        return list(Asset.objects.select_related(
+            'device_info', 'part_info__device__device_info',
+        ).filter(
+            id__in=[a.id for a in self.assets + [self.part]],
+        ).order_by('pk'))
+
+    def test_devices_are_fetched_once(self):
+        assets = self._get_assets()
+        with CaptureQueries() as captured:
+            prefetch_ralph_devices(assets)
+        self.assertEqual(len(captured), 1)
+        with CaptureQueries() as captured:
+            for asset in assets:
+                asset.venture
+                asset.linked_device
+                asset.is_discovered
+        self.assertEqual(len(captured), 0)
+
+    def test_same_results(self):
+        expected = [
+            (a.venture, a.linked_device, a.is_discovered)
+            for a in self._get_assets()
+        ]
+        result = [
+            (a.venture, a.linked_device, a.is_discovered)
+            for a in prefetch_ralph_devices(self._get_assets())
+        ]
+        self.assertEqual(result, expected)
+
+    def test_changed_link_is_not_taken_from_cache(self):
+        asset = prefetch_ralph_devices(self._get_assets())[0]
+        asset.device_info.ralph_device_id = None
+        self.assertIsNone(asset.get_ralph_device())
+
+
+class TestDeviceInfoLocation(TestCase):
+    def setUp(self):
+        self.asset = DCAssetFactory(model__category__is_blade=False)
+
+    def _get_device_info(self, asset=None):
+        asset = asset or self.asset
+        return DeviceInfo.objects.get(pk=asset.device_info_id)
+
+    def test_complete_location(self):
+        self.assertTrue(self._get_device_info().location_complete)
+
+    def test_incomplete_location(self):
+        info = self._get_device_info()
+        info.position = None
+        info.save()
+        self.assertFalse(self._get_device_info().location_complete)
+
+    def test_blade_requires_slot_number(self):
+        blade = DCAssetFactory(
+            model__category__is_blade=True, device_info__slot_no=None,
+        )
+        self.assertFalse(self._get_device_info(blade).location_complete)
+        blade.device_info.slot_no = '1'
+        blade.device_info.save()
+        self.assertTrue(self._get_device_info(blade).location_complete)
+
+    def test_category_change_updates_flag(self):
+        info = self._get_device_info()
+        info.slot_no = None
+        info.save()
+        category = self.asset.model.category
+        category.is_blade = True
+        category.save()
+        self.assertFalse(self._get_device_info().location_complete)
+
+    def test_save_without_location_change(self):
+        info = self._get_device_info()
+        info.u_level = '3'
+        with CaptureQueries() as captured:
+            info.save()
+        self.assertEqual(captured.count('ralph_assets_assetcategory'), 0)
+        self.assertEqual(captured.count('ralph_assets_rack'), 0)
+        asset = Asset.objects.get(pk=self.asset.pk)
+        asset.sn = 'sn-changed'
+        with patch(
+            'ralph_assets.models_signals.update_device_info_locations',
+        ) as update:
+            asset.save()
+            self.assertFalse(update.called)
+            asset.model = AssetModelFactory(category__is_blade=True)
+            asset.save()
+            self.assertTrue(update.called)
+
+    def test_blade_uses_loaded_asset(self):
+        blade = DCAssetFactory(
+            model__category__is_blade=True, device_info__slot_no=None,
+        )
+        info = DeviceInfo.objects.select_related(
+            'asset__model__category',
+        ).get(pk=blade.device_info_id)
+        info.slot_no = '2'
+        with CaptureQueries() as captured:
+            info.save()
+        self.assertEqual(captured.count('ralph_assets_assetcategory'), 0)
+        self.assertTrue(self._get_device_info(blade).location_complete)
+        info = self._get_device_info(blade)
+        info.slot_no = None
+        with CaptureQueries() as captured:
+            info.save()
+        # asset, model and category are read in one query
+        self.assertEqual(captured.count('ralph_assets_assetcategory'), 1)
+        self.assertFalse(self._get_device_info(blade).location_complete)
+
+    def test_backfill(self):
+        DeviceInfo.objects.update(location_complete=False)
+        self.assertEqual(update_device_info_locations(), 1)
+        self.assertTrue(self._get_device_info().location_complete)
+        self.assertEqual(update_device_info_locations(), 0)
+
 
 class TestModelHistory(TestCase):
 
@@ -10,6 +10,7 @@ from functools import partial
 from factory import Sequence, SubFactory
 from factory.django import DjangoModelFactory, FileField
 
+from django.db import connection, reset_queries
 from django.test.client import Client
 
 from ralph.ui.tests.global_utils import UserFactory
@@ -71,3 +72,30 @@ class ClientMixin(object):
 
     def login_as_superuser(self):
         self.login_as_user(AdminFactory())
+
+
+class CaptureQueries(object):
+    """
+    Context manager recording SQL queries executed within its block, e.g.:
+
+        with CaptureQueries() as captured:
+            self.client.get(url)
+        self.assertEqual(captured.count('COUNT('), 1)
+    """
+    def __enter__(self):
+        self.use_debug_cursor = connection.use_debug_cursor
+        connection.use_debug_cursor = True
+        reset_queries()
+        self.queries = []
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        connection.use_debug_cursor = self.use_debug_cursor
+        self.queries = [query['sql'] for query in connection.queries]
+
+    def __len__(self):
+        return len(self.queries)
+
+    def count(self, text):
+        """Returns number of queries containing *text*."""
+        return len([sql for sql in self.queries if text in sql])
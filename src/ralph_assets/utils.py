@@ -5,9 +5,12 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+from collections import defaultdict
+
 from ajax_select.fields import AutoCompleteSelectField
 from django import forms
 from django.forms.models import modelformset_factory
+from ralph.util.api import Getter
 
 from ralph_assets.widgets import IntegerWidget
 
@@ -116,3 +119,66 @@ def assigned_formset_factory(obj, base_model, field, lookup,
         can_delete=False,
     )
     return formset
+
+
+def iter_chunks(queryset, chunk_size=1000):
+    """Yields lists of at most *chunk_size* objects from *queryset* ordered
+    by primary key. Each chunk is fetched by a separate query, seeking past
+    the last primary key of the previous one."""
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        chunk_qs = queryset
+        if last_pk is not None:
+            chunk_qs = chunk_qs.filter(pk__gt=last_pk)
+        chunk = list(chunk_qs[:chunk_size])
+        if not chunk:
+            break
+        last_pk = chunk[-1].pk
+        yield chunk
+
+
+def get_related_ids(model, objects, field_name):
+    """Returns dict primary key -> list of primary keys of objects related
+    with *objects* (instances of *model*) through many-to-many field
+    *field_name*, using one query. Related objects are read with their
+    default manager, like ``obj.<field_name>.all()`` does."""
+    field = model._meta.get_field(field_name)
+    query_name = field.related_query_name()
+    related_ids = defaultdict(list)
+    if not objects:
+        return related_ids
+    for pk, related_pk in field.rel.to._default_manager.filter(**{
+        query_name + '__in': [obj.pk for obj in objects],
+    }).order_by('pk').values_list(query_name, 'pk'):
+        related_ids[pk].append(related_pk)
+    return related_ids
+
+
+class PrefetchingGetter(Getter):
+    """Getter reading items in chunks of ``chunk_size``, with relations
+    from ``select_related`` joined. Each many-to-many field named in
+    ``prefetch_ids`` is returned as list of ids of related objects, read
+    with one query per chunk."""
+
+    chunk_size = 1000
+    select_related = ()
+    prefetch_ids = ()
+
+    def get_queryset(self):
+        queryset = super(PrefetchingGetter, self).get_queryset()
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        return queryset
+
+    def __iter__(self):
+        for items in iter_chunks(self.get_queryset(), self.chunk_size):
+            related_ids = [
+                (name, get_related_ids(self.Model, items, name))
+                for name in self.prefetch_ids
+            ]
+            for item in items:
+                data = self.format_item(item)
+                for name, ids in related_ids:
+                    data[name] = ids.get(item.pk, [])
+                yield data
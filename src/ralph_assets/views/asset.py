@@ -8,7 +8,6 @@ from __future__ import unicode_literals
 import logging
 
 from django.contrib import messages
-from django.db import transaction
 from django.http import HttpResponseRedirect
 from django.utils.translation import ugettext_lazy as _
 
@@ -108,19 +107,18 @@ class AssetBulkEdit(
                     )
 
     def save_formset(self, instances, formset):
-        with transaction.commit_on_success():
-            for idx, instance in enumerate(instances):
-                instance.modified_by = self.request.user.get_profile()
-                instance.save(user=self.request.user)
-                new_src, office_info_data = _move_data(
-                    formset.forms[idx].cleaned_data,
-                    {}, ['purpose']
-                )
-                formset.forms[idx].cleaned_data = new_src
-                instance = _update_office_info(
-                    self.request.user, instance,
-                    office_info_data,
-                )
+        for idx, instance in enumerate(instances):
+            instance.modified_by = self.request.user.get_profile()
+            instance.save(user=self.request.user)
+            new_src, office_info_data = _move_data(
+                formset.forms[idx].cleaned_data,
+                {}, ['purpose']
+            )
+            formset.forms[idx].cleaned_data = new_src
+            instance = _update_office_info(
+                self.request.user, instance,
+                office_info_data,
+            )
 
     def handle_formset_error(self, formset_error):
         messages.error(
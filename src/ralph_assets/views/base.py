@@ -26,9 +26,11 @@ from ralph.ui.views.common import MenuMixin
 from ralph.account.models import Perm, ralph_permission
 from ralph_assets import forms as assets_forms
 from ralph_assets.app import Assets as app
+from ralph_assets.history.models import commit_with_history
 from ralph_assets.models_assets import AssetType
 from ralph_assets.models import Asset
 from ralph_assets.forms import OfficeForm
+from ralph_assets.views.pagination import paginate_keyset
 
 MAX_PAGE_SIZE = 65535
 HISTORY_PAGE_SIZE = 25
@@ -196,6 +198,10 @@ class BulkEditBase(BobBulkEditBase):
         else:
             return self.form_bulk
 
+    @commit_with_history
+    def post(self, request, *args, **kwargs):
+        return super(BulkEditBase, self).post(request, *args, **kwargs)
+
     def get_query_from_request(self, *args, **kwargs):
         if self.request.GET.get('from_query'):
             query = super(
@@ -259,8 +265,13 @@ class JsonResponseMixin(object):
 
 
 class PaginateMixin(object):
+    """Paginates ``get_paginate_queryset`` as ``page_content``. With
+    ``paginate_ordering`` set, pages are selected with cursors (keyset
+    pagination) instead of OFFSET, page 0 still shows all items."""
     paginate_queryset = None
+    paginate_ordering = None
     query_variable_name = 'page'
+    cursor_variable_name = 'cursor'
 
     def get_paginate_queryset(self):
         if not self.paginate_queryset:
@@ -281,12 +292,22 @@ class PaginateMixin(object):
             page_size = MAX_PAGE_SIZE
         else:
             page_size = HISTORY_PAGE_SIZE
-        page_content = Paginator(
-            self.get_paginate_queryset(), page_size
-        ).page(page)
+        keyset = self.paginate_ordering and page_size != MAX_PAGE_SIZE
+        if keyset:
+            page_content = paginate_keyset(
+                self.get_paginate_queryset(), self.paginate_ordering,
+                self.request.GET.get(self.cursor_variable_name), page_size,
+            )
+        else:
+            page_content = Paginator(
+                self.get_paginate_queryset(), page_size
+            ).page(page)
         context.update({
             'page_content': page_content,
             'query_variable_name': self.query_variable_name,
+            'keyset_pagination': keyset,
+            'cursor_variable_name': self.cursor_variable_name,
+            'url_query': self.request.GET,
         })
         return context
 
@@ -12,7 +12,6 @@ from django.core.files.storage import FileSystemStorage
 from django.contrib.auth.models import User
 from django.contrib.formtools.wizard.views import SessionWizardView
 from django.core.exceptions import ObjectDoesNotExist, MultipleObjectsReturned
-from django.db import transaction
 from django.db.models.fields import (
     BooleanField,
     CharField,
@@ -33,6 +32,7 @@ from ralph_assets.forms_import import (
     get_model_by_name,
     get_amendment_model,
 )
+from ralph_assets.history.models import commit_with_history
 from ralph_assets.models_assets import (
     MODE2ASSET_TYPE,
     ASSET_TYPE2MODE,
@@ -251,7 +251,7 @@ class XlsUploadView(SessionWizardView, AssetsBase):
             value = [value]
         return value
 
-    @transaction.commit_on_success
+    @commit_with_history
     def done(self, form_list):
         mappings = self.storage.data['mappings']
         names_per_sheet, update_per_sheet, add_per_sheet =\
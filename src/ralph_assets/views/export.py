@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+"""Chunked CSV export of asset search results.
+
+The queryset is walked in primary key order, one chunk at a time, and the
+Ralph devices (ventures, discovery state) are loaded for the whole chunk
+by :func:`ralph_assets.models_assets.prefetch_ralph_devices`. Rows are
+written to a temporary file, which is then stored in Django's default
+storage (like attachments, shared by the web servers and the workers); the
+result of the report job is only the name of the stored file. The file can
+be downloaded again until it expires (``EXPORT_TTL``), expired exports are
+removed when a new one is stored.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import datetime
+import posixpath
+import tempfile
+import time
+import uuid
+
+from bob.csvutil import UnicodeWriter
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpResponse
+
+from ralph.business.models import Venture
+from ralph.util.reports import set_progress
+from ralph_assets.models_assets import Asset, PartInfo, prefetch_ralph_devices
+from ralph_assets.utils import iter_chunks
+
+
+CSV_ENCODING = 'cp1250'
+# directory of the storage exports are kept in
+EXPORT_DIRECTORY = 'ralph_assets/exports'
+EXPORT_TTL = datetime.timedelta(days=1)
+# size of blocks the stored export is streamed in
+EXPORT_BLOCK_SIZE = 64 * 1024
+EXPORT_SELECT_RELATED = (
+    'device_info',
+    'model__category',
+    'model__manufacturer',
+    'office_info',
+    'part_info__device__device_info',
+    'part_info__device__model__manufacturer',
+    'part_info__source_device__model__manufacturer',
+    'property_of',
+    'service_name',
+    'user',
+    'warehouse',
+)
+
+
+class ProgressReporter(object):
+    """Calls ``set_progress`` at most once per *interval* seconds."""
+
+    def __init__(self, job, total, interval):
+        self.job = job
+        self.total = total
+        self.interval = interval
+        self.processed = 0
+        self.last_report = time.time()
+
+    def update(self, processed):
+        self.processed += processed
+        now = time.time()
+        if self.total and now - self.last_report >= self.interval:
+            set_progress(self.job, self.processed / self.total)
+            self.last_report = now
+
+    def finish(self):
+        set_progress(self.job, 1)
+
+
+class AssetCsvExporter(object):
+    """Writes asset search results as CSV.
+
+    :param view: :class:`ralph_assets.views.search.AssetSearchDataTable`
+        instance providing columns and cell rendering
+    :param type: name of the asset info relation (e.g. ``office_info``)
+    :param model: model of the asset info relation
+    """
+    chunk_size = 1000
+    progress_interval = 2  # seconds
+
+    def __init__(self, view, type, model, job=None):
+        self.view = view
+        self.type = type
+        self.model = model
+        self.job = job
+
+    def get_row(self, asset):
+        view = self.view
+        row = ['part'] if asset.part_info else ['device']
+        for item in view.columns:
+            field = item.field
+            if not field:
+                continue
+            nested_field_name = item.foreign_field_name
+            if nested_field_name == self.type:
+                cell = view.get_cell(
+                    getattr(asset, self.type), field, self.model,
+                )
+            elif nested_field_name == 'part_info':
+                cell = view.get_cell(asset.part_info, field, PartInfo)
+            elif nested_field_name == 'venture':
+                cell = view.get_cell(asset.venture, field, Venture)
+            elif nested_field_name == 'is_discovered':
+                cell = unicode(asset.is_discovered)
+            else:
+                cell = view.get_cell(asset, field, Asset)
+            row.append(unicode(cell))
+        return row
+
+    def iter_rows(self, queryset):
+        """Yields the header and then the row of every asset."""
+        yield [unicode(name) for name in self.view.get_csv_header()]
+        progress = ProgressReporter(
+            self.job, queryset.count(), self.progress_interval,
+        )
+        queryset = queryset.select_related(*EXPORT_SELECT_RELATED)
+        for chunk in iter_chunks(queryset, self.chunk_size):
+            for asset in prefetch_ralph_devices(chunk):
+                yield self.get_row(asset)
+            progress.update(len(chunk))
+        progress.finish()
+
+    def write(self, queryset, f):
+        UnicodeWriter(f, encoding=CSV_ENCODING).writerows(
+            self.iter_rows(queryset)
+        )
+
+    def save(self, queryset, storage=None):
+        """Writes the CSV to a temporary file, stores it in *storage* (the
+        default storage by default) and returns its name there."""
+        storage = storage or default_storage
+        with tempfile.TemporaryFile() as f:
+            self.write(queryset, f)
+            content = File(f)
+            # the temporary file has no path to take the size from
+            content.size = f.tell()
+            name = storage.save(
+                posixpath.join(
+                    EXPORT_DIRECTORY, '{}.csv'.format(uuid.uuid4().hex),
+                ),
+                content,
+            )
+        remove_expired_exports(storage)
+        return name
+
+
+def remove_expired_exports(storage=None, now=None):
+    """Removes exports stored for longer than ``EXPORT_TTL`` (skipped when
+    the storage can't list files or their dates)."""
+    storage = storage or default_storage
+    now = now or datetime.datetime.now()
+    try:
+        names = storage.listdir(EXPORT_DIRECTORY)[1]
+    except (OSError, NotImplementedError):
+        return
+    for name in names:
+        path = posixpath.join(EXPORT_DIRECTORY, name)
+        try:
+            if storage.modified_time(path) < now - EXPORT_TTL:
+                storage.delete(path)
+        except (OSError, NotImplementedError):
+            continue
+
+
+def _iter_file(f):
+    try:
+        for block in iter(lambda: f.read(EXPORT_BLOCK_SIZE), b''):
+            yield block
+    finally:
+        f.close()
+
+
+def make_csv_file_response(name, filename, storage=None):
+    """Streams CSV stored by :meth:`AssetCsvExporter.save` as *name*. The
+    file isn't removed, so the response can be made again (e.g. on
+    reload)."""
+    storage = storage or default_storage
+    try:
+        f = storage.open(name)
+    except IOError:
+        raise Http404('The export has expired.')
+    response = HttpResponse(_iter_file(f), content_type='application/csv')
+    response['Content-Disposition'] = 'attachment; filename=%s' % filename
+    return response
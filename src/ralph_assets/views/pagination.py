@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+
+"""Keyset (seek) pagination for bob data tables.
+
+Instead of ``OFFSET`` the next page is selected by comparing the sort
+column and the primary key with the values of the last row of the
+previous page, so every page costs the same, no matter how deep it is.
+The position is passed between requests as an opaque cursor token. NULLs
+of the sort column are placed where the database sorts them (lowest in
+MySQL and SQLite, highest in PostgreSQL and Oracle).
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import base64
+import datetime
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import FieldDoesNotExist, Model, Q
+from django.utils.functional import cached_property
+
+
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Keeps microseconds of datetimes (Django's encoder cuts them to
+    milliseconds), a rounded value would skip rows."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super(CursorEncoder, self).default(o)
+
+
+def encode_cursor(sort, direction, value, pk):
+    data = json.dumps([sort, direction, value, pk], cls=CursorEncoder)
+    token = base64.urlsafe_b64encode(data.encode('utf-8')).rstrip(b'=')
+    return token.decode('ascii')
+
+
+def decode_cursor(token):
+    """Returns tuple (sort, direction, value, pk) encoded in *token*."""
+    try:
+        token = str(token)
+        token += b'=' * (-len(token) % 4)
+        sort, direction, value, pk = json.loads(
+            base64.urlsafe_b64decode(token).decode('utf-8')
+        )
+    except (TypeError, ValueError, UnicodeError):
+        raise InvalidCursor(token)
+    if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS):
+        raise InvalidCursor(token)
+    return sort, direction, value, pk
+
+
+def get_sort_value(obj, field):
+    """Returns the value of *field* (e.g. ``model__name``) for *obj*, related
+    objects are represented by their primary keys."""
+    for part in field.split('__'):
+        if obj is None:
+            return None
+        obj = getattr(obj, part)
+    if isinstance(obj, Model):
+        obj = obj.pk
+    return obj
+
+
+def get_seek_field(model, field):
+    """Returns *field* pointing at a column, relations are compared by their
+    primary keys instead of the default ordering of the related model."""
+    for part in field.split('__'):
+        try:
+            model_field = model._meta.get_field_by_name(part)[0]
+        except FieldDoesNotExist:
+            return field
+        rel = getattr(model_field, 'rel', None)
+        if not rel:
+            return field
+        model = rel.to
+    return field + '__pk'
+
+
+def nulls_sort_highest(connection):
+    """Returns True when the database of *connection* sorts NULLs after all
+    other values (PostgreSQL, Oracle), False when before them (MySQL,
+    SQLite)."""
+    return connection.vendor in ('postgresql', 'oracle')
+
+
+def seek_query(field, value, pk, descending, nulls_highest=False):
+    """Returns Q selecting rows placed after (value, pk) in (field, pk)
+    ordering. NULLs are treated as the highest values with
+    *nulls_highest*, as the lowest ones otherwise (see
+    :func:`nulls_sort_highest`)."""
+    after_pk = Q(pk__lt=pk) if descending else Q(pk__gt=pk)
+    is_null = Q(**{field + '__isnull': True})
+    # NULLs are at the end of the page sequence
+    nulls_last = descending != nulls_highest
+    if value is None:
+        if nulls_last:
+            return is_null & after_pk
+        return is_null & after_pk | Q(**{field + '__isnull': False})
+    query = (
+        Q(**{field + ('__lt' if descending else '__gt'): value}) |
+        Q(**{field: value}) & after_pk
+    )
+    if nulls_last:
+        query |= is_null
+    return query
+
+
+def _get_cursor(token, sort):
+    if not token:
+        return None
+    try:
+        cursor = decode_cursor(token)
+    except InvalidCursor:
+        return None
+    # cursor created for other sorting points nowhere
+    if cursor[0] != sort:
+        return None
+    return cursor
+
+
+def paginate_keyset(queryset, sort, token, per_page, get_count=None):
+    """Returns :class:`KeysetPage` of *queryset* ordered by *sort* (e.g.
+    ``-date``) and the primary key, placed after the position encoded in
+    *token* (the first page if it's empty or invalid).
+    """
+    descending = sort.startswith('-')
+    prefix = '-' if descending else ''
+    field = get_seek_field(queryset.model, sort.lstrip('-'))
+    cursor = _get_cursor(token, prefix + field)
+    direction = cursor[1] if cursor else CURSOR_NEXT
+    backwards = direction == CURSOR_PREVIOUS
+    if backwards:
+        # walk the reversed ordering and flip the page afterwards
+        descending = not descending
+    page_qs = queryset
+    if cursor:
+        page_qs = page_qs.filter(seek_query(
+            field, cursor[2], cursor[3], descending,
+            nulls_sort_highest(connections[queryset.db]),
+        ))
+    ordering = ['-' + field, '-pk'] if descending else [field, 'pk']
+    if field in ('pk', 'id'):
+        ordering = ordering[1:]
+    rows = list(page_qs.order_by(*ordering)[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+        has_previous, has_next = has_more, True
+    else:
+        has_previous, has_next = cursor is not None, has_more
+    previous_cursor = next_cursor = None
+    if rows and has_previous:
+        previous_cursor = encode_cursor(
+            prefix + field, CURSOR_PREVIOUS,
+            get_sort_value(rows[0], field), rows[0].pk,
+        )
+    if rows and has_next:
+        next_cursor = encode_cursor(
+            prefix + field, CURSOR_NEXT,
+            get_sort_value(rows[-1], field), rows[-1].pk,
+        )
+    return KeysetPage(
+        rows, KeysetPaginator(queryset, get_count),
+        has_previous, has_next,
+        previous_cursor, next_cursor,
+    )
+
+
+class KeysetPaginator(object):
+    """Minimal paginator-like object exposing the whole result set.
+
+    :param get_count: callable returning the number of objects (defaults to
+        ``object_list.count``)
+    """
+
+    def __init__(self, object_list, get_count=None):
+        self.object_list = object_list
+        self.get_count = get_count or object_list.count
+
+    @cached_property
+    def count(self):
+        return self.get_count()
+
+
+class KeysetPage(object):
+
+    def __init__(self, object_list, paginator, has_previous, has_next,
+                 previous_cursor=None, next_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_previous = has_previous
+        self._has_next = has_next
+        self.previous_cursor = previous_cursor
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_next(self):
+        return self._has_next
+
+    def has_other_pages(self):
+        return self._has_previous or self._has_next
+
+
+class KeysetPaginationMixin(object):
+    """Replaces OFFSET pagination of ``bob.data_table.DataTableMixin`` with
+    keyset pagination when ``ASSETS_KEYSET_PAGINATION`` setting is on.
+
+    The page is sorted by the column chosen with ``sort_variable_name``
+    (as before) and by the primary key, which makes the order total.
+    """
+    cursor_variable_name = 'cursor'
+
+    @property
+    def keyset_pagination(self):
+        return getattr(settings, 'ASSETS_KEYSET_PAGINATION', False)
+
+    def _paginate(self, queryset):
+        if not self.keyset_pagination:
+            return super(KeysetPaginationMixin, self)._paginate(queryset)
+        return self._paginate_keyset(queryset)
+
+    def get_keyset_count(self, queryset):
+        """Returns callable counting *queryset* for the paginator."""
+        return queryset.count
+
+    def _paginate_keyset(self, queryset):
+        return paginate_keyset(
+            queryset, self.sort or 'pk',
+            self.request.GET.get(self.cursor_variable_name),
+            self.rows_per_page, self.get_keyset_count(queryset),
+        )
+
+    def get_context_data(self, *args, **kwargs):
+        context = super(KeysetPaginationMixin, self).get_context_data(
+            *args, **kwargs
+        )
+        context.update({
+            'keyset_pagination': self.keyset_pagination,
+            'cursor_variable_name': self.cursor_variable_name,
+        })
+        return context
@@ -16,14 +16,14 @@ from django.http import Http404
 from django.utils.translation import ugettext_lazy as _
 
 from ralph.util.reports import Report
-from ralph.discovery.models_device import Device
+from ralph_assets.device_links import devices_without_asset
+from ralph_assets.instrumentation import instrumented
 from ralph_assets.views.base import AssetsBase
 from ralph_assets.others import get_assets_rows, get_licences_rows
 from ralph_assets.models_assets import (
     Asset,
     AssetModel,
     AssetStatus,
-    DeviceInfo,
     MODE2ASSET_TYPE,
 )
 
@@ -325,12 +325,7 @@ class LinkedDevicesReport(BaseReport):
                 'url': '/assets/dc/search?id={}'.format(','.join(ids)),
             }
 
-        device_info_ids = DeviceInfo.objects.exclude(
-            ralph_device_id=None
-        ).values_list(
-            'ralph_device_id', flat=True
-        )
-        devices = Device.objects.exclude(id__in=device_info_ids)
+        devices = devices_without_asset()
         node, root = self.report.add(
             parent=_('Devices without linked asset'),
             name=str('Total'),
@@ -448,6 +443,7 @@ class ReportDetail(Report, ReportViewBase):
     def is_async(self, request, *args, **kwargs):
         return self.report.is_async(request)
 
+    @instrumented('ralph_assets.views.report.ReportDetail.get_result')
     def get_result(self, request, *args, **kwargs):
         report = self.get_report(kwargs.get('slug'))
         return report.get_result(*args, **kwargs)
@@ -6,329 +6,100 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import logging
-import re
 
 from rq import get_current_job
 from bob.data_table import DataTableMixin
 
 from django.conf import settings
-from django.db.models import Q
 from django.contrib import messages
+from django.core.paginator import EmptyPage
+from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 
-from ralph.util.reports import Report, set_progress
-from ralph.business.models import Venture
-from ralph.discovery.models_device import Device
+from ralph.middleware import get_actual_regions
+from ralph.util.reports import Report
 from ralph_assets.forms import (
     BackOfficeSearchAssetForm,
     DataCenterSearchAssetForm,
 )
-from ralph_assets.models import Asset, AssetCategory, PartInfo, OfficeInfo
+from ralph_assets.instrumentation import Section
+from ralph_assets.models import Asset, OfficeInfo
+from ralph_assets.search_cache import (
+    CachedSearchPaginator,
+    SearchResultCache,
+)
+from ralph_assets.search_planner import asset_search_planner
 from ralph_assets.views.base import AssetsBase, DataTableColumnAssets
+from ralph_assets.views.export import (
+    AssetCsvExporter,
+    make_csv_file_response,
+)
+from ralph_assets.views.pagination import KeysetPaginationMixin
 
 
 logger = logging.getLogger(__name__)
 
-
-QUOTATION_MARKS = re.compile(r"^\".+\"$")
-SEARCH_DELIMITERS = re.compile(r";|\|")
+# how many not found identifiers of a pasted list are listed in the warning
+UNMATCHED_IDENTIFIERS_SHOWN = 50
 
 
 class AssetsSearchQueryableMixin(object):
+    search_planner = asset_search_planner
+    # only the search itself stores pasted lists, see models_search
+    stage_identifiers = False
 
     def handle_search_data(self, *args, **kwargs):
-        search_fields = [
-            'barcode',
-            'budget_info',
-            'category',
-            'company',
-            'cost_center',
-            'deleted',
-            'department',
-            'deprecation_rate',
-            'device_environment',
-            'device_info',
-            'employee_id',
-            'guardian',
-            'hostname',
-            'id',
-            'imei',
-            'invoice_no',
-            'location',
-            'location_name',
-            'manufacturer',
-            'model',
-            'niw',
-            'order_no',
-            'owner',
-            'part_info',
-            'profit_center',
-            'provider',
-            'purpose',
-            'ralph_device_id',
-            'region',
-            'remarks',
-            'required_support',
-            'segment',
-            'service',
-            'service_name',
-            'sn',
-            'source',
-            'status',
-            'support_assigned',
-            'task_url',
-            'unlinked',
-            'user',
-            'venture_department',
-            'warehouse',
-            'without_assigned_location',
-        ]
-        # handle simple 'equals' search fields at once.
-        all_q = Q()
-        for field in search_fields:
-            field_value = self.request.GET.get(field)
-            if field_value:
-                exact = False
-                multi = False
-                # if search term is enclosed in "", we want exact matches
-                if isinstance(field_value, basestring) and \
-                        QUOTATION_MARKS.search(field_value):
-                    exact = True
-                    field_value = field_value[1:-1]
-                elif re.search(SEARCH_DELIMITERS, field_value):
-                    multi = True
-                if field == 'part_info':
-                    if field_value == 'device':
-                        all_q &= Q(part_info__isnull=True)
-                    elif field_value == 'part':
-                        all_q &= Q(part_info__gte=0)
-                elif field == 'model':
-                    if exact:
-                        all_q &= Q(model__name=field_value)
-                    else:
-                        all_q &= Q(model__name__icontains=field_value)
-                elif field == 'category':
-                    part = self.get_search_category_part(field_value)
-                    if part:
-                        all_q &= part
-                elif field == 'deleted':
-                    if field_value.lower() == 'on':
-                        all_q &= Q(deleted__in=(True, False))
-                elif field == 'manufacturer':
-                    if exact:
-                        all_q &= Q(model__manufacturer__name=field_value)
-                    else:
-                        all_q &= Q(
-                            model__manufacturer__name__icontains=field_value
-                        )
-                elif field == 'barcode':
-                    if exact:
-                        all_q &= Q(barcode=field_value)
-                    elif multi:
-                        all_q &= self._search_fields_or(
-                            ['barcode'],
-                            re.split(SEARCH_DELIMITERS, field_value),
-                        )
-                    else:
-                        all_q &= Q(barcode__contains=field_value)
-                elif field == 'hostname':
-                    if exact:
-                        all_q &= Q(hostname=field_value)
-                    elif multi:
-                        all_q &= self._search_fields_or(
-                            ['hostname'],
-                            re.split(SEARCH_DELIMITERS, field_value),
-                        )
-                    else:
-                        all_q &= Q(hostname__contains=field_value)
-                elif field == 'sn':
-                    if exact:
-                        all_q &= Q(sn=field_value)
-                    elif multi:
-                        all_q &= self._search_fields_or(
-                            ['sn'],
-                            re.split(SEARCH_DELIMITERS, field_value),
-                        )
-                    else:
-                        all_q &= Q(sn__icontains=field_value)
-                elif field == 'niw':
-                    if exact:
-                        all_q &= Q(niw=field_value)
-                    elif multi:
-                        all_q &= self._search_fields_or(
-                            ['niw'],
-                            re.split(SEARCH_DELIMITERS, field_value),
-                        )
-                    else:
-                        all_q &= Q(niw__icontains=field_value)
-                elif field == 'provider':
-                    if exact:
-                        all_q &= Q(provider=field_value)
-                    else:
-                        all_q &= Q(provider__icontains=field_value)
-                elif field == 'order_no':
-                    if exact:
-                        all_q &= Q(order_no=field_value)
-                    else:
-                        all_q &= Q(order_no__icontains=field_value)
-                elif field == 'invoice_no':
-                    if exact:
-                        all_q &= Q(invoice_no=field_value)
-                    else:
-                        all_q &= Q(invoice_no__icontains=field_value)
-                elif field == 'warehouse':
-                    all_q &= Q(warehouse__id=field_value)
-                elif field == 'owner':
-                    all_q &= Q(owner__id=field_value)
-                elif field == 'location':
-                    all_q &= Q(location__icontains=field_value)
-                elif field == 'employee_id':
-                    all_q &= Q(owner__profile__employee_id=field_value)
-                elif field == 'company':
-                    all_q &= Q(owner__profile__company__icontains=field_value)
-                elif field == 'segment':
-                    all_q &= Q(owner__profile__segment__icontains=field_value)
-                elif field == 'profit_center':
-                    all_q &= Q(owner__profile__profit_center=field_value)
-                elif field == 'cost_center':
-                    all_q &= Q(owner__profile__cost_center=field_value)
-                elif field == 'department':
-                    all_q &= Q(
-                        owner__profile__department__icontains=field_value
-                    )
-                elif field == 'remarks':
-                    all_q &= Q(remarks__icontains=field_value)
-                elif field == 'user':
-                    all_q &= Q(user__id=field_value)
-                elif field == 'guardian':
-                    all_q &= Q(guardian__id=field_value)
-                elif field == 'deprecation_rate':
-                    deprecation_rate_query_map = {
-                        'null': Q(deprecation_rate__isnull=True),
-                        'deprecated': Q(deprecation_rate=0),
-                        '6': Q(deprecation_rate__gt=0,
-                               deprecation_rate__lte=6),
-                        '12': Q(deprecation_rate__gt=6,
-                                deprecation_rate__lte=12),
-                        '24': Q(deprecation_rate__gt=12,
-                                deprecation_rate__lte=24),
-                        '48': Q(deprecation_rate__gt=24,
-                                deprecation_rate__lte=48),
-                        '48<': Q(deprecation_rate__gt=48),
-                    }
-                    all_q &= deprecation_rate_query_map[field_value]
-                elif field == 'unlinked' and field_value.lower() == 'on':
-                        all_q &= ~Q(device_info=None)
-                        all_q &= Q(device_info__ralph_device_id=None)
-                elif field == 'ralph_device_id':
-                    if exact:
-                        all_q &= Q(device_info__ralph_device_id=field_value)
-                    else:
-                        all_q &= Q(
-                            device_info__ralph_device_id__icontains=field_value
-                        )
-                elif field == 'task_url':
-                    if exact:
-                        all_q &= Q(task_url=field_value)
-                    else:
-                        all_q &= Q(task_url__icontains=field_value)
-                elif field == 'id':
-                        all_q &= Q(
-                            id__in=[int(id) for id in field_value.split(",")],
-                        )
-                elif field == 'imei':
-                    if exact:
-                        all_q &= Q(office_info__imei=field_value)
-                    else:
-                        all_q &= Q(office_info__imei__icontains=field_value)
-                elif field == 'service_name':
-                    all_q &= Q(service_name=field_value)
-                elif field == 'required_support':
-                    user_choice = True if field_value == 'yes' else False
-                    all_q &= Q(required_support=user_choice)
-                elif field == 'support_assigned':
-                    user_choice = True if field_value == 'none' else False
-                    all_q &= Q(supports__isnull=user_choice)
-                elif field == 'purpose':
-                    all_q &= Q(office_info__purpose=field_value)
-                elif field == 'budget_info':
-                    if exact:
-                        all_q &= Q(budget_info__name=field_value)
-                    else:
-                        all_q &= Q(budget_info__name__icontains=field_value)
-                elif field == 'service':
-                    if exact:
-                        all_q &= Q(service__name=field_value)
-                    else:
-                        all_q &= Q(service__name__icontains=field_value)
-                elif field == 'device_environment':
-                    if exact:
-                        all_q &= Q(device_environment__name=field_value)
-                    else:
-                        all_q &= Q(
-                            device_environment__name__icontains=field_value,
-                        )
-                elif field == 'without_assigned_location':
-                    empty_location = (
-                        Q(device_info__data_center=None) |
-                        Q(device_info__server_room=None) |
-                        Q(device_info__rack=None) |
-                        Q(device_info__position=None) |
-                        Q(device_info__orientation=None)
-                    )
-                    asset_without_category_and_location = (
-                        Q(model__category=None) & Q(empty_location)
-                    )
-                    blade_asset_with_empty_location = (
-                        Q(model__category__is_blade=True) &
-                        Q(empty_location | Q(device_info__slot_no=None))
-                    )
-                    not_blade_asset_with_empty_location = (
-                        Q(model__category__is_blade=False) & Q(empty_location)
-                    )
-                    all_q &= (
-                        asset_without_category_and_location |
-                        blade_asset_with_empty_location |
-                        not_blade_asset_with_empty_location
-                    )
-                elif field == 'region':
-                    all_q &= Q(region__id=field_value)
-                elif field == 'location_name':
-                    all_q &= (
-                        Q(device_info__rack__name=field_value) |
-                        Q(device_info__data_center__name=field_value) |
-                        Q(device_info__server_room__name=field_value) |
-                        Q(device_info__rack__server_room__name=field_value) |
-                        Q(device_info__rack__data_center__name=field_value)
-                    )
-                elif field == 'venture_department':
-                    devices = Device.objects.select_related(
-                        'venture__department'
-                    ).filter(
-                        venture__department__id=int(field_value)
-                    ).values_list('id', flat=True)
-                    all_q &= Q(device_info__ralph_device_id__in=devices)
-                else:
-                    q = Q(**{field: field_value})
-                    all_q = all_q & q
-
-        # now fields within ranges.
-        search_date_fields = [
-            'invoice_date', 'request_date', 'delivery_date',
-            'production_use_date', 'provider_order_date', 'loan_end_date',
-        ]
-        for date in search_date_fields:
-            start = self.request.GET.get(date + '_from')
-            end = self.request.GET.get(date + '_to')
-            if start:
-                all_q &= Q(**{date + '__gte': start})
-            if end:
-                all_q &= Q(**{date + '__lte': end})
-        self.items_count = Asset.objects.filter(all_q).count()
-        return all_q
-
-
-class GenericSearch(Report, AssetsBase, DataTableMixin):
+        self.search_plan = self.search_planner.plan(
+            self.request.GET, stage=self.stage_identifiers,
+        )
+        return self.search_plan.query
+
+
+class SearchCacheMixin(object):
+    """Takes counts and pages of asset searches from
+    :class:`ralph_assets.search_cache.SearchResultCache` when
+    ``ASSETS_SEARCH_CACHE['ENABLE']`` setting is on."""
+
+    @cached_property
+    def search_cache(self):
+        plan = getattr(self, 'search_plan', None)
+        if plan is None or not SearchResultCache.enabled():
+            return None
+        regions = sorted(region.id for region in get_actual_regions())
+        return SearchResultCache(self.mode, regions, plan.key)
+
+    def get_keyset_count(self, queryset):
+        if self.search_cache is None:
+            return super(SearchCacheMixin, self).get_keyset_count(queryset)
+        return lambda: self.search_cache.get_or_set(
+            ('count',), queryset.count,
+        )
+
+    def _paginate(self, queryset):
+        if self.search_cache is None or self.keyset_pagination:
+            return super(SearchCacheMixin, self)._paginate(queryset)
+        try:
+            page_number = int(
+                self.request.GET.get(self.query_variable_name) or 1
+            )
+        except ValueError:
+            page_number = 1
+        if page_number == 0:
+            # all items on a single page
+            return super(SearchCacheMixin, self)._paginate(queryset)
+        self.page_number = page_number
+        self.paginator = CachedSearchPaginator(
+            queryset, self.rows_per_page, self.search_cache, self.sort,
+        )
+        try:
+            return self.paginator.page(page_number)
+        except EmptyPage:
+            return self.paginator.page(1)
+
+
+class GenericSearch(
+    KeysetPaginationMixin, Report, AssetsBase, DataTableMixin,
+):
     """A generic view that contains a bob grid and a search form"""
 
     sort_variable_name = 'sort'
@@ -359,6 +130,8 @@ class GenericSearch(Report, AssetsBase, DataTableMixin):
         self.data_table_query(qs)
         if self.export_requested():
             return self.response
+        # reuse the count already done by the paginator
+        self.items_count = self.page_contents.paginator.count
         return super(GenericSearch, self).get(request, *args, **kwargs)
 
     def handle_search_data(self, request):
@@ -366,9 +139,7 @@ class GenericSearch(Report, AssetsBase, DataTableMixin):
         objects = self.Model.objects
         if self.pre_selected:
             objects = objects.select_related(*self.pre_selected)
-        query_set = objects.filter(query)
-        self.items_count = query_set.count()
-        return query_set.all()
+        return objects.filter(query)
 
 
 class _AssetSearch(AssetsSearchQueryableMixin, AssetsBase):
@@ -392,35 +163,22 @@ class _AssetSearch(AssetsSearchQueryableMixin, AssetsBase):
         self.form = search_form(self.request.GET, mode=mode)
         super(_AssetSearch, self).set_mode(mode)
 
-    def get_search_category_part(self, field_value):
-        try:
-            category_id = field_value
-        except ValueError:
-            pass
-        else:
-            category = AssetCategory.objects.get(slug=category_id)
-            children = [x.slug for x in category.get_children()]
-            categories = [category_id, ] + children
-            return Q(model__category_id__in=categories)
-
     def get_all_items(self, query):
         include_deleted = self.request.GET.get('deleted')
         if include_deleted and include_deleted.lower() == 'on':
-            return self.admin_objects.filter(query)
-        return self.objects.filter(query)
-
-    def _search_fields_or(self, fields, values):
-        q = Q()
-        for value in values:
-            value = value.strip()
-            if not value:
-                continue
-            for field in fields:
-                q |= Q(**{field: value})
-        return q
+            queryset = self.admin_objects.filter(query)
+        else:
+            queryset = self.objects.filter(query)
+        plan = getattr(self, 'search_plan', None)
+        # e.g. assets with many supports
+        if plan is not None and plan.distinct:
+            queryset = queryset.distinct()
+        return queryset
 
 
-class AssetSearchDataTable(_AssetSearch, DataTableMixin):
+class AssetSearchDataTable(
+    SearchCacheMixin, KeysetPaginationMixin, _AssetSearch, DataTableMixin,
+):
     """
         The main-screen search form for all type of assets.
         (version without async reports)
@@ -429,6 +187,7 @@ class AssetSearchDataTable(_AssetSearch, DataTableMixin):
     csv_file_name = 'ralph.csv'
     sort_variable_name = 'sort'
     export_variable_name = 'export'
+    stage_identifiers = True
     _ = DataTableColumnAssets
     sidebar_selected = 'search'
     template_name = 'assets/search_asset.html'
@@ -525,50 +284,53 @@ class AssetSearchDataTable(_AssetSearch, DataTableMixin):
                 AssetSearchDataTable, self,
             ).handle_search_data(*args, **kwargs)
             queryset = self.get_all_items(all_q)
-            self.assets_count = queryset.count() if all_q.children else None
             if get_csv:
                 return self.get_csv_data(queryset)
-            else:
-                self.data_table_query(queryset)
+            self.data_table_query(queryset)
+            self.assets_count = None
+            if not self.search_plan.is_empty and not self.export_requested():
+                # reuse the count already done by the paginator
+                self.assets_count = self.page_contents.paginator.count
+            if not self.export_requested():
+                self.report_unmatched_identifiers(queryset)
         else:
             queryset = self.objects.none()
             self.assets_count = None
             self.data_table_query(queryset)
             messages.error(self.request, _("Please correct the errors."))
 
+    def report_unmatched_identifiers(self, queryset):
+        """Warns about staged identifiers (pasted lists) not found."""
+        for identifiers in self.search_plan.staged:
+            unmatched = identifiers.unmatched(queryset)
+            if not unmatched:
+                continue
+            shown = unmatched[:UNMATCHED_IDENTIFIERS_SHOWN]
+            if len(unmatched) > len(shown):
+                shown.append('...')
+            messages.warning(
+                self.request,
+                _('%(count)d of %(total)d values of %(field)s not found: '
+                  '%(values)s') % {
+                    'count': len(unmatched),
+                    'total': identifiers.count,
+                    'field': identifiers.name,
+                    'values': ', '.join(shown),
+                },
+            )
+
     def get_csv_header(self):
         header = super(AssetSearchDataTable, self).get_csv_header()
         return ['type'] + header
 
     def get_csv_rows(self, queryset, type, model):
-        data = [self.get_csv_header()]
-        total = queryset.count()
-        processed = 0
-        job = get_current_job()
-        for asset in queryset:
-            row = ['part'] if asset.part_info else ['device']
-            for item in self.columns:
-                field = item.field
-                if field:
-                    nested_field_name = item.foreign_field_name
-                    if nested_field_name == type:
-                        cell = self.get_cell(
-                            getattr(asset, type), field, model
-                        )
-                    elif nested_field_name == 'part_info':
-                        cell = self.get_cell(asset.part_info, field, PartInfo)
-                    elif nested_field_name == 'venture':
-                        cell = self.get_cell(asset.venture, field, Venture)
-                    elif nested_field_name == 'is_discovered':
-                        cell = unicode(asset.is_discovered)
-                    else:
-                        cell = self.get_cell(asset, field, Asset)
-                    row.append(unicode(cell))
-            data.append(row)
-            processed += 1
-            set_progress(job, processed / total)
-        set_progress(job, 1)
-        return data
+        """Yields CSV rows of *queryset* (header first)."""
+        exporter = AssetCsvExporter(self, type, model, get_current_job())
+        return exporter.iter_rows(queryset)
+
+    def save_csv(self, queryset, type, model):
+        exporter = AssetCsvExporter(self, type, model, get_current_job())
+        return exporter.save(queryset)
 
     def get_context_data(self, *args, **kwargs):
         ret = super(
@@ -605,17 +367,26 @@ class AssetSearchDataTable(_AssetSearch, DataTableMixin):
         return self.export == 'csv'
 
     def get_result(self, request, *args, **kwargs):
-        self.set_mode(kwargs['mode'])
-        return self.handle_search_data(get_csv=True)
+        # run by the reports worker, outside of the middleware
+        with Section(
+            'ralph_assets.views.search.AssetSearchDataTable.get_result',
+            params=request.GET,
+        ):
+            self.set_mode(kwargs['mode'])
+            return self.handle_search_data(get_csv=True)
 
     def get_response(self, request, result):
         return self.make_csv_response(result)
 
     def get_csv_data(self, queryset):
-        return self.get_csv_rows(
+        """Returns name of the stored CSV export of *queryset*."""
+        return self.save_csv(
             queryset, type='office_info', model=OfficeInfo
         )
 
+    def make_csv_response(self, name):
+        return make_csv_file_response(name, self.csv_file_name)
+
     def get_columns_nested(self, mode):
         _ = DataTableColumnAssets
         if mode == 'back_office':
@@ -19,10 +19,10 @@ from django.template.defaultfilters import slugify
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import TemplateView
 from inkpy.api import generate_pdf
-from lck.django.common import nested_commit_on_success
 
 from ralph_assets import signals
 from ralph_assets.forms_transitions import TransitionForm
+from ralph_assets.history.models import commit_with_history
 from ralph_assets.models import (
     ReportOdtSourceLanguage,
     Transition,
@@ -193,7 +193,7 @@ class TransitionDispatcher(object):
     def get_report_file_name(self):
         return self.file_name
 
-    @nested_commit_on_success
+    @commit_with_history
     def run(self):
         self.file_name = None
         actions = self.transition.actions_names